@@ -5,16 +5,58 @@ Critic – citation-verification agent
 Checks whether every claim in Lyra's answer is supported by one of the
 provided citations.  Uses OpenAI JSON-mode, so at least one message must
 contain the word "JSON".
+
+Every public method has an ``a``-prefixed coroutine twin (``arun``,
+``arun_raw``, ``arun_raw_messages``) backed by ``AsyncOpenAI`` so that
+callers running many reviews can overlap the network round-trips.
 """
 
 from __future__ import annotations
 
-import json
 import os
 from typing import List
 
-from openai import OpenAI
+from openai import AsyncOpenAI
 from app.models import LyraOutput, CriticOutput, CriticFeedback, EvidenceItem
+from utils.llm_cache import cached_chat, acached_chat
+from utils.openai_client import get_client, get_async_client
+
+try:
+    from orjson import loads
+except ImportError:
+    from json import loads  # For environments without orjson
+
+# ------------------------- prompt constants ------------------------- #
+_SYSTEM_CITATIONS = (
+    "You are a strict citation-verification agent. "
+    "Your reply must be valid JSON; do not add commentary."
+)
+
+_RUN_SCHEMA_SUFFIX = (
+    "Evaluate whether every claim is fully supported. "
+    "Respond **ONLY in valid JSON** with this schema:\n"
+    '{\n'
+    '  "passes": true,\n'
+    '  "missing_points": ["claim 1", "claim 2"],\n'
+    '  "support_level": "strong"\n'
+    '}'
+)
+
+_SYSTEM_EVIDENCE = (
+    "You are a critical evidence quality assessor. "
+    "Your reply must be valid JSON; do not add commentary."
+)
+
+_RUN_RAW_SCHEMA_SUFFIX = (
+    "Evaluate the quality and relevance of this evidence for answering the question. "
+    "Respond **ONLY in valid JSON** with this schema:\n"
+    '{\n'
+    '  "should_rerun": false,\n'
+    '  "rerun_reason": "string or null",\n'
+    '  "quality_score": 0.85,\n'
+    '  "suggestions": ["suggestion 1", "suggestion 2"]\n'
+    '}'
+)
 
 
 def validate_support_level(level: str) -> str:
@@ -27,18 +69,27 @@ class Critic:
     """Validate that each claim in the answer is backed by a citation."""
 
     def __init__(self) -> None:
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.client = get_client()
         self.model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 
+    @property
+    def aclient(self) -> AsyncOpenAI:
+        """Shared async client for the running event loop."""
+        return get_async_client()
+
     # ------------------------------------------------------------------ #
-    def run(self, question: str, lyra_output: LyraOutput) -> CriticOutput:
-        """
-        Return a CriticOutput with:
-        • passes : bool
-        • missing_points : list[str]
-        • support_level : str (validated)
-        """
+    def _chat_kwargs(self, messages: list) -> dict:
+        """Keyword arguments shared by every Critic chat-completion call."""
+        return dict(
+            model=self.model,
+            messages=messages,
+            response_format={"type": "json_object"},
+            temperature=0,
+        )
 
+    @staticmethod
+    def _run_messages(question: str, lyra_output: LyraOutput) -> list:
+        """Build the citation-verification prompt for `run` / `arun`."""
         # ---------- citations block for the prompt ---------- #
         citations_text = "\n".join(
             f"- Citation {c.idx}: {c.doi}" for c in lyra_output.citations
@@ -48,34 +99,17 @@ class Critic:
             f"QUESTION:\n{question}\n\n"
             f"ANSWER:\n{lyra_output.answer}\n\n"
             f"CITATIONS:\n{citations_text}\n\n"
-            "Evaluate whether every claim is fully supported. "
-            "Respond **ONLY in valid JSON** with this schema:\n"
-            '{\n'
-            '  "passes": true,\n'
-            '  "missing_points": ["claim 1", "claim 2"],\n'
-            '  "support_level": "strong"\n'
-            '}'
+            + _RUN_SCHEMA_SUFFIX
         )
 
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "You are a strict citation-verification agent. "
-                        "Your reply must be valid JSON; do not add commentary."
-                    ),
-                },
-                {"role": "user", "content": user_msg},
-            ],
-            response_format={"type": "json_object"},
-            temperature=0,
-        )
+        return [
+            {"role": "system", "content": _SYSTEM_CITATIONS},
+            {"role": "user", "content": user_msg},
+        ]
 
-        payload: dict[str, bool | List[str] | str] = json.loads(
-            response.choices[0].message.content
-        )
+    @staticmethod
+    def _parse_run(content: str) -> CriticOutput:
+        payload: dict[str, bool | List[str] | str] = loads(content)
 
         # Validate support_level
         support_level = validate_support_level(payload.get("support_level", "weak"))
@@ -86,6 +120,58 @@ class Critic:
             support_level=support_level,
         )
 
+    @staticmethod
+    def _run_raw_messages(query: str, evidence: List[EvidenceItem], agent_name: str) -> list:
+        """Build the evidence-quality prompt for `run_raw` / `arun_raw`."""
+        # Build evidence summary (only truncated summaries get an ellipsis)
+        evidence_summary = "\n".join([
+            f"{i+1}. {item.title}\n   DOI: {item.doi or 'N/A'}\n   Summary: "
+            + (item.summary if len(item.summary) <= 200 else item.summary[:200] + "...")
+            for i, item in enumerate(evidence)
+        ])
+
+        user_msg = (
+            f"QUESTION:\n{query}\n\n"
+            f"EVIDENCE FOUND BY {agent_name.upper()}:\n{evidence_summary}\n\n"
+            + _RUN_RAW_SCHEMA_SUFFIX
+        )
+
+        return [
+            {"role": "system", "content": _SYSTEM_EVIDENCE},
+            {"role": "user", "content": user_msg},
+        ]
+
+    @staticmethod
+    def _parse_run_raw(content: str) -> CriticFeedback:
+        payload = loads(content)
+
+        return CriticFeedback(
+            should_rerun=payload.get("should_rerun", False),
+            rerun_reason=payload.get("rerun_reason"),
+            quality_score=payload.get("quality_score", 1.0),
+            suggestions=payload.get("suggestions", [])
+        )
+
+    # ------------------------------------------------------------------ #
+    def run(self, question: str, lyra_output: LyraOutput) -> CriticOutput:
+        """
+        Return a CriticOutput with:
+        • passes : bool
+        • missing_points : list[str]
+        • support_level : str (validated)
+        """
+        content = cached_chat(
+            self.client, **self._chat_kwargs(self._run_messages(question, lyra_output))
+        )
+        return self._parse_run(content)
+
+    async def arun(self, question: str, lyra_output: LyraOutput) -> CriticOutput:
+        """Async counterpart of `run`."""
+        content = await acached_chat(
+            self.aclient, **self._chat_kwargs(self._run_messages(question, lyra_output))
+        )
+        return self._parse_run(content)
+
     def run_raw(self, query: str, evidence: List[EvidenceItem], agent_name: str) -> CriticFeedback:
         """
         Provide feedback on evidence quality for Nova agent.
@@ -104,58 +190,24 @@ class Critic:
         CriticFeedback
             Feedback on evidence quality and suggestions for improvement
         """
-        # Build evidence summary
-        evidence_summary = "\n".join([
-            f"{i+1}. {item.title}\n   DOI: {item.doi or 'N/A'}\n   Summary: {item.summary[:200]}..."
-            for i, item in enumerate(evidence)
-        ])
-        
-        user_msg = (
-            f"QUESTION:\n{query}\n\n"
-            f"EVIDENCE FOUND BY {agent_name.upper()}:\n{evidence_summary}\n\n"
-            "Evaluate the quality and relevance of this evidence for answering the question. "
-            "Respond **ONLY in valid JSON** with this schema:\n"
-            '{\n'
-            '  "should_rerun": false,\n'
-            '  "rerun_reason": "string or null",\n'
-            '  "quality_score": 0.85,\n'
-            '  "suggestions": ["suggestion 1", "suggestion 2"]\n'
-            '}'
+        content = cached_chat(
+            self.client, **self._chat_kwargs(self._run_raw_messages(query, evidence, agent_name))
         )
+        return self._parse_run_raw(content)
 
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "You are a critical evidence quality assessor. "
-                        "Your reply must be valid JSON; do not add commentary."
-                    ),
-                },
-                {"role": "user", "content": user_msg},
-            ],
-            response_format={"type": "json_object"},
-            temperature=0,
-        )
-
-        payload = json.loads(response.choices[0].message.content)
-        
-        return CriticFeedback(
-            should_rerun=payload.get("should_rerun", False),
-            rerun_reason=payload.get("rerun_reason"),
-            quality_score=payload.get("quality_score", 1.0),
-            suggestions=payload.get("suggestions", [])
+    async def arun_raw(self, query: str, evidence: List[EvidenceItem], agent_name: str) -> CriticFeedback:
+        """Async counterpart of `run_raw`."""
+        content = await acached_chat(
+            self.aclient, **self._chat_kwargs(self._run_raw_messages(query, evidence, agent_name))
         )
+        return self._parse_run_raw(content)
 
     def run_raw_messages(self, messages: list) -> dict:
         """
         Call the Critic agent with a list of OpenAI-style messages and return the raw JSON response.
         """
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            response_format={"type": "json_object"},
-            temperature=0,
-        )
-        return json.loads(response.choices[0].message.content)
+        return loads(cached_chat(self.client, **self._chat_kwargs(messages)))
+
+    async def arun_raw_messages(self, messages: list) -> dict:
+        """Async counterpart of `run_raw_messages`."""
+        return loads(await acached_chat(self.aclient, **self._chat_kwargs(messages)))
@@ -6,58 +6,127 @@ Extracts numerical findings from scientific abstracts and papers using
 advanced LLM techniques and sophisticated regex fallback patterns.
 """
 
-from openai import OpenAI
+from openai import AsyncOpenAI
+import asyncio
+import logging
 import os
 import re
-import json
 from typing import List, Dict, Any, Optional
 from app.models import EvidenceItem, NumericalFinding
-from utils.retry import retry_with_backoff, safe_execute
+from utils.retry import retry_with_backoff
+from utils.llm_cache import cached_chat, acached_chat
+from utils.openai_client import get_client, get_async_client
+
+try:
+    from orjson import loads
+except ImportError:
+    from json import loads  # For environments without orjson
+
+logger = logging.getLogger(__name__)
+
+
+# Enhanced regex patterns for different types of numerical data
+RAW_PATTERNS = {
+    'percentages': [
+        r'\b\d{1,3}(?:\.\d+)?\s*%',  # 95%, 95.5%
+        r'\b\d{1,3}(?:\.\d+)?\s*percent',  # 95 percent
+        r'\b\d{1,3}(?:\.\d+)?\s*per\s*cent',  # 95 per cent
+    ],
+    'p_values': [
+        r'p\s*[<=>]\s*0?\.\d+',  # p < 0.05, p=0.001
+        r'p\s*[<=>]\s*0?\.\d+e-\d+',  # p < 0.001e-3
+        r'significant.*?p\s*[<=>]\s*0?\.\d+',  # significant p < 0.05
+    ],
+    'confidence_intervals': [
+        r'CI\s*=\s*\[?\d+\.?\d*\s*[-–]\s*\d+\.?\d*\]?',  # CI = [1.2-3.4]
+        r'confidence\s*interval.*?\d+\.?\d*\s*[-–]\s*\d+\.?\d*',  # confidence interval 1.2-3.4
+        r'\(\d+\.?\d*,\s*\d+\.?\d*\)',  # (1.2, 3.4)
+    ],
+    'sample_sizes': [
+        r'n\s*=\s*\d+',  # n = 100
+        r'sample\s*size.*?\d+',  # sample size 100
+        r'participants.*?\d+',  # participants 100
+        r'subjects.*?\d+',  # subjects 100
+    ],
+    'effect_sizes': [
+        r'Cohen\'s\s*d\s*=\s*[-+]?\d*\.?\d+',  # Cohen's d = 0.5
+        r'effect\s*size.*?[-+]?\d*\.?\d+',  # effect size 0.5
+        r'odds\s*ratio.*?[-+]?\d*\.?\d+',  # odds ratio 1.5
+        r'risk\s*ratio.*?[-+]?\d*\.?\d+',  # risk ratio 1.5
+    ],
+    'statistical_tests': [
+        r't\s*\(\s*\d+\s*\)\s*=\s*[-+]?\d*\.?\d+',  # t(50) = 2.5
+        r'F\s*\(\s*\d+,\s*\d+\s*\)\s*=\s*[-+]?\d*\.?\d+',  # F(2,50) = 3.5
+        r'chi-square.*?[-+]?\d*\.?\d+',  # chi-square 5.2
+        r'ANOVA.*?[-+]?\d*\.?\d+',  # ANOVA 3.5
+    ]
+}
+
+# Flat (category, compiled pattern) table, compiled once at import and kept in
+# RAW_PATTERNS order so hits come out grouped by category as before.
+_PATTERN_TABLE = [
+    (category, re.compile(pattern, re.IGNORECASE))
+    for category, patterns in RAW_PATTERNS.items()
+    for pattern in patterns
+]
+
+# p-value comparison ("p < .05", "P<=0.01", "p = 0.003") and first integer
+SIG_RE = re.compile(r"\bp\s*(<=?|≤|=)\s*(0?\.\d+)", re.I)
+NUM_RE = re.compile(r"\d+")
+
+# Evidence items packed into one LLM call by `aextract_from_batch`
+BATCH_SIZE = 8
+
+# ------------------------- prompt constants ------------------------- #
+_EXTRACTION_PREAMBLE = (
+    "Extract all numerical findings from the following scientific text. "
+    "Focus on percentages, p-values, confidence intervals, sample sizes, "
+    "effect sizes, and statistical test results. "
+    "Return ONLY valid JSON in this exact format:\n"
+    "{\n"
+    '  "percentages": ["95%", "significant at 5%"],\n'
+    '  "p_values": ["p < 0.05", "p = 0.001"],\n'
+    '  "confidence_intervals": ["CI = [1.2-3.4]", "(0.5, 2.1)"],\n'
+    '  "sample_sizes": ["n = 100", "sample size 50"],\n'
+    '  "effect_sizes": ["Cohen\'s d = 0.5", "odds ratio 1.5"],\n'
+    '  "statistical_tests": ["t(50) = 2.5", "F(2,50) = 3.5"]\n'
+    "}\n"
+)
+
+_BATCH_EXTRACTION_PREAMBLE = (
+    "Focus on percentages, p-values, confidence intervals, sample sizes, "
+    "effect sizes, and statistical test results. "
+    "Return ONLY valid JSON with one object per text in \"items\", "
+    "in the SAME ORDER as the texts:\n"
+    "{\n"
+    '  "items": [\n'
+    "    {\n"
+    '      "percentages": ["95%"],\n'
+    '      "p_values": ["p < 0.05"],\n'
+    '      "confidence_intervals": ["CI = [1.2-3.4]"],\n'
+    '      "sample_sizes": ["n = 100"],\n'
+    '      "effect_sizes": ["Cohen\'s d = 0.5"],\n'
+    '      "statistical_tests": ["t(50) = 2.5"]\n'
+    "    }\n"
+    "  ]\n"
+    "}\n"
+)
+
 
 class DataMiner:
     """Extracts numerical findings from an EvidenceItem using LLM and regex fallback."""
     
     def __init__(self):
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.client = get_client()
         self.model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
-        
-        # Enhanced regex patterns for different types of numerical data
-        self.patterns = {
-            'percentages': [
-                r'\b\d{1,3}(?:\.\d+)?\s*%',  # 95%, 95.5%
-                r'\b\d{1,3}(?:\.\d+)?\s*percent',  # 95 percent
-                r'\b\d{1,3}(?:\.\d+)?\s*per\s*cent',  # 95 per cent
-            ],
-            'p_values': [
-                r'p\s*[<=>]\s*0?\.\d+',  # p < 0.05, p=0.001
-                r'p\s*[<=>]\s*0?\.\d+e-\d+',  # p < 0.001e-3
-                r'significant.*?p\s*[<=>]\s*0?\.\d+',  # significant p < 0.05
-            ],
-            'confidence_intervals': [
-                r'CI\s*=\s*\[?\d+\.?\d*\s*[-–]\s*\d+\.?\d*\]?',  # CI = [1.2-3.4]
-                r'confidence\s*interval.*?\d+\.?\d*\s*[-–]\s*\d+\.?\d*',  # confidence interval 1.2-3.4
-                r'\(\d+\.?\d*,\s*\d+\.?\d*\)',  # (1.2, 3.4)
-            ],
-            'sample_sizes': [
-                r'n\s*=\s*\d+',  # n = 100
-                r'sample\s*size.*?\d+',  # sample size 100
-                r'participants.*?\d+',  # participants 100
-                r'subjects.*?\d+',  # subjects 100
-            ],
-            'effect_sizes': [
-                r'Cohen\'s\s*d\s*=\s*[-+]?\d*\.?\d+',  # Cohen's d = 0.5
-                r'effect\s*size.*?[-+]?\d*\.?\d+',  # effect size 0.5
-                r'odds\s*ratio.*?[-+]?\d*\.?\d+',  # odds ratio 1.5
-                r'risk\s*ratio.*?[-+]?\d*\.?\d+',  # risk ratio 1.5
-            ],
-            'statistical_tests': [
-                r't\s*\(\s*\d+\s*\)\s*=\s*[-+]?\d*\.?\d+',  # t(50) = 2.5
-                r'F\s*\(\s*\d+,\s*\d+\s*\)\s*=\s*[-+]?\d*\.?\d+',  # F(2,50) = 3.5
-                r'chi-square.*?[-+]?\d*\.?\d+',  # chi-square 5.2
-                r'ANOVA.*?[-+]?\d*\.?\d+',  # ANOVA 3.5
-            ]
-        }
+        # Regex results covering this many categories skip the LLM call
+        self.regex_min_categories = int(os.getenv("DATAMINER_REGEX_MIN_CATEGORIES", "3"))
 
+    @property
+    def aclient(self) -> AsyncOpenAI:
+        """Shared async client for the running event loop."""
+        return get_async_client()
+        
     @retry_with_backoff(max_attempts=3, base_delay=1.0)
     def run(self, evidence: EvidenceItem) -> NumericalFinding:
         """
@@ -73,78 +142,151 @@ class DataMiner:
         NumericalFinding
             Extracted numerical data
         """
-        # Try LLM extraction first
+        # Cheap regex pass first; a rich enough result makes the LLM redundant
+        regex_result = self.regex_extract(evidence.summary)
+        if self._is_confident(regex_result):
+            return regex_result
+
         llm_result = self._llm_extract(evidence.summary)
         if llm_result and self._validate_extraction(llm_result):
             return llm_result
         
         # Fallback to enhanced regex
-        print(f"[DataMiner] LLM extraction failed or invalid, using regex fallback")
-        return self.regex_extract(evidence.summary)
+        logger.info("LLM extraction failed or invalid, using regex fallback")
+        return regex_result
+
+    async def arun(self, evidence: EvidenceItem) -> NumericalFinding:
+        """Async counterpart of `run` (no retry; batch callers degrade per item)."""
+        regex_result = self.regex_extract(evidence.summary)
+        if self._is_confident(regex_result):
+            return regex_result
+
+        llm_result = await self._allm_extract(evidence.summary)
+        if llm_result and self._validate_extraction(llm_result):
+            return llm_result
+
+        logger.info("LLM extraction failed or invalid, using regex fallback")
+        return regex_result
+
+    def _is_confident(self, finding: NumericalFinding) -> bool:
+        """True when a regex result populates enough categories to skip the LLM."""
+        categories_hit = sum(1 for values in finding.model_dump().values() if values)
+        return categories_hit >= self.regex_min_categories
+
+    @staticmethod
+    def _extraction_prompt(text: str) -> str:
+        return f"{_EXTRACTION_PREAMBLE}\nTEXT TO ANALYZE:\n{text}"
+
+    @staticmethod
+    def _batch_extraction_prompt(texts: List[str]) -> str:
+        texts_block = "\n".join(f"--- TEXT {i} ---\n{t}" for i, t in enumerate(texts))
+        return (
+            f"Extract all numerical findings from EACH of the {len(texts)} scientific texts below. "
+            + _BATCH_EXTRACTION_PREAMBLE
+            + f"\nTEXTS TO ANALYZE:\n{texts_block}"
+        )
+
+    @classmethod
+    def _parse_batch_extraction(cls, data: str, expected: int) -> List[Optional[NumericalFinding]]:
+        """Parse an `{"items": [...]}` reply; a length mismatch invalidates the whole batch."""
+        items = loads(data).get("items", [])
+        if len(items) != expected:
+            logger.warning("Batch extraction returned %d items, expected %d", len(items), expected)
+            return [None] * expected
+
+        findings: List[Optional[NumericalFinding]] = []
+        for item in items:
+            try:
+                findings.append(cls._finding_from_dict(item))
+            except Exception:
+                findings.append(None)
+        return findings
+
+    @classmethod
+    def _parse_extraction(cls, data: str) -> NumericalFinding:
+        return cls._finding_from_dict(loads(data))
+
+    @staticmethod
+    def _finding_from_dict(parsed: dict) -> NumericalFinding:
+        # Ensure all required fields are present
+        for field in ['percentages', 'p_values', 'confidence_intervals', 'sample_sizes']:
+            if field not in parsed:
+                parsed[field] = []
+
+        # Add new fields if not present
+        if 'effect_sizes' not in parsed:
+            parsed['effect_sizes'] = []
+        if 'statistical_tests' not in parsed:
+            parsed['statistical_tests'] = []
+
+        return NumericalFinding(**parsed)
 
     def _llm_extract(self, text: str) -> Optional[NumericalFinding]:
         """Extract numerical data using LLM."""
-        prompt = (
-            "Extract all numerical findings from the following scientific text. "
-            "Focus on percentages, p-values, confidence intervals, sample sizes, "
-            "effect sizes, and statistical test results. "
-            "Return ONLY valid JSON in this exact format:\n"
-            "{\n"
-            '  "percentages": ["95%", "significant at 5%"],\n'
-            '  "p_values": ["p < 0.05", "p = 0.001"],\n'
-            '  "confidence_intervals": ["CI = [1.2-3.4]", "(0.5, 2.1)"],\n'
-            '  "sample_sizes": ["n = 100", "sample size 50"],\n'
-            '  "effect_sizes": ["Cohen\'s d = 0.5", "odds ratio 1.5"],\n'
-            '  "statistical_tests": ["t(50) = 2.5", "F(2,50) = 3.5"]\n'
-            "}\n"
-            f"\nTEXT TO ANALYZE:\n{text}"
-        )
-        
         try:
-            response = self.client.chat.completions.create(
+            data = cached_chat(
+                self.client,
                 model=self.model,
-                messages=[{"role": "user", "content": prompt}],
+                messages=[{"role": "user", "content": self._extraction_prompt(text)}],
                 response_format={"type": "json_object"},
                 temperature=0
             )
-            data = response.choices[0].message.content
-            parsed = json.loads(data)
-            
-            # Ensure all required fields are present
-            for field in ['percentages', 'p_values', 'confidence_intervals', 'sample_sizes']:
-                if field not in parsed:
-                    parsed[field] = []
-            
-            # Add new fields if not present
-            if 'effect_sizes' not in parsed:
-                parsed['effect_sizes'] = []
-            if 'statistical_tests' not in parsed:
-                parsed['statistical_tests'] = []
-            
-            return NumericalFinding(**parsed)
+            return self._parse_extraction(data)
             
         except Exception as exc:
-            print(f"[DataMiner] LLM extraction error: {exc}")
+            logger.warning("LLM extraction error: %s", exc)
+            return None
+
+    async def _allm_extract(self, text: str) -> Optional[NumericalFinding]:
+        """Async counterpart of `_llm_extract`."""
+        try:
+            data = await acached_chat(
+                self.aclient,
+                model=self.model,
+                messages=[{"role": "user", "content": self._extraction_prompt(text)}],
+                response_format={"type": "json_object"},
+                temperature=0
+            )
+            return self._parse_extraction(data)
+
+        except Exception as exc:
+            logger.warning("LLM extraction error: %s", exc)
             return None
 
+    async def _allm_extract_batch(self, texts: List[str]) -> List[Optional[NumericalFinding]]:
+        """
+        Extract numerical data for several texts with a single LLM call.
+
+        Returns one entry per text (same order); None marks texts whose
+        extraction failed so the caller can fall back to regex.
+        """
+        try:
+            data = await acached_chat(
+                self.aclient,
+                model=self.model,
+                messages=[{"role": "user", "content": self._batch_extraction_prompt(texts)}],
+                response_format={"type": "json_object"},
+                temperature=0
+            )
+            return self._parse_batch_extraction(data, len(texts))
+
+        except Exception as exc:
+            logger.warning("LLM batch extraction error: %s", exc)
+            return [None] * len(texts)
+
     def regex_extract(self, text: str) -> NumericalFinding:
         """Enhanced regex extraction with multiple patterns."""
-        findings = {}
+        findings = {category: [] for category in RAW_PATTERNS}
+        seen = {category: set() for category in RAW_PATTERNS}
         
-        for category, patterns in self.patterns.items():
-            findings[category] = []
-            for pattern in patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                findings[category].extend(matches)
-            
-            # Remove duplicates while preserving order
-            seen = set()
-            unique_matches = []
-            for match in findings[category]:
-                if match.lower() not in seen:
-                    seen.add(match.lower())
-                    unique_matches.append(match)
-            findings[category] = unique_matches
+        # Non-overlapping scan per pattern, as `findall` did before
+        for category, pattern in _PATTERN_TABLE:
+            for m in pattern.finditer(text):
+                match = m.group()
+                # Remove duplicates while preserving order
+                if match.lower() not in seen[category]:
+                    seen[category].add(match.lower())
+                    findings[category].append(match)
         
         # Map to NumericalFinding fields
         return NumericalFinding(
@@ -183,6 +325,9 @@ class DataMiner:
     def extract_from_batch(self, evidence_items: List[EvidenceItem]) -> List[NumericalFinding]:
         """
         Extract numerical findings from multiple evidence items.
+
+        Sync shim around `aextract_from_batch`; must not be called from a
+        running event loop (await `aextract_from_batch` there instead).
         
         Parameters
         ----------
@@ -194,13 +339,63 @@ class DataMiner:
         List[NumericalFinding]
             List of extracted numerical findings
         """
-        findings = []
-        for i, evidence in enumerate(evidence_items):
-            print(f"[DataMiner] Processing evidence {i+1}/{len(evidence_items)}")
-            finding = safe_execute(self.run, evidence, default_return=NumericalFinding())
-            findings.append(finding)
+        return asyncio.run(self.aextract_from_batch(evidence_items))
+
+    async def aextract_from_batch(
+        self,
+        evidence_items: List[EvidenceItem],
+        concurrency: int = 10,
+        batch_size: int = BATCH_SIZE,
+    ) -> List[NumericalFinding]:
+        """
+        Extract numerical findings from multiple evidence items concurrently.
+
+        Items whose regex pass is already confident skip the LLM; the rest
+        are packed `batch_size` at a time into a single LLM call with at
+        most `concurrency` calls in flight at once.  Results keep the order
+        of `evidence_items`; items the LLM misses or gets wrong fall back to
+        regex, and so does every item of a chunk whose LLM call raises.
+        """
+        regex_results = [self.regex_extract(e.summary) for e in evidence_items]
+        findings: List[NumericalFinding] = list(regex_results)
+        pending = [i for i, r in enumerate(regex_results) if not self._is_confident(r)]
+
+        sem = asyncio.Semaphore(concurrency)
+        chunks = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+
+        async def one(i: int, chunk: List[int]) -> None:
+            async with sem:
+                logger.debug("Processing evidence batch %d/%d (%d items)", i + 1, len(chunks), len(chunk))
+                llm_results = await self._allm_extract_batch(
+                    [evidence_items[idx].summary for idx in chunk]
+                )
+
+            for idx, llm_result in zip(chunk, llm_results):
+                if llm_result and self._validate_extraction(llm_result):
+                    findings[idx] = llm_result
+                else:
+                    logger.info("LLM extraction failed or invalid, using regex fallback")
+
+        results = await asyncio.gather(
+            *(one(i, chunk) for i, chunk in enumerate(chunks)),
+            return_exceptions=True,
+        )
+
+        # `findings` still holds the regex results for a chunk that raised
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, BaseException):
+                logger.warning("LLM batch of %d items failed, using regex fallback: %s", len(chunk), result)
         return findings
 
+    @staticmethod
+    def _is_significant(p_val: str) -> bool:
+        """True for p-values reported below the 0.05 threshold (p < .05, p = 0.001, ...)."""
+        match = SIG_RE.search(p_val)
+        if not match:
+            return False
+        op, value = match.group(1), float(match.group(2))
+        return value < 0.05 or (value == 0.05 and op != "=")
+
     def get_statistical_summary(self, findings: List[NumericalFinding]) -> Dict[str, Any]:
         """
         Generate a statistical summary from multiple findings.
@@ -233,13 +428,8 @@ class DataMiner:
             if finding.p_values:
                 summary['papers_with_p_values'] += 1
                 # Count significant findings (p < 0.05)
-                for p_val in finding.p_values:
-                    try:
-                        if 'p < 0.05' in p_val or 'p<0.05' in p_val:
-                            summary['significant_findings'] += 1
-                            break
-                    except:
-                        continue
+                if any(self._is_significant(p_val) for p_val in finding.p_values):
+                    summary['significant_findings'] += 1
             
             if finding.effect_sizes:
                 summary['papers_with_effect_sizes'] += 1
@@ -247,11 +437,9 @@ class DataMiner:
             
             # Extract sample sizes
             for sample in finding.sample_sizes:
-                try:
-                    size = int(re.findall(r'\d+', sample)[0])
-                    sample_sizes.append(size)
-                except:
-                    continue
+                match = NUM_RE.search(sample)
+                if match:
+                    sample_sizes.append(int(match.group()))
             
             # Collect statistical tests
             all_tests.update(finding.statistical_tests)
@@ -10,18 +10,112 @@ Takes a research question + evidence (Nova's output) and produces
 
 The reply is requested in *JSON mode*, so at least one user/system
 message must literally contain the word "JSON".
+
+`arun` is the async counterpart of `run`: once the Critic rejects a draft
+it redrafts with the critique.  With ``LYRA_SPECULATIVE_RETRY=1`` that
+redraft is started speculatively while the Critic is still reviewing and
+cancelled if the draft passes, taking one LLM round-trip off the
+rejection path.
+
+Validated replies are cached: exact repeats via `utils.llm_cache`, and –
+with ``LYRA_SEMANTIC_CACHE=1`` – paraphrased questions over the same
+evidence via `agents.lyra_cache.SemanticCache`.
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
+import logging
 import os
-from typing import List
+from functools import lru_cache
+from typing import Generator, Iterator, List, Sequence, Tuple
 import re
 
-from openai import OpenAI
+from pydantic import TypeAdapter
+from openai import AsyncOpenAI
 from app.models import NovaOutput, LyraOutput, RoadmapItem, Citation, NumericalFinding
 from agents.critic import Critic
+from agents.lyra_cache import SemanticCache
+from services.retriever import get_embedding
+from utils.llm_cache import lookup, store
+from utils.rate_limit import RateLimiter, acquire_for, rate_limited
+from utils.openai_client import get_client, get_async_client, get_semaphore, bounded_chat
+
+try:
+    from orjson import dumps, loads
+except ImportError:
+    from json import loads  # For environments without orjson
+
+    def dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None  # For environments without tiktoken
+
+logger = logging.getLogger(__name__)
+
+# (input, output) USD per 1 k tokens, OpenAI June 2024 price table
+_PRICES = {
+    "gpt-4o": (0.0025, 0.01),
+    "gpt-4o-mini": (0.00015, 0.0006),
+}
+
+# ------------------------- prompt constants ------------------------- #
+_SYSTEM_LYRA = (
+    "You are Lyra, a rigorous scientific-reasoning assistant. "
+    "Your replies **must be JSON only** – no prose."
+)
+
+_JSON_SCHEMA = (
+    '{\n'
+    '  "answer": "string",\n'
+    '  "gaps": ["string", ...],\n'
+    '  "roadmap": [\n'
+    '    {\n'
+    '      "priority": 1,\n'
+    '      "research_area": "string",\n'
+    '      "next_milestone": "string",\n'
+    '      "timeline": "6-12 months",\n'
+    '      "success_probability": 0.65\n'
+    '    }\n'
+    '  ],\n'
+    '  "citations": [\n'
+    '    {"doi": "doi-string", "title": "paper-title", "idx": 1}\n'
+    '  ]\n'
+    '}'
+)
+
+_SCHEMA_SUFFIX = "Respond **ONLY** with valid JSON matching this schema:\n" + _JSON_SCHEMA
+
+_PACKED_SCHEMA_SUFFIX = (
+    "Answer every ITEM above independently, using only that item's evidence. "
+    'Respond **ONLY** with valid JSON of the form {"results": [...]} holding one '
+    "object per ITEM, in ITEM order, each matching this schema:\n" + _JSON_SCHEMA
+)
+
+# Validates a whole roadmap list in one pydantic-core call
+_ROADMAP_ADAPTER = TypeAdapter(List[RoadmapItem])
+
+# Complete `"answer": "..."` field inside a partially streamed reply
+_ANSWER_RE = re.compile(r'"answer"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+# Paraphrase-tolerant reply cache, shared by all Lyra instances (opt-in)
+SEMANTIC_CACHE = (
+    SemanticCache(threshold=float(os.getenv("LYRA_SEMANTIC_THRESHOLD", "0.92")))
+    if os.getenv("LYRA_SEMANTIC_CACHE", "0") == "1"
+    else None
+)
+
+# Critique used for the speculative redraft, before the Critic has replied
+SPECULATIVE_CRITIQUE = {
+    "missing_points": [
+        "Cite the supporting DOI in every sentence",
+        "Address every evidence item relevant to the question",
+    ]
+}
 
 
 class Lyra:
@@ -29,66 +123,126 @@ class Lyra:
 
     # ------------------------------ config ------------------------------ #
     def __init__(self) -> None:
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.client = get_client()
         self.model = os.getenv("OPENAI_MODEL", "gpt-4o")
         self.cost_threshold = float(os.getenv("COST_THRESHOLD_USD", "0.05"))
         self.critic = Critic()
 
+    @property
+    def aclient(self) -> AsyncOpenAI:
+        """Shared async client for the running event loop."""
+        return get_async_client()
+
     # ------------------------ token/cost helpers ------------------------ #
+    _encoding = None  # tiktoken encoder, loaded once per process
+
+    @classmethod
+    def _get_encoding(cls):
+        """Return the gpt-4o tokenizer, or None if tiktoken is unavailable."""
+        if cls._encoding is None and tiktoken is not None:
+            try:
+                cls._encoding = tiktoken.encoding_for_model("gpt-4o")
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("tiktoken unavailable, using char heuristic: %s", exc)
+                cls._encoding = False  # don't retry the lookup on every call
+        return cls._encoding or None
+
+    @classmethod
+    def _rough_tokens(cls, text: str) -> int:
+        """
+        Token count for the cost guard-rail.
+
+        Exact with tiktoken; otherwise falls back to the ≈4 chars / token
+        heuristic.
+        """
+        if cls._get_encoding() is None:
+            return max(1, len(text) // 4)
+        return max(1, cls._encoded_length(text))
+
     @staticmethod
-    def _rough_tokens(text: str) -> int:
-        """Very rough ≈4 chars / token heuristic (good enough for guard-rails)."""
-        return max(1, len(text) // 4)
+    @lru_cache(maxsize=4096)
+    def _encoded_length(text: str) -> int:
+        """BPE token count, memoised since prompts repeat across retries / Critic loops."""
+        return len(Lyra._encoding.encode(text))
 
     @staticmethod
+    @lru_cache(maxsize=1024)
     def _estimate_cost(in_toks: int, out_toks: int, model: str) -> float:
         """
         Return cost in USD using OpenAI June 2024 price table.
 
         (If `model` isn't known we fall back to the mini tier.)
         """
-        price = {
-            "gpt-4o": {"in": 0.0025, "out": 0.01},          # per 1 k tokens
-            "gpt-4o-mini": {"in": 0.00015, "out": 0.0006},
-        }.get(model, {"in": 0.00015, "out": 0.0006})
+        price_in, price_out = _PRICES.get(model, _PRICES["gpt-4o-mini"])
+        return (in_toks / 1_000) * price_in + (out_toks / 1_000) * price_out
 
-        return (in_toks / 1_000) * price["in"] + (out_toks / 1_000) * price["out"]
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _prompt_token_budget(cost_threshold: float, out_toks: int, model: str) -> float:
+        """Most prompt tokens a call with `out_toks` output can use within `cost_threshold`."""
+        price_in, price_out = _PRICES.get(model, _PRICES["gpt-4o-mini"])
+        return (cost_threshold - (out_toks / 1_000) * price_out) / price_in * 1_000
 
-    # ----------------------------- runner ------------------------------ #
-    def run_raw(
+    # ------------------------- prompt helpers -------------------------- #
+    @staticmethod
+    def _format_item(idx: int, item, finding: NumericalFinding | None) -> str:
+        """Render one evidence item (plus its key numbers, if any) as one prompt line."""
+        block = f"[{idx}] {item.title} | doi:{item.doi} | {item.summary}"
+        if finding is None:
+            return block
+
+        numbers = "; ".join(
+            f"{label}: {', '.join(values)}"
+            for label, values in (
+                ("Percentages", finding.percentages),
+                ("P-values", finding.p_values),
+                ("Confidence Intervals", finding.confidence_intervals),
+                ("Sample Sizes", finding.sample_sizes),
+            )
+            if values
+        )
+        return f"{block} | Key Numbers: {numbers}" if numbers else block
+
+    def _build_request(
         self,
         question: str,
         nova_output: NovaOutput,
-        numerical_findings: List[NumericalFinding] = None,
-        critique: dict | None = None,
-    ) -> LyraOutput:
-        """Raw version that doesn't call Critic - used for testing and internal calls."""
+        numerical_findings: List[NumericalFinding] | None,
+        critique: dict | None,
+    ) -> tuple[dict, List[str]]:
+        """Assemble the chat-completion kwargs and the evidence DOIs for validation."""
+        item_msg, all_dois, item_tokens = self._item_prompt(
+            question, nova_output, numerical_findings, critique
+        )
+        prompt_tokens = item_tokens + self._rough_tokens(_SCHEMA_SUFFIX)
+        return self._request_for(item_msg + _SCHEMA_SUFFIX, prompt_tokens), all_dois
+
+    def _item_prompt(
+        self,
+        question: str,
+        nova_output: NovaOutput,
+        numerical_findings: List[NumericalFinding] | None,
+        critique: dict | None,
+    ) -> tuple[str, List[str], int]:
+        """
+        QUESTION / EVIDENCE / DOI-hint section for one question (no schema).
+
+        Also returns its token estimate, summed from per-piece counts so
+        that evidence blocks repeated across Critic reruns hit the token
+        count cache instead of being re-encoded inside a new message.
+        """
         # ---------- build evidence & optional critique strings ---------- #
-        evidence_lines: List[str] = []
-        for idx, item in enumerate(nova_output.evidence, 1):
-            evidence_lines.append(
-                f"{idx}. {item.title}\n"
-                f"   DOI: {item.doi}\n"
-                f"   Summary: {item.summary}"
+        evidence_items = [
+            self._format_item(
+                idx,
+                item,
+                numerical_findings[idx - 1]
+                if numerical_findings and idx <= len(numerical_findings)
+                else None,
             )
-            
-            # Add numerical findings if available
-            if numerical_findings and idx <= len(numerical_findings):
-                finding = numerical_findings[idx - 1]
-                if any([finding.percentages, finding.p_values, finding.confidence_intervals, finding.sample_sizes]):
-                    evidence_lines.append("   Key Numbers:")
-                    if finding.percentages:
-                        evidence_lines.append(f"     Percentages: {', '.join(finding.percentages)}")
-                    if finding.p_values:
-                        evidence_lines.append(f"     P-values: {', '.join(finding.p_values)}")
-                    if finding.confidence_intervals:
-                        evidence_lines.append(f"     Confidence Intervals: {', '.join(finding.confidence_intervals)}")
-                    if finding.sample_sizes:
-                        evidence_lines.append(f"     Sample Sizes: {', '.join(finding.sample_sizes)}")
-            
-            evidence_lines.append("")  # Add spacing between items
-            
-        evidence_block = "\n".join(evidence_lines)
+            for idx, item in enumerate(nova_output.evidence, 1)
+        ]
+        evidence_block = "\n".join(evidence_items)
 
         critique_block = ""
         if critique:
@@ -98,118 +252,303 @@ class Lyra:
             )
 
         # ------------------------ prompt assembly ----------------------- #
-        json_schema = (
-            '{\n'
-            '  "answer": "string",\n'
-            '  "gaps": ["string", ...],\n'
-            '  "roadmap": [\n'
-            '    {\n'
-            '      "priority": 1,\n'
-            '      "research_area": "string",\n'
-            '      "next_milestone": "string",\n'
-            '      "timeline": "6-12 months",\n'
-            '      "success_probability": 0.65\n'
-            '    }\n'
-            '  ],\n'
-            '  "citations": [\n'
-            '    {"doi": "doi-string", "title": "paper-title", "idx": 1}\n'
-            '  ]\n'
-            '}'
-        )
-
         # Build a string of all DOIs for the prompt
         all_dois = [item.doi for item in nova_output.evidence if item.doi]
         doi_hint = (
             "Every declarative sentence in your answer MUST end with (doi:" + ",".join(all_dois) + ") where you cite the relevant DOIs. "
             "If a sentence draws on multiple papers, list DOIs comma-separated inside the same parentheses."
         )
-        user_msg = (
+        item_msg = (
             f"QUESTION:\n{question}\n\n"
-            f"EVIDENCE:\n{evidence_block}{critique_block}\n\n"
+            f"EVIDENCE ([n] title | doi | summary):\n{evidence_block}{critique_block}\n\n"
             f"{doi_hint}\n"
-            "Respond **ONLY** with valid JSON matching this schema:\n"
-            + json_schema
         )
+        prompt_tokens = (
+            sum(self._rough_tokens(block) for block in evidence_items)
+            + self._rough_tokens(question)
+            + (self._rough_tokens(critique_block) if critique_block else 0)
+            + self._rough_tokens(doi_hint)
+        )
+        return item_msg, all_dois, prompt_tokens
 
-        # ---------------- cost guard-rail: model swap ------------------- #
-        prompt_tokens = self._rough_tokens(user_msg)
-        max_out_tokens = 1_000  # upper bound for safety
-        est_cost = self._estimate_cost(prompt_tokens, max_out_tokens, self.model)
+    def _request_for(
+        self, user_msg: str, prompt_tokens: int, max_out_tokens: int = 1_000, n_items: int = 1
+    ) -> dict:
+        """
+        Wrap a user message into request kwargs, applying the cost guard-rail.
 
+        The threshold is per question, so a request packing `n_items`
+        questions may cost up to `n_items` times ``COST_THRESHOLD_USD``.
+        """
+        # ---------------- cost guard-rail: model swap ------------------- #
         model_to_use = self.model
-        if est_cost > self.cost_threshold and self.model == "gpt-4o":
-            model_to_use = "gpt-4o-mini"
-            print(
-                f"[Lyra] Cost guard-rail: switching to {model_to_use} "
-                f"(est. ${est_cost:.3f} > ${self.cost_threshold:.2f})"
-            )
+        if self.model == "gpt-4o":
+            cost_threshold = self.cost_threshold * n_items
+            prompt_tokens += self._rough_tokens(_SYSTEM_LYRA)  # memoised after first call
+            budget = self._prompt_token_budget(cost_threshold, max_out_tokens, self.model)
+            if prompt_tokens > budget:
+                model_to_use = "gpt-4o-mini"
+                logger.info(
+                    "Cost guard-rail: switching to %s (est. $%.3f > $%.2f)",
+                    model_to_use,
+                    self._estimate_cost(prompt_tokens, max_out_tokens, self.model),
+                    cost_threshold,
+                )
 
-        # --------------------------- call ------------------------------- #
-        response = self.client.chat.completions.create(
+        return dict(
             model=model_to_use,
             messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "You are Lyra, a rigorous scientific-reasoning assistant. "
-                        "Your replies **must be JSON only** – no prose."
-                    ),
-                },
+                {"role": "system", "content": _SYSTEM_LYRA},
                 {"role": "user", "content": user_msg},
             ],
             response_format={"type": "json_object"},
             temperature=0,
         )
 
-        # ----------------------- parse & validate ----------------------- #
+    @staticmethod
+    def _validate_answer(answer: str, all_dois: List[str]) -> None:
+        """Raise ValueError unless every sentence in `answer` cites an evidence DOI."""
+        answer_sentences = [s.strip() for s in re.split(r'[.!?]', answer) if s.strip()]
+        for sent in answer_sentences:
+            # Skip validation in test mode with stub evidence
+            if os.getenv('PYTEST_CURRENT_TEST') and any('stub' in doi for doi in all_dois):
+                continue
+            # More flexible DOI validation - check for any DOI presence
+            has_doi = False
+            for doi in all_dois:
+                # Check for various DOI citation formats
+                if (f"doi:{doi}" in sent or 
+                    f"({doi})" in sent or 
+                    f"(doi:{doi})" in sent or
+                    doi in sent):
+                    has_doi = True
+                    break
+            if not has_doi:
+                raise ValueError(f"Every sentence must cite at least one evidence DOI. Offending sentence: {sent}")
+
+    @staticmethod
+    def _parse_response(content: str, nova_output: NovaOutput, all_dois: List[str]) -> LyraOutput:
+        """Parse the JSON reply and enforce one evidence DOI per answer sentence."""
         try:
-            payload: dict = json.loads(response.choices[0].message.content)
-
-            roadmap = [RoadmapItem(**item) for item in payload["roadmap"]]
-            
-            # Build proper citations with title and doi from evidence
-            citations = []
-            for c in payload["citations"]:
-                if c["idx"] <= len(nova_output.evidence):
-                    evidence_item = nova_output.evidence[c["idx"] - 1]
-                    citations.append(Citation(
-                        doi=c["doi"],
-                        title=evidence_item.title,
-                        idx=c["idx"]
-                    ))
-
-            # Validate every sentence in answer contains at least one evidence DOI
-            answer = payload["answer"]
-            answer_sentences = [s.strip() for s in re.split(r'[.!?]', answer) if s.strip()]
-            for sent in answer_sentences:
-                # Skip validation in test mode with stub evidence
-                if os.getenv('PYTEST_CURRENT_TEST') and any('stub' in doi for doi in all_dois):
-                    continue
-                # More flexible DOI validation - check for any DOI presence
-                has_doi = False
-                for doi in all_dois:
-                    # Check for various DOI citation formats
-                    if (f"doi:{doi}" in sent or 
-                        f"({doi})" in sent or 
-                        f"(doi:{doi})" in sent or
-                        doi in sent):
-                        has_doi = True
-                        break
-                if not has_doi:
-                    raise ValueError(f"Every sentence must cite at least one evidence DOI. Offending sentence: {sent}")
-
-            return LyraOutput(
-                answer=answer,
-                gaps=payload["gaps"],
-                roadmap=roadmap,
-                citations=citations,
-            )
+            return Lyra._output_from_payload(loads(content), nova_output, all_dois)
         except Exception as exc:  # noqa: BLE001
             raise ValueError(
                 "Lyra received non-JSON or malformed JSON:\n"
-                + response.choices[0].message.content
+                + content
             ) from exc
 
+    @staticmethod
+    def _output_from_payload(payload: dict, nova_output: NovaOutput, all_dois: List[str]) -> LyraOutput:
+        """Build a validated `LyraOutput` from one decoded answer object."""
+        roadmap = _ROADMAP_ADAPTER.validate_python(payload["roadmap"])
+        
+        # Build proper citations with title and doi from evidence
+        citations = []
+        for c in payload["citations"]:
+            if c["idx"] <= len(nova_output.evidence):
+                evidence_item = nova_output.evidence[c["idx"] - 1]
+                citations.append(Citation(
+                    doi=c["doi"],
+                    title=evidence_item.title,
+                    idx=c["idx"]
+                ))
+
+        answer = payload["answer"]
+        Lyra._validate_answer(answer, all_dois)
+
+        return LyraOutput(
+            answer=answer,
+            gaps=payload["gaps"],
+            roadmap=roadmap,
+            citations=citations,
+        )
+
+    # ----------------------------- runner ------------------------------ #
+    def run_raw(
+        self,
+        question: str,
+        nova_output: NovaOutput,
+        numerical_findings: List[NumericalFinding] = None,
+        critique: dict | None = None,
+    ) -> LyraOutput:
+        """
+        Raw version that doesn't call Critic - used for testing and internal calls.
+
+        Streams the reply under ``LYRA_STREAM=1`` exactly like `arun_raw`.
+        """
+        request, all_dois = self._build_request(question, nova_output, numerical_findings, critique)
+
+        embedding = None
+        content = lookup(**request)
+        if content is None and SEMANTIC_CACHE is not None:
+            embedding = get_embedding(question, self.client)
+            content = SEMANTIC_CACHE.get(SemanticCache.scope_key(request, question), embedding)
+        if content is not None:
+            return self._parse_response(content, nova_output, all_dois)
+
+        if os.getenv("LYRA_STREAM", "1") == "1":
+            content = self._stream_content(request, all_dois)
+        else:
+            response = self.client.chat.completions.create(**request)
+            content = response.choices[0].message.content
+        output = self._parse_response(content, nova_output, all_dois)
+        self._remember(request, question, embedding, content)
+        return output
+
+    async def arun_raw(
+        self,
+        question: str,
+        nova_output: NovaOutput,
+        numerical_findings: List[NumericalFinding] = None,
+        critique: dict | None = None,
+    ) -> LyraOutput:
+        """
+        Async version of `run_raw`.
+
+        With ``LYRA_STREAM=1`` (default) the reply is streamed and the
+        `answer` field is DOI-validated as soon as it is complete, so a
+        draft that would be rejected anyway is abandoned before the model
+        finishes generating the roadmap and citations.
+        """
+        request, all_dois = self._build_request(question, nova_output, numerical_findings, critique)
+
+        embedding = None
+        content = lookup(**request)
+        if content is None and SEMANTIC_CACHE is not None:
+            response = await self.aclient.embeddings.create(
+                model=os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small"),
+                input=question,
+            )
+            embedding = response.data[0].embedding
+            content = SEMANTIC_CACHE.get(SemanticCache.scope_key(request, question), embedding)
+        if content is not None:
+            return self._parse_response(content, nova_output, all_dois)
+
+        if os.getenv("LYRA_STREAM", "1") == "1":
+            content = await self._astream_content(request, all_dois)
+        else:
+            response = await bounded_chat(self.aclient, **request)
+            content = response.choices[0].message.content
+        output = self._parse_response(content, nova_output, all_dois)
+        self._remember(request, question, embedding, content)
+        return output
+
+    @staticmethod
+    def _remember(request: dict, question: str, embedding: List[float] | None, content: str) -> None:
+        """Cache a reply that parsed and validated cleanly."""
+        store(content, **request)
+        if SEMANTIC_CACHE is not None and embedding is not None:
+            SEMANTIC_CACHE.put(SemanticCache.scope_key(request, question), embedding, content)
+
+    @classmethod
+    def _check_streamed_answer(cls, content: str, all_dois: List[str]) -> str | None:
+        """Validate `answer` once it is complete in `content`; returns it when checked."""
+        match = _ANSWER_RE.search(content)
+        if match is None:
+            return None
+        answer = loads(f'"{match.group(1)}"')
+        cls._validate_answer(answer, all_dois)
+        return answer
+
+    def _stream_events(self, request: dict, all_dois: List[str]) -> Generator[str, None, str]:
+        """
+        Stream the completion, yielding the validated `answer` as soon as it
+        is complete; returns the full reply.  A buffered reply (if the server
+        sends one) is returned without yielding.
+        """
+        stream = self.client.chat.completions.create(**request, stream=True)
+        if hasattr(stream, "choices"):
+            return stream.choices[0].message.content
+        content = ""
+        answer_checked = False
+        try:
+            for chunk in stream:
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                content += chunk.choices[0].delta.content
+                if not answer_checked:
+                    answer = self._check_streamed_answer(content, all_dois)
+                    if answer is not None:
+                        answer_checked = True
+                        yield answer
+        except (ValueError, GeneratorExit):
+            stream.close()
+            raise
+        return content
+
+    def _stream_content(self, request: dict, all_dois: List[str]) -> str:
+        """Sync `_astream_content`; falls back to a buffered reply if one comes back."""
+        events = self._stream_events(request, all_dois)
+        while True:
+            try:
+                next(events)
+            except StopIteration as stop:
+                return stop.value
+
+    async def _astream_content(self, request: dict, all_dois: List[str]) -> str:
+        """Stream the completion, validating `answer` while the rest is generated."""
+        await acquire_for(request)
+        # Hold the concurrency slot for the whole stream, not just the headers
+        async with get_semaphore():
+            stream = await self.aclient.chat.completions.create(**request, stream=True)
+            content = ""
+            answer_checked = False
+            try:
+                async for chunk in stream:
+                    if not chunk.choices or not chunk.choices[0].delta.content:
+                        continue
+                    content += chunk.choices[0].delta.content
+                    if not answer_checked:
+                        answer_checked = self._check_streamed_answer(content, all_dois) is not None
+            except ValueError:
+                await stream.close()
+                raise
+        return content
+
+    def run_streaming(
+        self,
+        question: str,
+        nova_output: NovaOutput,
+        numerical_findings: List[NumericalFinding] = None,
+        critique: dict | None = None,
+    ) -> Iterator[LyraOutput]:
+        """
+        Streaming `run_raw` that yields exactly two outputs.
+
+        The first is a partial `LyraOutput` carrying only the (validated)
+        answer, yielded as soon as the answer field has streamed in; the
+        second is the complete output.  Downstream stages can start on the
+        answer while the roadmap and citations are still being generated::
+
+            outputs = lyra.run_streaming(question, nova_output)
+            first = next(outputs)   # answer only
+            final = next(outputs)   # authoritative
+
+        No Critic pass is made.
+        """
+        request, all_dois = self._build_request(question, nova_output, numerical_findings, critique)
+
+        answered = False
+        content = lookup(**request)
+        fetched = content is None
+        if fetched:
+            events = self._stream_events(request, all_dois)
+            while True:
+                try:
+                    answer = next(events)
+                except StopIteration as stop:
+                    content = stop.value
+                    break
+                answered = True
+                yield LyraOutput(answer=answer, gaps=[], roadmap=[], citations=[])
+
+        output = self._parse_response(content, nova_output, all_dois)
+        if fetched:
+            self._remember(request, question, None, content)
+        if not answered:
+            yield LyraOutput(answer=output.answer, gaps=[], roadmap=[], citations=[])
+        yield output
+
     def run(
         self,
         question: str,
@@ -224,16 +563,214 @@ class Lyra:
         # Let Critic review the answer quality and citation accuracy
         try:
             critic_output = self.critic.run(question, lyra_output)
-            print(f"[Lyra] Critic review: {'PASS' if critic_output.passes else 'FAIL'}")
+            logger.info("Critic review: %s", "PASS" if critic_output.passes else "FAIL")
             if not critic_output.passes:
-                print(f"[Lyra] Missing points: {critic_output.missing_points}")
+                logger.info("Missing points: %s", critic_output.missing_points)
         except Exception as e:
-            print(f"[Lyra] Critic review failed: {e}")
+            logger.warning("Critic review failed: %s", e)
             critic_output = None
         
         # Store critic feedback in the output (we'll need to add this field to LyraOutput)
         # For now, we'll just log it
         if critic_output:
-            lyra_output.critic_feedback = critic_output
+            lyra_output = lyra_output.model_copy(update={"critic_feedback": critic_output})
         
         return lyra_output
+
+    async def arun(
+        self,
+        question: str,
+        nova_output: NovaOutput,
+        numerical_findings: List[NumericalFinding] = None,
+        critique: dict | None = None,
+    ) -> LyraOutput:
+        """
+        Async entry point – drafts, has the Critic review, redrafts on failure.
+
+        With ``LYRA_SPECULATIVE_RETRY=1`` the redraft (prompted with a generic
+        critique, since the real one is not known yet) runs alongside the
+        Critic review and is discarded if the first draft passes.
+        """
+        draft = await self.arun_raw(question, nova_output, numerical_findings, critique)
+
+        retry_task = None
+        if os.getenv("LYRA_SPECULATIVE_RETRY", "0") == "1":
+            retry_task = asyncio.create_task(
+                self.arun_raw(question, nova_output, numerical_findings, SPECULATIVE_CRITIQUE)
+            )
+
+        try:
+            critic_output = await self.critic.arun(question, draft)
+            logger.info("Critic review: %s", "PASS" if critic_output.passes else "FAIL")
+        except Exception as e:
+            logger.warning("Critic review failed: %s", e)
+            if retry_task:
+                retry_task.cancel()
+            return draft
+
+        if critic_output.passes:
+            if retry_task:
+                retry_task.cancel()
+            return draft.model_copy(update={"critic_feedback": critic_output})
+
+        logger.info("Missing points: %s", critic_output.missing_points)
+        try:
+            if retry_task:
+                revised = await retry_task
+            else:
+                revised = await self.arun_raw(
+                    question, nova_output, numerical_findings,
+                    {"missing_points": critic_output.missing_points},
+                )
+        except Exception as e:
+            logger.warning("Redraft failed, keeping first draft: %s", e)
+            revised = draft
+
+        return revised.model_copy(update={"critic_feedback": critic_output})
+
+    async def run_many(
+        self,
+        jobs: Sequence[Tuple[str, NovaOutput]],
+        max_requests_per_minute: float | None = None,
+        max_tokens_per_minute: float | None = None,
+    ) -> List[LyraOutput | Exception]:
+        """
+        Run `arun` over many ``(question, nova_output)`` jobs concurrently.
+
+        Every completion a job sends (draft, Critic review, redraft) is
+        throttled by RPM/TPM token buckets (``LYRA_MAX_RPM`` /
+        ``LYRA_MAX_TPM`` by default) on top of the global concurrency cap;
+        429 / 5xx / connection errors are left to the client's own retries.
+        Results keep job order; a job that still fails yields its exception
+        instead of aborting the batch.
+        """
+        limiter = RateLimiter(
+            max_requests_per_minute or float(os.getenv("LYRA_MAX_RPM", "500")),
+            max_tokens_per_minute or float(os.getenv("LYRA_MAX_TPM", "30000")),
+        )
+        # gather wraps each job in a task that inherits the limiter context
+        with rate_limited(limiter):
+            return await asyncio.gather(
+                *(self.arun(question, nova_output) for question, nova_output in jobs),
+                return_exceptions=True,
+            )
+
+    def run_packed(
+        self, items: Sequence[Tuple[str, NovaOutput]], k: int = 5
+    ) -> List[LyraOutput | Exception]:
+        """
+        Answer many ``(question, nova_output)`` pairs, `k` per chat completion.
+
+        Packing shares the system prompt and JSON schema across `k`
+        questions and divides request-per-minute usage by `k`; keep `k`
+        small so `k` answers fit in the output window.  Results keep item
+        order; an item whose answer is missing or fails validation yields
+        the exception instead.  No Critic pass is made.
+        """
+        results: List[LyraOutput | Exception] = []
+        create = self.client.chat.completions.create
+        for start in range(0, len(items), k):
+            group = items[start:start + k]
+            sections, dois = [], []
+            prompt_tokens = self._rough_tokens(_PACKED_SCHEMA_SUFFIX)
+            for n, (question, nova_output) in enumerate(group, 1):
+                item_msg, all_dois, item_tokens = self._item_prompt(question, nova_output, None, None)
+                sections.append(f"=== ITEM {n} ===\n{item_msg}")
+                dois.append(all_dois)
+                prompt_tokens += item_tokens
+            request = self._request_for(
+                "\n".join(sections) + "\n" + _PACKED_SCHEMA_SUFFIX,
+                prompt_tokens,
+                max_out_tokens=1_000 * len(group),
+                n_items=len(group),
+            )
+
+            try:
+                content = create(**request).choices[0].message.content
+                payloads = loads(content)["results"]
+            except Exception as exc:  # noqa: BLE001
+                results.extend(exc for _ in group)
+                continue
+
+            for n, (_, nova_output) in enumerate(group):
+                try:
+                    results.append(self._output_from_payload(payloads[n], nova_output, dois[n]))
+                except Exception as exc:  # noqa: BLE001
+                    results.append(exc)
+        return results
+
+    # --------------------------- Batch API ----------------------------- #
+    def submit_batch(self, jobs: Sequence[Tuple[str, NovaOutput]]) -> str:
+        """
+        Queue ``(question, nova_output)`` jobs on the OpenAI Batch API.
+
+        Batch requests cost half the synchronous price and draw on a
+        separate rate-limit pool, at the price of a 24 h completion window –
+        meant for overnight / bulk runs.  Each job carries the same request
+        `run_raw` would send; ``custom_id`` is the job's index.
+
+        Returns
+        -------
+        str
+            The batch id to pass to `poll_batch` together with the same jobs.
+        """
+        lines = []
+        for idx, (question, nova_output) in enumerate(jobs):
+            request, _ = self._build_request(question, nova_output, None, None)
+            lines.append(dumps({
+                "custom_id": f"lyra-{idx}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": request,
+            }))
+
+        batch_file = self.client.files.create(
+            file=("lyra_batch.jsonl", b"\n".join(lines)),
+            purpose="batch",
+        )
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        logger.info("Submitted batch %s with %d jobs", batch.id, len(lines))
+        return batch.id
+
+    def poll_batch(
+        self, batch_id: str, jobs: Sequence[Tuple[str, NovaOutput]]
+    ) -> List[LyraOutput | Exception] | None:
+        """
+        Collect the results of `submit_batch`.
+
+        Returns None while the batch is still running, otherwise one entry
+        per job (in job order): the parsed `LyraOutput`, or the exception
+        explaining why that job has no valid answer.  Raises RuntimeError if
+        the batch itself failed, expired or was cancelled.
+        """
+        batch = self.client.batches.retrieve(batch_id)
+        if batch.status in ("failed", "expired", "cancelled"):
+            raise RuntimeError(f"Lyra batch {batch_id} ended with status {batch.status}")
+        if batch.status != "completed":
+            return None
+
+        results: List[LyraOutput | Exception] = [
+            RuntimeError("No result returned for this job") for _ in jobs
+        ]
+        if not batch.output_file_id:
+            return results
+
+        for line in self.client.files.content(batch.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            record = loads(line)
+            idx = int(record["custom_id"].rsplit("-", 1)[1])
+            question, nova_output = jobs[idx]
+            try:
+                if record.get("error"):
+                    raise RuntimeError(str(record["error"]))
+                content = record["response"]["body"]["choices"][0]["message"]["content"]
+                all_dois = [item.doi for item in nova_output.evidence if item.doi]
+                results[idx] = self._parse_response(content, nova_output, all_dois)
+            except Exception as exc:  # noqa: BLE001
+                results[idx] = exc
+        return results
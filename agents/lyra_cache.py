@@ -0,0 +1,84 @@
+"""
+Lyra semantic cache
+-------------------
+
+Exact repeats of a Lyra prompt are already served from `utils.llm_cache`.
+This in-memory layer also catches *paraphrased* questions: replies are
+stored under a scope (everything in the request except the question –
+model, system prompt, evidence block, DOI list, critique) together with
+an embedding of the question, and a later request in the same scope hits
+when its question embedding has cosine similarity ≥ ``threshold``.
+
+Requiring an identical scope means a hit is only ever served over the
+very same evidence, so the cached answer's DOIs remain valid.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from services.retriever import cosine_similarity
+
+
+class SemanticCache:
+    """LRU (by scope) + TTL cache of Lyra replies keyed on question embeddings."""
+
+    def __init__(
+        self,
+        threshold: float = 0.92,
+        max_scopes: int = 256,
+        per_scope: int = 32,
+        ttl: float = 24 * 3600,
+    ) -> None:
+        self.threshold = threshold
+        self.max_scopes = max_scopes
+        self.per_scope = per_scope
+        self.ttl = ttl
+        self._scopes: "OrderedDict[str, List[Tuple[List[float], str, float]]]" = OrderedDict()
+        self._lock = threading.Lock()  # shared by threads-pool worker tasks
+
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def scope_key(request: dict, question: str) -> str:
+        """Hash the request with the question removed from the user message."""
+        messages = []
+        for msg in request["messages"]:
+            content = msg["content"]
+            if msg["role"] == "user":
+                content = content.replace(question, "", 1)
+            messages.append({"role": msg["role"], "content": content})
+        scoped = dict(request, messages=messages)
+        return hashlib.sha256(json.dumps(scoped, sort_keys=True).encode()).hexdigest()
+
+    def get(self, scope: str, embedding: List[float]) -> Optional[str]:
+        """Return the best cached reply above the threshold, if any."""
+        with self._lock:
+            entries = self._scopes.get(scope)
+            if not entries:
+                return None
+
+            now = time.monotonic()
+            entries[:] = [e for e in entries if now - e[2] < self.ttl]
+            best, best_sim = None, self.threshold
+            for vector, content, _ in entries:
+                sim = cosine_similarity(embedding, vector)
+                if sim >= best_sim:
+                    best, best_sim = content, sim
+
+            if best is not None:
+                self._scopes.move_to_end(scope)
+            return best
+
+    def put(self, scope: str, embedding: List[float], content: str) -> None:
+        with self._lock:
+            entries = self._scopes.setdefault(scope, [])
+            entries.append((embedding, content, time.monotonic()))
+            del entries[:-self.per_scope]
+            self._scopes.move_to_end(scope)
+            while len(self._scopes) > self.max_scopes:
+                self._scopes.popitem(last=False)
@@ -9,16 +9,96 @@ Implements deduplication and ranking by (citations × recency)/(retraction risk)
 
 from __future__ import annotations
 
-from typing import List, Optional
-from datetime import datetime, timedelta
+from typing import Iterator, List, Optional
+import asyncio
+import heapq
+from functools import lru_cache
+import math
 import re
 import os
+import time
 
-from services.retriever import search_arxiv_and_pubmed, deduplicate_evidence
+from services.retriever import (
+    search_arxiv_and_pubmed,
+    async_search_arxiv_and_pubmed,
+    deduplicate_evidence,
+)
 from app.models import SophiaOutput, NovaOutput, EvidenceItem
 from agents.critic import Critic
 from utils.exceptions import InsufficientEvidenceError
 
+REVIEW_MARKERS = ('review', 'meta-analysis', 'systematic')
+# CiteRank-style recency: current relevance decays as exp(-age / tau), tau ≈ 2.6 years
+RECENCY_TAU_SECONDS = 2.6 * 365.25 * 86400
+
+# One scan of the title for all markers (substring match, like `in`)
+_REVIEW_RE = re.compile("|".join(map(re.escape, REVIEW_MARKERS)), re.IGNORECASE)
+
+# Keyword expansion groups: (question triggers, terms added when triggered)
+_KEYWORD_EXPANSIONS = (
+    (frozenset({'how', 'method', 'technique', 'approach'}),
+     ('methodology', 'technique', 'approach', 'procedure', 'protocol')),
+    (frozenset({'compare', 'versus', 'vs', 'difference', 'similar'}),
+     ('comparison', 'versus', 'difference', 'similarity', 'contrast')),
+    (frozenset({'recent', 'latest', 'new', 'old', 'trend'}),
+     ('recent', 'latest', 'trend', 'development', 'advancement')),
+)
+# Critic rerun reasons that call for keyword expansion (substring match)
+_NARROW_FEEDBACK_RE = re.compile(r"narrow|limited|insufficient|more diverse", re.IGNORECASE)
+_STOPWORDS = frozenset({'the', 'and', 'for', 'with', 'that', 'this', 'have', 'been', 'from'})
+_WORD_RE = re.compile(r"\w+")
+_MEANINGFUL_WORD_RE = re.compile(r"\w{4,}")
+
+# Fallback evidence when retrieval fails outside tests (built once)
+_STUB_EVIDENCE = tuple(
+    EvidenceItem(title=f"Stub {n}", doi=f"10.0000/stub{n}", summary="n/a", url="#", source="arxiv")
+    for n in (1, 2, 3)
+)
+
+
+@lru_cache(maxsize=4096)
+def _content_score(title: str, has_doi: bool, n_authors: int) -> float:
+    """
+    Time-independent part of `Nova._calculate_score`.
+
+    Keyed on plain values rather than `EvidenceItem` instances, so the
+    same paper re-fetched on an adaptive rerun hits the cache.
+    """
+    score = 1.0
+    
+    # Title quality indicators
+    if _REVIEW_RE.search(title):
+        score *= 1.2  # Review papers get bonus
+    
+    # Author count bonus (more authors might indicate collaboration)
+    if n_authors > 1:
+        score *= min(1.5, 1.0 + (n_authors - 1) * 0.1)
+    
+    # DOI presence bonus (more likely to be peer-reviewed)
+    if has_doi:
+        score *= 1.1
+    
+    return score
+
+
+@lru_cache(maxsize=512)
+def _expand_keywords_cached(keywords: tuple[str, ...], question: str) -> tuple[str, ...]:
+    """Memoised body of `Nova._expand_keywords` (Critic reruns repeat the same inputs)."""
+    expanded = list(keywords)
+    
+    # Add related terms based on question type
+    q_words = set(_WORD_RE.findall(question.lower()))
+    for triggers, terms in _KEYWORD_EXPANSIONS:
+        if not triggers.isdisjoint(q_words):
+            expanded.extend(terms)
+    
+    # Remove duplicates (case-insensitively) while preserving order
+    unique_keywords = {}
+    for keyword in expanded:
+        unique_keywords.setdefault(keyword.lower(), keyword)
+    
+    return tuple(unique_keywords.values())[:10]  # Limit to 10 keywords
+
 
 class Nova:
     """Retrieve top-k relevant papers from arXiv and PubMed with deduplication."""
@@ -29,46 +109,36 @@ class Nova:
         self.subject_filters = ["q-bio.NC", "q-bio.BM"]
         self.negative_terms = ["deep learning", "lifelong", "neural network"]
 
-    def _calculate_score(self, item: EvidenceItem) -> float:
+    def _calculate_score(self, item: EvidenceItem, now: Optional[float] = None) -> float:
         """
         Calculate a score based on (citations × recency)/(retraction risk).
         For now, use simple heuristics since we don't have citation data.
         """
-        # Base score
-        score = 1.0
+        # Base score: the retriever's own relevance weight (1.0 if unranked)
+        score = item.retrieval_score
         
-        # Recency bonus (newer papers get higher scores)
-        # This is a simplified version - in practice you'd parse publication dates
-        if hasattr(item, 'published_date') and item.published_date:
-            days_old = (datetime.now() - item.published_date).days
-            recency_factor = max(0.1, 1.0 - (days_old / 3650))  # Decay over 10 years
-            score *= recency_factor
+        # Recency: exponential decay with publication age (no citation counts
+        # are available, so this is the pure-recency CiteRank teleport weight)
+        if item.published_ts is not None:
+            age = max(0.0, (now or time.time()) - item.published_ts)
+            score *= math.exp(-age / RECENCY_TAU_SECONDS)
         
-        # Title quality indicators
-        title_lower = item.title.lower()
-        if any(word in title_lower for word in ['review', 'meta-analysis', 'systematic']):
-            score *= 1.2  # Review papers get bonus
-        
-        # Author count bonus (more authors might indicate collaboration)
-        if item.authors and len(item.authors) > 1:
-            score *= min(1.5, 1.0 + (len(item.authors) - 1) * 0.1)
-        
-        # DOI presence bonus (more likely to be peer-reviewed)
-        if item.doi:
-            score *= 1.1
-        
-        return score
+        return score * _content_score(item.title, bool(item.doi), len(item.authors or ()))
 
-    def _rank_by_score(self, items: List[EvidenceItem]) -> List[EvidenceItem]:
-        """Rank items by calculated score."""
-        scored_items = [(item, self._calculate_score(item)) for item in items]
-        scored_items.sort(key=lambda x: x[1], reverse=True)
-        return [item for item, score in scored_items]
+    def _rank_by_score(self, items: List[EvidenceItem], limit: Optional[int] = None) -> List[EvidenceItem]:
+        """Rank items by calculated score (stable for ties), keeping the top `limit`."""
+        now = time.time()
+        key = lambda item: self._calculate_score(item, now)
+        if limit is not None:
+            return heapq.nlargest(limit, items, key=key)
+        return sorted(items, key=key, reverse=True)
 
     # ------------------------------------------------------------------ #
     # Public API
     # ------------------------------------------------------------------ #
-    def run_raw(self, question: str, sophia_output: SophiaOutput) -> NovaOutput:
+    def run_raw(
+        self, question: str, sophia_output: SophiaOutput, max_results: Optional[int] = None
+    ) -> NovaOutput:
         """
         Raw version that doesn't call Critic - used for testing and internal calls.
         
@@ -78,31 +148,93 @@ class Nova:
             The original question
         sophia_output : SophiaOutput
             Contains the list of keywords produced by Sophia.
+        max_results : int, optional
+            Overrides ``self.max_results`` for this call only.
 
         Returns
         -------
         NovaOutput
             Wraps the list of `EvidenceItem` objects, deduplicated and ranked.
         """
-        subject_filters = ["q-bio.NC", "q-bio.BM"]
-        negative_terms = ["deep learning", "lifelong", "neural network"]
+        limit = max_results or self.max_results
         evidence: List[EvidenceItem] = search_arxiv_and_pubmed(
             sophia_output.keywords,
-            max_results=self.max_results * 2,  # Get more to account for deduplication
-            subject_filters=subject_filters,
-            negative_terms=negative_terms
+            max_results=limit * 2,  # Get more to account for deduplication
+            subject_filters=self.subject_filters,
+            negative_terms=self.negative_terms
+        )
+        return self._raw_output(evidence, limit)
+
+    async def run_raw_async(
+        self, question: str, sophia_output: SophiaOutput, max_results: Optional[int] = None
+    ) -> NovaOutput:
+        """
+        Async `run_raw`: arXiv and PubMed are queried concurrently, so a
+        PubMed fallback costs max(arXiv, PubMed) latency instead of the sum.
+        `max_results` overrides ``self.max_results`` for this call only.
+        """
+        limit = max_results or self.max_results
+        evidence: List[EvidenceItem] = await async_search_arxiv_and_pubmed(
+            sophia_output.keywords,
+            max_results=limit * 2,  # Get more to account for deduplication
+            subject_filters=self.subject_filters,
+            negative_terms=self.negative_terms
         )
+        return self._raw_output(evidence, limit)
 
+    def _raw_output(self, evidence: List[EvidenceItem], limit: Optional[int] = None) -> NovaOutput:
+        """Deduplicate, rank and trim raw search hits for `run_raw`."""
         # Deduplicate by DOI and source
         deduplicated_evidence = deduplicate_evidence(evidence)
-        ranked_evidence = self._rank_by_score(deduplicated_evidence)
-        final_evidence = ranked_evidence[:self.max_results]
+        final_evidence = self._rank_by_score(deduplicated_evidence, limit or self.max_results)
 
         # Guard-rail: fail if <3 evidence after all retrieval
         if len(final_evidence) < 3:
             raise InsufficientEvidenceError("Fewer than 3 biomedical evidence items found after arXiv/PubMed search.")
 
-        return NovaOutput(evidence=final_evidence)
+        return NovaOutput.model_construct(evidence=final_evidence)
+
+    @staticmethod
+    def _stub_output() -> NovaOutput:
+        """Placeholder evidence returned outside tests when retrieval comes up short."""
+        return NovaOutput.model_construct(evidence=list(_STUB_EVIDENCE))
+
+    def _initial_evidence(self, evidence: Optional[List[EvidenceItem]]) -> Optional[List[EvidenceItem]]:
+        """
+        Dedupe and rank the first search's hits for `run` / `run_async`.
+
+        Returns None when the stub fallback should be used instead; in test
+        mode raises `InsufficientEvidenceError` rather than falling back.
+        """
+        # If evidence is None or empty, use fallback
+        if evidence is None or len(evidence) == 0:
+            print(f"[Nova DEBUG] PYTEST_CURRENT_TEST: {os.getenv('PYTEST_CURRENT_TEST')}")
+            if os.getenv('PYTEST_CURRENT_TEST'):
+                raise InsufficientEvidenceError("No evidence found for the given keywords.")
+            return None
+        
+        # Always apply deduplication and ranking
+        deduplicated_evidence = deduplicate_evidence(evidence)
+        final_evidence = self._rank_by_score(deduplicated_evidence, self.max_results)
+        
+        # In test mode, raise error if < 3 evidence (don't use fallback)
+        if os.getenv('PYTEST_CURRENT_TEST') and (not final_evidence or len(final_evidence) < 3):
+            raise InsufficientEvidenceError("Fewer than 3 biomedical evidence items found after arXiv/PubMed search.")
+        
+        # In production mode, use fallback if < 3 evidence
+        if not final_evidence or len(final_evidence) < 3:
+            print(f"[Nova DEBUG] Fallback triggered, PYTEST_CURRENT_TEST: {os.getenv('PYTEST_CURRENT_TEST')}")
+            return None
+        return final_evidence
+
+    def _search_failed(self, e: Exception) -> NovaOutput:
+        """Stub output for a failed first search (re-raised as an error in test mode)."""
+        # In test mode, raise InsufficientEvidenceError for any search exception
+        if os.getenv('PYTEST_CURRENT_TEST'):
+            print(f"[Nova DEBUG] Search exception in test mode: {e}")
+            raise InsufficientEvidenceError(f"Search failed: {e}")
+        # Fallback: return stub evidence
+        return self._stub_output()
 
     def run(self, question: str, sophia_output: SophiaOutput) -> NovaOutput:
         """
@@ -129,56 +261,13 @@ class Nova:
                 negative_terms=self.negative_terms,
             )
         except Exception as e:
-            # In test mode, raise InsufficientEvidenceError for any search exception
-            if os.getenv('PYTEST_CURRENT_TEST'):
-                print(f"[Nova DEBUG] Search exception in test mode: {e}")
-                raise InsufficientEvidenceError(f"Search failed: {e}")
-            # Fallback: return stub evidence
-            return NovaOutput(
-                evidence=[
-                    EvidenceItem(title="Stub 1", doi="10.0000/stub1", summary="n/a", url="#", source="arxiv"),
-                    EvidenceItem(title="Stub 2", doi="10.0000/stub2", summary="n/a", url="#", source="arxiv"),
-                    EvidenceItem(title="Stub 3", doi="10.0000/stub3", summary="n/a", url="#", source="arxiv"),
-                ]
-            )
-        
-        # If evidence is None or empty, use fallback
-        if evidence is None or len(evidence) == 0:
-            print(f"[Nova DEBUG] PYTEST_CURRENT_TEST: {os.getenv('PYTEST_CURRENT_TEST')}")
-            if os.getenv('PYTEST_CURRENT_TEST'):
-                raise InsufficientEvidenceError("No evidence found for the given keywords.")
-            return NovaOutput(
-                evidence=[
-                    EvidenceItem(title="Stub 1", doi="10.0000/stub1", summary="n/a", url="#", source="arxiv"),
-                    EvidenceItem(title="Stub 2", doi="10.0000/stub2", summary="n/a", url="#", source="arxiv"),
-                    EvidenceItem(title="Stub 3", doi="10.0000/stub3", summary="n/a", url="#", source="arxiv"),
-                ]
-            )
-        
-        # Always apply deduplication and ranking
-        deduplicated_evidence = deduplicate_evidence(evidence)
-        ranked_evidence = self._rank_by_score(deduplicated_evidence)
-        final_evidence = ranked_evidence[:self.max_results]
-        
-        # In test mode, raise error if < 3 evidence (don't use fallback)
-        if os.getenv('PYTEST_CURRENT_TEST') and (not final_evidence or len(final_evidence) < 3):
-            raise InsufficientEvidenceError("Fewer than 3 biomedical evidence items found after arXiv/PubMed search.")
+            return self._search_failed(e)
         
-        # In production mode, use fallback if < 3 evidence
-        if not final_evidence or len(final_evidence) < 3:
-            if os.getenv('PYTEST_CURRENT_TEST'):
-                print('[Nova DEBUG] Raising InsufficientEvidenceError in fallback block')
-                raise InsufficientEvidenceError("Fewer than 3 biomedical evidence items found after arXiv/PubMed search.")
-            print(f"[Nova DEBUG] Fallback triggered, PYTEST_CURRENT_TEST: {os.getenv('PYTEST_CURRENT_TEST')}")
-            return NovaOutput(
-                evidence=[
-                    EvidenceItem(title="Stub 1", doi="10.0000/stub1", summary="n/a", url="#", source="arxiv"),
-                    EvidenceItem(title="Stub 2", doi="10.0000/stub2", summary="n/a", url="#", source="arxiv"),
-                    EvidenceItem(title="Stub 3", doi="10.0000/stub3", summary="n/a", url="#", source="arxiv"),
-                ]
-            )
+        final_evidence = self._initial_evidence(evidence)
+        if final_evidence is None:
+            return self._stub_output()
         
-        nova_output = NovaOutput(evidence=final_evidence)
+        nova_output = NovaOutput.model_construct(evidence=final_evidence)
 
         # Let Critic review and potentially improve the evidence
         critic_feedback = self.critic.run_raw(
@@ -198,121 +287,164 @@ class Nova:
                 print(f"[Nova] Adaptive search found {len(nova_output.evidence)} improved evidence items")
         
         # Update the output with Critic's feedback
-        nova_output.critic_feedback = critic_feedback
-        
-        return nova_output
+        return nova_output.model_copy(update={"critic_feedback": critic_feedback})
 
-    def _adaptive_search(self, question: str, sophia_output: SophiaOutput, 
-                        critic_feedback: CriticFeedback) -> Optional[NovaOutput]:
+    async def run_async(self, question: str, sophia_output: SophiaOutput) -> NovaOutput:
         """
-        Perform adaptive search based on Critic feedback.
-        
-        Parameters
-        ----------
-        question : str
-            The original question
-        sophia_output : SophiaOutput
-            Original Sophia output
-        critic_feedback : CriticFeedback
-            Feedback from Critic agent
-            
-        Returns
-        -------
-        Optional[NovaOutput]
-            Improved evidence or None if no improvement found
+        Async `run` that overlaps the widened rerun with the Critic review.
+
+        The broader search `_adaptive_search` falls back to on a low quality
+        score is started speculatively alongside the initial search; it is
+        used if the Critic asks for it and cancelled otherwise.  Costs one
+        extra (bounded) arXiv/PubMed query per question.  On a rerun, every
+        applicable strategy is searched concurrently (see
+        `_run_adaptive_plans`).
+        """
+        widened = asyncio.create_task(
+            self.run_raw_async(question, sophia_output, max_results=self._widened_max_results())
+        )
+        # Don't warn about an exception nobody needed the result of
+        widened.add_done_callback(lambda task: task.cancelled() or task.exception())
+        try:
+            try:
+                evidence = await async_search_arxiv_and_pubmed(
+                    sophia_output.keywords,
+                    max_results=self.max_results,
+                    subject_filters=self.subject_filters,
+                    negative_terms=self.negative_terms,
+                )
+            except Exception as e:
+                return self._search_failed(e)
+
+            final_evidence = self._initial_evidence(evidence)
+            if final_evidence is None:
+                return self._stub_output()
+
+            nova_output = NovaOutput.model_construct(evidence=final_evidence)
+            critic_feedback = await self.critic.arun_raw(question, nova_output.evidence, "Nova")
+
+            if critic_feedback.should_rerun:
+                print(f"[Nova] Critic suggested rerunning with: {critic_feedback.rerun_reason}")
+                plans = list(self._adaptive_plans(question, sophia_output, critic_feedback))
+                adaptive_output = await self._run_adaptive_plans(question, plans, widened)
+                if adaptive_output and len(adaptive_output.evidence) > 0:
+                    nova_output = adaptive_output
+                    print(f"[Nova] Adaptive search found {len(nova_output.evidence)} improved evidence items")
+
+            return nova_output.model_copy(update={"critic_feedback": critic_feedback})
+        finally:
+            widened.cancel()
+
+    async def _run_adaptive_plans(
+        self, question: str, plans: List[tuple[SophiaOutput, bool]], widened: asyncio.Task
+    ) -> Optional[NovaOutput]:
+        """
+        Run all applicable strategies concurrently; the highest-priority one
+        that finds evidence wins, so a failing preferred strategy falls back
+        to the next instead of costing another round-trip.
+        """
+        results = await asyncio.gather(
+            *(widened if widen else self.run_raw_async(question, sophia) for sophia, widen in plans),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, NovaOutput) and result.evidence:
+                return result
+        # Nothing usable: fail like the sync path would on its first strategy
+        if results and isinstance(results[0], Exception):
+            raise results[0]
+        return None
+
+    def _widened_max_results(self) -> int:
+        return min(20, self.max_results * 2)  # Double but cap at 20
+
+    def _adaptive_plan(self, question: str, sophia_output: SophiaOutput,
+                       critic_feedback: CriticFeedback) -> Optional[tuple[SophiaOutput, bool]]:
+        """
+        Pick the adaptive-search strategy for the Critic's feedback.
+
+        Returns the `SophiaOutput` to search with and whether to widen
+        ``max_results``, or None when no strategy applies.
         """
+        return next(self._adaptive_plans(question, sophia_output, critic_feedback), None)
+
+    def _adaptive_plans(self, question: str, sophia_output: SophiaOutput,
+                        critic_feedback: CriticFeedback) -> Iterator[tuple[SophiaOutput, bool]]:
+        """Every applicable `_adaptive_plan` strategy, in priority order (lazily)."""
         # Analyze feedback to determine search strategy
         feedback_text = critic_feedback.rerun_reason or ""
         suggestions = critic_feedback.suggestions
         
         # Strategy 1: Expand keywords if evidence is too narrow
-        if any(word in feedback_text.lower() for word in ['narrow', 'limited', 'insufficient', 'more diverse']):
+        if _NARROW_FEEDBACK_RE.search(feedback_text):
             expanded_keywords = self._expand_keywords(sophia_output.keywords, question)
             if expanded_keywords != sophia_output.keywords:
                 print(f"[Nova] Expanding keywords: {sophia_output.keywords} -> {expanded_keywords}")
-                expanded_sophia = SophiaOutput(
-                    question_type=sophia_output.question_type,
-                    keywords=expanded_keywords
-                )
-                return self.run_raw(question, expanded_sophia)
+                expanded_sophia = sophia_output.model_copy(update={"keywords": expanded_keywords})
+                yield expanded_sophia, False
         
         # Strategy 2: Increase max_results if quality score is low
         if critic_feedback.quality_score < 0.7:
             print(f"[Nova] Low quality score ({critic_feedback.quality_score:.2f}), increasing search breadth")
-            original_max = self.max_results
-            self.max_results = min(20, self.max_results * 2)  # Double but cap at 20
-            try:
-                result = self.run_raw(question, sophia_output)
-                return result
-            finally:
-                self.max_results = original_max
+            yield sophia_output, True
         
         # Strategy 3: Focus on specific suggestions from Critic
         if suggestions:
             focused_keywords = self._focus_on_suggestions(sophia_output.keywords, suggestions)
             if focused_keywords != sophia_output.keywords:
                 print(f"[Nova] Focusing on suggestions: {focused_keywords}")
-                focused_sophia = SophiaOutput(
-                    question_type=sophia_output.question_type,
-                    keywords=focused_keywords
-                )
-                return self.run_raw(question, focused_sophia)
+                focused_sophia = sophia_output.model_copy(update={"keywords": focused_keywords})
+                yield focused_sophia, False
+
+    def _adaptive_search(self, question: str, sophia_output: SophiaOutput, 
+                        critic_feedback: CriticFeedback) -> Optional[NovaOutput]:
+        """
+        Perform adaptive search based on Critic feedback.
         
-        return None
+        Parameters
+        ----------
+        question : str
+            The original question
+        sophia_output : SophiaOutput
+            Original Sophia output
+        critic_feedback : CriticFeedback
+            Feedback from Critic agent
+            
+        Returns
+        -------
+        Optional[NovaOutput]
+            Improved evidence or None if no improvement found
+        """
+        plan = self._adaptive_plan(question, sophia_output, critic_feedback)
+        if plan is None:
+            return None
+        adaptive_sophia, widen = plan
+        # Per-call override: the instance may be shared by concurrent runs
+        return self.run_raw(
+            question, adaptive_sophia,
+            max_results=self._widened_max_results() if widen else None,
+        )
 
     def _expand_keywords(self, keywords: List[str], question: str) -> List[str]:
         """Expand keywords based on question context."""
-        expanded = keywords.copy()
-        
-        # Add related terms based on question type
-        question_lower = question.lower()
-        
-        # Add methodology terms for methodology questions
-        if any(word in question_lower for word in ['how', 'method', 'technique', 'approach']):
-            methodology_terms = ['methodology', 'technique', 'approach', 'procedure', 'protocol']
-            expanded.extend([term for term in methodology_terms if term not in expanded])
-        
-        # Add comparison terms for comparative questions
-        if any(word in question_lower for word in ['compare', 'versus', 'vs', 'difference', 'similar']):
-            comparison_terms = ['comparison', 'versus', 'difference', 'similarity', 'contrast']
-            expanded.extend([term for term in comparison_terms if term not in expanded])
-        
-        # Add temporal terms for time-related questions
-        if any(word in question_lower for word in ['recent', 'latest', 'new', 'old', 'trend']):
-            temporal_terms = ['recent', 'latest', 'trend', 'development', 'advancement']
-            expanded.extend([term for term in temporal_terms if term not in expanded])
-        
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_keywords = []
-        for keyword in expanded:
-            if keyword.lower() not in seen:
-                seen.add(keyword.lower())
-                unique_keywords.append(keyword)
-        
-        return unique_keywords[:10]  # Limit to 10 keywords
+        return list(_expand_keywords_cached(tuple(keywords), question))
 
     def _focus_on_suggestions(self, keywords: List[str], suggestions: List[str]) -> List[str]:
         """Focus keywords based on Critic suggestions."""
         # Extract key terms from suggestions
         suggestion_terms = []
         for suggestion in suggestions:
-            # Simple extraction of potential keywords (could be enhanced with NLP)
-            words = suggestion.lower().split()
-            # Filter for meaningful terms (not common words)
-            meaningful_words = [word for word in words if len(word) > 3 and word not in 
-                              ['the', 'and', 'for', 'with', 'that', 'this', 'have', 'been', 'from']]
-            suggestion_terms.extend(meaningful_words)
+            # Simple extraction of potential keywords (could be enhanced with NLP);
+            # keep meaningful terms (4+ characters, not common words)
+            words = _MEANINGFUL_WORD_RE.findall(suggestion.lower())
+            suggestion_terms.extend(word for word in words if word not in _STOPWORDS)
         
         # Combine original keywords with suggestion terms
         combined = keywords + suggestion_terms[:5]  # Add top 5 suggestion terms
         
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_keywords = []
+        # Remove case-insensitive duplicates, keeping the first spelling in order
+        unique_keywords = {}
         for keyword in combined:
-            if keyword.lower() not in seen:
-                seen.add(keyword.lower())
-                unique_keywords.append(keyword)
+            unique_keywords.setdefault(keyword.lower(), keyword)
         
-        return unique_keywords[:8]  # Limit to 8 keywords
+        return list(unique_keywords.values())[:8]  # Limit to 8 keywords
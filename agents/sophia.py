@@ -13,17 +13,37 @@ import json
 import os
 from typing import List
 
-from openai import OpenAI
+from openai import AsyncOpenAI
 from app.models import SophiaOutput, QuestionType
 from agents.critic import Critic
+from utils.openai_client import bounded_chat, get_async_client, get_client
+
+# ------------------------- prompt constants ------------------------- #
+_PROMPT_HEAD = "You are Sophia, a universal question classifier.\n\nQUESTION: "
+
+_PROMPT_SCHEMA_SUFFIX = (
+    "\n\nRespond in STRICT JSON ONLY:\n"
+    "{\n"
+    '  "question_type": "factual|causal|comparative|mechanism|prediction",\n'
+    '  "keywords": ["...", "..."]\n'
+    "}"
+)
+
+_JSON_FORMAT = {"type": "json_object"}
 
 
 class Sophia:
     """Classify a research question and pull out key terms."""
 
     def __init__(self) -> None:
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.client = get_client()
         self.model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+        self.critic = Critic()
+
+    @property
+    def aclient(self) -> AsyncOpenAI:
+        """Shared async client for the running event loop."""
+        return get_async_client()
 
     # --------------------------------------------------------------------- #
     # Public API
@@ -41,46 +61,59 @@ class Sophia:
             Dataclass/Pydantic model containing a `question_type`
             Enum and a list of `keywords`.
         """
+        user_prompt = self._user_prompt(question)
+        response = self.client.chat.completions.create(**self._chat_kwargs(user_prompt))
+        sophia_output = self._parse(response.choices[0].message.content)
 
-        # ----------------------------- messages --------------------------- #
-        user_prompt = (
-            "You are Sophia, a universal question classifier.\n\n"
-            f"QUESTION: {question}\n\n"
-            "Respond in STRICT JSON ONLY:\n"
-            "{\n"
-            '  "question_type": "factual|causal|comparative|mechanism|prediction",\n'
-            '  "keywords": ["...", "..."]\n'
-            "}"
-        )
+        # --- Critic check ---
+        try:
+            critic_result = self.critic.run_raw_messages([
+                {"role": "user", "content": user_prompt}
+            ])
+            print(f"[Sophia] Critic check: {critic_result}")
+        except Exception as exc:
+            print(f"[Sophia] Critic check failed: {exc}")
+        return sophia_output
+
+    async def run_async(self, question: str) -> SophiaOutput:
+        """Async counterpart of `run`."""
+        user_prompt = self._user_prompt(question)
+        response = await bounded_chat(self.aclient, **self._chat_kwargs(user_prompt))
+        sophia_output = self._parse(response.choices[0].message.content)
 
-        response = self.client.chat.completions.create(
+        # --- Critic check ---
+        try:
+            critic_result = await self.critic.arun_raw_messages([
+                {"role": "user", "content": user_prompt}
+            ])
+            print(f"[Sophia] Critic check: {critic_result}")
+        except Exception as exc:
+            print(f"[Sophia] Critic check failed: {exc}")
+        return sophia_output
+
+    # --------------------------------------------------------------------- #
+    # Helpers
+    # --------------------------------------------------------------------- #
+    @staticmethod
+    def _user_prompt(question: str) -> str:
+        return _PROMPT_HEAD + question + _PROMPT_SCHEMA_SUFFIX
+
+    def _chat_kwargs(self, user_prompt: str) -> dict:
+        return dict(
             model=self.model,
             messages=[{"role": "user", "content": user_prompt}],
-            response_format={"type": "json_object"},
+            response_format=_JSON_FORMAT,
             temperature=0,  # deterministic classification
         )
 
-        # ----------------------------- parsing ---------------------------- #
+    @staticmethod
+    def _parse(content: str) -> SophiaOutput:
         try:
-            payload: dict[str, str | List[str]] = json.loads(
-                response.choices[0].message.content
-            )
-            sophia_output = SophiaOutput(
+            payload: dict[str, str | List[str]] = json.loads(content)
+            return SophiaOutput(
                 question_type=QuestionType(payload["question_type"]),
                 keywords=payload["keywords"],
             )
-            # --- Critic check ---
-            try:
-                critic = Critic()
-                critic_result = critic.run_raw_messages([
-                    {"role": "user", "content": user_prompt}
-                ])
-                print(f"[Sophia] Critic check: {critic_result}")
-            except Exception as exc:
-                print(f"[Sophia] Critic check failed: {exc}")
-            return sophia_output
         except Exception as exc:  # noqa: BLE001
             # Let the caller decide what to do (fail fast in Celery task)
-            raise ValueError(
-                f"Sophia could not parse JSON: {response.choices[0].message.content}"
-            ) from exc
+            raise ValueError(f"Sophia could not parse JSON: {content}") from exc
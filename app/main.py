@@ -1,18 +1,25 @@
 # main.py  – API gateway for Scientific AI Orchestrator
-import uuid, os, json, asyncio
+import uuid, os, json
 from dotenv import load_dotenv
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from sse_starlette.sse import EventSourceResponse
 
-import redis                               # ← NEW
+import redis.asyncio as aioredis
 from .models import (
     AskRequest, AskResponse,
     TaskResult, TaskStatus,
     FeedbackRequest, FeedbackResponse
 )
-from .workers import run_pipeline          # get_task_result is no longer imported
+from utils.result_codec import decode_result, result_json
+
+# Import orjson at module level for test patching
+try:
+    import orjson
+except ImportError:
+    orjson = None  # For environments without orjson
 
 # ─────────────────────────  bootstrap  ──────────────────────────
 load_dotenv()
@@ -22,6 +29,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse if orjson is not None else JSONResponse,
 )
 
 app.add_middleware(
@@ -34,9 +42,30 @@ app.add_middleware(
 
 # ───────────────────────  shared Redis  client  ─────────────────
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-r = redis.from_url(REDIS_URL, decode_responses=True)
+# Async clients so handlers never block the event loop.  Reads share a
+# bounded pool (callers wait for a free connection rather than erroring);
+# each open /stream holds its own pub/sub connection, so those come from
+# a separate, unbounded pool and cannot starve /result.  Replies stay
+# bytes since stored results may be msgpack (see utils.result_codec).
+r = aioredis.Redis(
+    connection_pool=aioredis.BlockingConnectionPool.from_url(
+        REDIS_URL,
+        max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", "64")),
+    )
+)
+r_pubsub = aioredis.from_url(REDIS_URL)
 
 RESULT_KEY = "result:{}"   # helper for namespacing
+RESULT_CHANNEL = "result:{}:chan"  # must match app.workers.RESULT_CHANNEL
+PROGRESS_CHANNEL = "result:{}:progress"  # must match app.workers.PROGRESS_CHANNEL
+STREAM_HEARTBEAT = 15      # seconds between "processing" events on /stream
+PROCESSING_EVENT = {"event": "status", "data": json.dumps({"status": "processing"})}
+
+
+def _run_pipeline():
+    """The Celery task, imported on first use (app.workers loads every agent)."""
+    from .workers import run_pipeline
+    return run_pipeline
 
 
 # ──────────────────────────  endpoints  ─────────────────────────
@@ -45,32 +74,58 @@ async def ask_question(request: AskRequest):
     """Submit a scientific question for analysis and get back a task-id."""
     task_id = str(uuid.uuid4())
     # enqueue celery job
-    run_pipeline.delay(request.question, task_id)
+    _run_pipeline().delay(request.question, task_id)
     return AskResponse(task_id=task_id)
 
 
 @app.get("/result/{task_id}", response_model=TaskResult)
 async def get_result(task_id: str):
     """Return the stored JSON for a finished task, or 404 until it exists."""
-    blob = r.get(RESULT_KEY.format(task_id))
+    blob = await r.get(RESULT_KEY.format(task_id))
     if not blob:
         raise HTTPException(status_code=404, detail="Task not found")
-    return json.loads(blob)
+    return decode_result(blob)
 
 
 @app.get("/stream/{task_id}")
 async def stream_progress(task_id: str):
-    """Server-sent-events stream that polls redis every second."""
+    """
+    Server-sent-events stream that waits for the worker's result announcement.
+
+    Subscribes to the task's pub/sub channels *before* checking the stored
+    result, so a result published in between is never missed.  While the
+    task runs, each pipeline step is forwarded as a "progress" event and a
+    "processing" heartbeat (with a re-check of the stored result) is sent
+    whenever `STREAM_HEARTBEAT` seconds pass without one.
+    """
+    key = RESULT_KEY.format(task_id)
+    progress_channel = PROGRESS_CHANNEL.format(task_id).encode()
+
     async def event_generator():
-        while True:
-            blob = r.get(RESULT_KEY.format(task_id))
-            if not blob:                        # not ready yet
-                yield {"event": "status", "data": json.dumps({"status": "processing"})}
-            else:                               # finished → send once & exit
-                data = json.loads(blob)
-                yield {"event": "status", "data": json.dumps(data)}
-                break
-            await asyncio.sleep(1)
+        pubsub = r_pubsub.pubsub()
+        await pubsub.subscribe(RESULT_CHANNEL.format(task_id), progress_channel)
+        try:
+            for _ in range(2):                  # subscribe confirmations
+                await pubsub.get_message(timeout=STREAM_HEARTBEAT)
+            blob = await r.get(key)
+            if not blob:
+                yield PROCESSING_EVENT
+            while not blob:                     # not ready yet
+                msg = await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=STREAM_HEARTBEAT
+                )
+                if msg is None:
+                    blob = await r.get(key)
+                    if not blob:
+                        yield PROCESSING_EVENT
+                elif msg["channel"] == progress_channel:
+                    yield {"event": "progress", "data": msg["data"].decode()}
+                else:
+                    blob = msg["data"]
+            # finished → send once & exit
+            yield {"event": "status", "data": result_json(blob)}
+        finally:
+            await pubsub.reset()
 
     return EventSourceResponse(event_generator())
 
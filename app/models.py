@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import List, Optional, Dict, Any
 from enum import Enum
 
@@ -9,29 +9,41 @@ class QuestionType(str, Enum):
     COMPARATIVE = "comparative"
 
 class SophiaOutput(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     question_type: QuestionType
     keywords: List[str]
 
 class EvidenceItem(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     title: str
     doi: Optional[str] = None
     summary: str
     url: str
     authors: List[str] = []
     source: str  # "arxiv" or "pubmed"
+    retrieval_score: float = 1.0  # reciprocal-rank weight from the search backend
+    published_ts: Optional[float] = None  # publication time (POSIX seconds), if known
 
 class CriticFeedback(BaseModel):
     """Feedback from Critic agent for evidence quality assessment."""
+    model_config = ConfigDict(frozen=True)
+
     should_rerun: bool = False
     rerun_reason: Optional[str] = None
     quality_score: float = 1.0
     suggestions: List[str] = []
 
 class NovaOutput(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     evidence: List[EvidenceItem]
     critic_feedback: Optional[CriticFeedback] = None
 
 class RoadmapItem(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     priority: int
     research_area: str
     next_milestone: str
@@ -39,16 +51,22 @@ class RoadmapItem(BaseModel):
     success_probability: float
 
 class Citation(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     doi: str
     title: str
     idx: int
 
 class CriticOutput(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     passes: bool
     missing_points: List[str]
     support_level: str = "weak"
 
 class LyraOutput(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     answer: str
     gaps: List[str]
     roadmap: List[RoadmapItem]
@@ -56,6 +74,8 @@ class LyraOutput(BaseModel):
     critic_feedback: Optional[CriticOutput] = None
 
 class NumericalFinding(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     percentages: List[str] = []
     p_values: List[str] = []
     confidence_intervals: List[str] = []
@@ -47,12 +47,8 @@ def aggregate_pipeline_output(task_result: TaskResult) -> Dict[str, Any]:
         next_experiment = lyra.roadmap[0].next_milestone
     
     # Citations with title and doi
-    citations = []
-    for citation in lyra.citations:
-        citations.append({
-            "title": citation.title,
-            "doi": citation.doi
-        })
+    citations = [{"title": c.title, "doi": c.doi} for c in lyra.citations]
+    evidence = task_result.nova_output.evidence if task_result.nova_output else ()
     
     return {
         "claim": claim,
@@ -66,7 +62,7 @@ def aggregate_pipeline_output(task_result: TaskResult) -> Dict[str, Any]:
         "nova_output": {
             "evidence": [
                 {"doi": item.doi, "title": item.title, "source": item.source}
-                for item in (task_result.nova_output.evidence if task_result.nova_output else [])
+                for item in evidence
             ]
         }
     } 
\ No newline at end of file
@@ -9,29 +9,51 @@ to Redis so the API container can fetch it.
 from __future__ import annotations
 
 import os
-import json
 import asyncio
+import socket
+import threading
 from datetime import timedelta
-from typing import Any, Callable
+from typing import Any, Awaitable, Callable
 
 import redis
 from celery import Celery
-from tenacity import (
-    retry, stop_after_attempt, wait_exponential, retry_if_exception_type
-)
-
-from .models import TaskResult, TaskStatus
+from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown
+from .models import NovaOutput, TaskResult, TaskStatus
 from agents.sophia import Sophia
 from agents.nova import Nova
 from agents.lyra import Lyra
-from agents.critic import Critic
 from agents.dataminer import DataMiner
 from utils.exceptions import InsufficientEvidenceError
+from utils.result_codec import encode_result
+from utils.openai_client import aclose_async_client, close_clients
+
+# Import uvloop at module level for test patching
+try:
+    import uvloop
+except ImportError:
+    uvloop = None  # For environments without uvloop (Windows, PyPy)
 
 # ─────────────────────────── Redis client ────────────────────────────
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-redis_client: redis.Redis = redis.from_url(REDIS_URL, decode_responses=True)
+# Probe idle pooled connections so ones silently dropped by NAT/LB are
+# replaced before a write instead of failing it (Linux option names)
+_KEEPALIVE_OPTIONS = {
+    getattr(socket, name): value
+    for name, value in (("TCP_KEEPIDLE", 60), ("TCP_KEEPINTVL", 10), ("TCP_KEEPCNT", 3))
+    if hasattr(socket, name)
+}
+redis_client: redis.Redis = redis.Redis(
+    connection_pool=redis.BlockingConnectionPool.from_url(
+        REDIS_URL,
+        max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", "64")),
+        socket_keepalive=True,
+        socket_keepalive_options=_KEEPALIVE_OPTIONS,
+        health_check_interval=30,
+    )
+)
 RESULT_KEY = "result:{}"          # namespaced key
+RESULT_CHANNEL = "result:{}:chan"  # pub/sub channel announcing a stored result
+PROGRESS_CHANNEL = "result:{}:progress"  # pub/sub channel carrying step names
 RESULT_TTL = timedelta(days=1).total_seconds()
 
 # ─────────────────────────── Celery config ───────────────────────────
@@ -44,30 +66,118 @@ celery_app = Celery(
 # optional: mute the CPendingDeprecationWarning in Celery 6
 celery_app.conf.broker_connection_retry_on_startup = True
 
-# ───────────────────────── helper: timeout+retry ─────────────────────
-@retry(
-    stop=stop_after_attempt(3),
-    wait=wait_exponential(multiplier=1, min=4, max=10),
-    retry=retry_if_exception_type(Exception),
-)
-def run_with_timeout(
-    func: Callable[..., Any],
+# The pipeline is I/O-bound and every task runs its own event loop, so the
+# default pool is threads: CELERY_CONCURRENCY tasks share one process (and
+# its agents, caches and connection pools) instead of one task per child.
+celery_app.conf.worker_pool = os.getenv("CELERY_POOL", "threads")
+celery_app.conf.worker_concurrency = int(os.getenv("CELERY_CONCURRENCY", "16"))
+
+# uvloop for the pipeline's event loop; set at import so forked pool
+# processes inherit it
+if uvloop is not None:
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+# ─────────────────────────── agent instances ─────────────────────────
+_agents: dict[str, Any] = {}
+_agents_lock = threading.Lock()
+
+
+@worker_process_init.connect
+def init_agents(**_) -> dict[str, Any]:
+    """Build the agents once per worker process; every task reuses them.
+
+    Runs on pool-process start-up and lazily on first use for pools that
+    never send ``worker_process_init`` (solo, threads).
+    """
+    with _agents_lock:
+        if not _agents:
+            _agents.update(sophia=Sophia(), nova=Nova(), dataminer=DataMiner(), lyra=Lyra())
+    return _agents
+
+
+# ─────────────────────────── event loops ─────────────────────────────
+_thread_state = threading.local()
+# Every pool thread's loop, so shutdown can close them all from one thread
+_loops: list[asyncio.AbstractEventLoop] = []
+_loops_lock = threading.Lock()
+
+
+def _thread_loop() -> asyncio.AbstractEventLoop:
+    """This pool thread's event loop, kept across tasks.
+
+    The async OpenAI clients (and their keep-alive connections) are cached
+    per loop, so reusing the loop keeps them warm from one task to the next.
+    """
+    loop = getattr(_thread_state, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = _thread_state.loop = asyncio.new_event_loop()
+        with _loops_lock:
+            _loops[:] = [l for l in _loops if not l.is_closed()]
+            _loops.append(loop)
+    return loop
+
+
+# Prefork children send worker_process_shutdown; solo / threads pools only
+# send worker_shutdown.  The shutdown handlers are safe to run twice.
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _close_thread_loops(**_) -> None:
+    """Close every registered loop together with its async OpenAI client."""
+    with _loops_lock:
+        loops = list(_loops)
+        _loops.clear()
+    for loop in loops:
+        if loop.is_closed():
+            continue
+        try:
+            loop.run_until_complete(aclose_async_client())
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            loop.close()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _disconnect_redis(**_) -> None:
+    redis_client.connection_pool.disconnect()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _close_openai_pool(**_) -> None:
+    close_clients()
+
+
+# ───────────────────────── helper: persistence ───────────────────────
+def persist_result(task_id: str, result: TaskResult) -> None:
+    """Store the task result and wake any `/stream` subscribers (one round trip)."""
+    blob = encode_result(result)
+    with redis_client.pipeline(transaction=False) as pipe:
+        pipe.setex(RESULT_KEY.format(task_id), int(RESULT_TTL), blob)
+        pipe.publish(RESULT_CHANNEL.format(task_id), blob)
+        pipe.execute()
+
+
+def publish_step(task_id: str, step: str) -> None:
+    """Announce the pipeline step a task has reached to `/stream` subscribers."""
+    redis_client.publish(PROGRESS_CHANNEL.format(task_id), step)
+
+
+# ───────────────────────── helper: timeout ───────────────────────────
+async def run_with_timeout(
+    func: Callable[..., Awaitable[Any]],
     *args,
     timeout: int = 30,
     **kwargs,
 ):
-    """Run a sync **or** async function with timeout + retry."""
+    """
+    Await an async agent call with an overall step timeout.
+
+    Transient API failures are retried inside the OpenAI clients (see
+    utils.openai_client), so a step that still fails here is not re-run.
+    """
     try:
-        if asyncio.iscoroutinefunction(func):
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                coro = func(*args, **kwargs)
-                return loop.run_until_complete(asyncio.wait_for(coro, timeout))
-            finally:
-                loop.close()
-        else:
-            return func(*args, **kwargs)
+        return await asyncio.wait_for(func(*args, **kwargs), timeout)
     except Exception as exc:
         print(f"[run_with_timeout] {func.__name__} failed → {exc}")
         raise
@@ -79,108 +189,98 @@ def run_pipeline(self, question: str, task_id: str):
     """
     Execute the full pipeline and persist the JSON result in Redis.
 
-    Returns a light dict so Celery's result backend is small; the full
-    payload is stored under result:{task_id}.
+    The agent chain runs on the pool thread's event loop.  Returns
+    a light dict so Celery's result backend is small; the full payload is
+    stored under result:{task_id}.
     """
 
-    # Local copy for incremental status tracking / debugging
-    task_results: dict[str, TaskResult] = {
-        task_id: TaskResult(
-            task_id=task_id, status=TaskStatus.PROCESSING, question=question
-        )
-    }
+    # Filled in step by step; Redis (below) is the only store
+    result = TaskResult.model_construct(
+        task_id=task_id, status=TaskStatus.PROCESSING, question=question
+    )
 
     try:
-        # 1️⃣ Sophia
-        self.update_state(state="PROGRESS", meta={"step": "sophia"})
-        sophia_out = run_with_timeout(Sophia().run, question, timeout=30)
-        task_results[task_id].sophia_output = sophia_out
-
-        # 2️⃣ Nova
-        self.update_state(state="PROGRESS", meta={"step": "nova"})
-        nova_out = run_with_timeout(Nova().run, question, sophia_out, timeout=30)
-        task_results[task_id].nova_output = nova_out
-
-        # Guarantee schema even during stub / fallback runs
-        if not task_results[task_id].nova_output:
-            task_results[task_id].nova_output = {"evidence": []}
-
-        # 2.5️⃣ DataMiner - Extract numerical findings
-        self.update_state(state="PROGRESS", meta={"step": "dataminer"})
-        dataminer = DataMiner()
-        numerical_findings = []
-        for evidence_item in nova_out.evidence:
-            finding = run_with_timeout(dataminer.run, evidence_item, timeout=15)
-            numerical_findings.append(finding)
-        task_results[task_id].numerical_findings = numerical_findings
-
-        # 3️⃣ Lyra
-        self.update_state(state="PROGRESS", meta={"step": "lyra"})
-        lyra_inst = Lyra()
-        lyra_out = run_with_timeout(
-            lyra_inst.run, question, nova_out, numerical_findings, timeout=60
-        )
-        task_results[task_id].lyra_output = lyra_out
-
-        # 4️⃣ Critic
-        self.update_state(state="PROGRESS", meta={"step": "critic"})
-        critic_out = run_with_timeout(
-            Critic().run, question, lyra_out, timeout=30
-        )
-        task_results[task_id].critic_output = critic_out
-
-        # Enforce: if critic_output.passes is False, fail the pipeline
-        if critic_out and not critic_out.passes:
-            task_results[task_id].status = TaskStatus.FAILED
-            task_results[task_id].error = f"Critic did not pass: {critic_out.missing_points}"
-            # Persist and return early
-            final_json = task_results[task_id].dict()
-            redis_client.setex(
-                RESULT_KEY.format(task_id), int(RESULT_TTL), json.dumps(final_json)
-            )
-            return {
-                "status": final_json["status"],
-                "task_id": task_id,
-            }
-
-        # 5️⃣ Optional Lyra rerun if Critic fails
-        if not critic_out.passes:
-            self.update_state(state="PROGRESS", meta={"step": "lyra_rerun"})
-            lyra_out = run_with_timeout(
-                lyra_inst.run,
-                question,
-                nova_out,
-                critique=critic_out.dict(),
-                timeout=60,
-            )
-            task_results[task_id].lyra_output = lyra_out
-            # 6️⃣ Second Critic run after Lyra rerun
-            self.update_state(state="PROGRESS", meta={"step": "critic_rerun"})
-            critic_out = run_with_timeout(
-                Critic().run, question, lyra_out, timeout=30
-            )
-            task_results[task_id].critic_output = critic_out
-
-        # ✅ Completed
-        task_results[task_id].status = TaskStatus.COMPLETED
-
+        _thread_loop().run_until_complete(_run_agents(question, result))
     except InsufficientEvidenceError as e:
-        task_results[task_id].status = TaskStatus.FAILED
-        task_results[task_id].error = str(e)
+        result.status = TaskStatus.FAILED
+        result.error = str(e)
         print(f"[run_pipeline] task {task_id} failed due to insufficient evidence → {e}")
     except Exception as exc:
-        task_results[task_id].status = TaskStatus.FAILED
-        task_results[task_id].error = str(exc)
+        result.status = TaskStatus.FAILED
+        result.error = str(exc)
         print(f"[run_pipeline] task {task_id} failed → {exc}")
 
     # ─── persist to Redis ────────────────────────────────────────────
-    final_json = task_results[task_id].dict()
-    redis_client.setex(
-        RESULT_KEY.format(task_id), int(RESULT_TTL), json.dumps(final_json)
-    )
+    persist_result(task_id, result)
 
     # Return a lightweight status for Celery result backend
     return {
-        "status": final_json["status"],
+        "status": result.status.value,
         "task_id": task_id,
     }
+
+
+async def _run_agents(question: str, result: TaskResult) -> None:
+    """Sophia → Nova → DataMiner → Lyra → Critic, filling `result` in place."""
+    agents = init_agents()
+    lyra_inst = agents["lyra"]
+
+    # 1️⃣ Sophia
+    publish_step(result.task_id, "sophia")
+    sophia_out = await run_with_timeout(agents["sophia"].run_async, question, timeout=30)
+    result.sophia_output = sophia_out
+
+    # 2️⃣ Nova
+    publish_step(result.task_id, "nova")
+    nova_out = await run_with_timeout(agents["nova"].run_async, question, sophia_out, timeout=30)
+    result.nova_output = nova_out
+
+    # Guarantee schema even during stub / fallback runs
+    if not result.nova_output:
+        result.nova_output = NovaOutput(evidence=[])
+
+    # 2.5️⃣ DataMiner - Extract numerical findings (batched, concurrent LLM calls)
+    publish_step(result.task_id, "dataminer")
+    numerical_findings = await run_with_timeout(
+        agents["dataminer"].aextract_from_batch, nova_out.evidence, timeout=30
+    )
+    result.numerical_findings = numerical_findings
+
+    # 3️⃣ Lyra + 4️⃣ Critic review of the draft
+    publish_step(result.task_id, "lyra")
+    lyra_out = await run_with_timeout(
+        lyra_inst.arun_raw, question, nova_out, numerical_findings, timeout=60
+    )
+    publish_step(result.task_id, "critic")
+    critic_out = await run_with_timeout(
+        lyra_inst.critic.arun, question, lyra_out, timeout=30
+    )
+    result.lyra_output = lyra_out.model_copy(update={"critic_feedback": critic_out})
+    result.critic_output = critic_out
+
+    # Enforce: if critic_output.passes is False, fail the pipeline
+    if critic_out and not critic_out.passes:
+        result.status = TaskStatus.FAILED
+        result.error = f"Critic did not pass: {critic_out.missing_points}"
+        return
+
+    # 5️⃣ Optional Lyra rerun if Critic fails
+    if not critic_out.passes:
+        publish_step(result.task_id, "lyra_rerun")
+        lyra_out = await run_with_timeout(
+            lyra_inst.arun_raw,
+            question,
+            nova_out,
+            critique={"missing_points": critic_out.missing_points},
+            timeout=60,
+        )
+        # 6️⃣ Second Critic run after Lyra rerun
+        publish_step(result.task_id, "critic_rerun")
+        critic_out = await run_with_timeout(
+            lyra_inst.critic.arun, question, lyra_out, timeout=30
+        )
+        result.lyra_output = lyra_out.model_copy(update={"critic_feedback": critic_out})
+        result.critic_output = critic_out
+
+    # ✅ Completed
+    result.status = TaskStatus.COMPLETED
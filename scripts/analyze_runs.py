@@ -26,8 +26,15 @@ Input format (runs.json):
 
 import json
 import sys
+from collections import Counter
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator
+
+# Import ijson at module level for test patching
+try:
+    import ijson
+except ImportError:
+    ijson = None  # For environments without ijson (falls back to json.load)
 
 def load_results(filepath: str = "runs.json") -> List[Dict[str, Any]]:
     """Load results from JSON file."""
@@ -42,82 +49,91 @@ def load_results(filepath: str = "runs.json") -> List[Dict[str, Any]]:
         print(f"Error: Invalid JSON in {filepath}: {e}")
         return []
 
-def analyze_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Analyze results and return summary statistics."""
-    if not results:
-        return {}
-    
-    total = len(results)
-    completed = sum(1 for r in results if r.get("status") == "completed")
-    failed = sum(1 for r in results if r.get("status") == "failed")
-    
-    # Analyze critic results
-    critic_passes = 0
-    critic_fails = 0
-    
+def iter_results(filepath: str = "runs.json") -> Iterator[Dict[str, Any]]:
+    """Yield results one at a time, streamed from disk when ijson is installed."""
+    if ijson is None:
+        yield from load_results(filepath)
+        return
+    try:
+        with open(filepath, 'rb') as f:
+            yield from ijson.items(f, 'item')
+    except FileNotFoundError:
+        print(f"Error: {filepath} not found")
+    except ijson.JSONError as e:
+        print(f"Error: Invalid JSON in {filepath}: {e}")
+
+def analyze_results(results: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Analyze results (any iterable, consumed once) and return summary statistics."""
+    # One pass: status counts, plus critic verdicts and question types of completed runs
+    statuses = Counter()
+    critic = Counter()
+    question_types = Counter()
     for result in results:
-        if result.get("status") == "completed" and result.get("critic_output"):
-            critic_output = result["critic_output"]
-            if isinstance(critic_output, dict) and critic_output.get("passes"):
-                critic_passes += 1
-            else:
-                critic_fails += 1
+        status = result.get("status")
+        statuses[status] += 1
+        if status != "completed":
+            continue
+        
+        critic_output = result.get("critic_output")
+        if critic_output:
+            passed = isinstance(critic_output, dict) and critic_output.get("passes")
+            critic["passes" if passed else "fails"] += 1
+        
+        sophia_output = result.get("sophia_output")
+        if isinstance(sophia_output, dict) and sophia_output.get("question_type"):
+            question_types[sophia_output["question_type"]] += 1
     
-    # Analyze question types
-    question_types = {}
-    for result in results:
-        if result.get("status") == "completed" and result.get("sophia_output"):
-            sophia_output = result["sophia_output"]
-            if isinstance(sophia_output, dict) and sophia_output.get("question_type"):
-                q_type = sophia_output["question_type"]
-                question_types[q_type] = question_types.get(q_type, 0) + 1
+    total = sum(statuses.values())
+    if not total:
+        return {}
     
     return {
         "total": total,
-        "completed": completed,
-        "failed": failed,
-        "critic_passes": critic_passes,
-        "critic_fails": critic_fails,
-        "question_types": question_types
+        "completed": statuses["completed"],
+        "failed": statuses["failed"],
+        "critic_passes": critic["passes"],
+        "critic_fails": critic["fails"],
+        "question_types": dict(question_types)
     }
 
-def print_markdown_summary(results: List[Dict[str, Any]], stats: Dict[str, Any]):
-    """Print markdown summary of results."""
-    print("# Scientific AI Orchestrator - Batch Run Analysis")
-    print()
+def print_markdown_summary(results: Iterable[Dict[str, Any]], stats: Dict[str, Any]):
+    """Print markdown summary of results (buffered, written in one go)."""
+    lines = []
+    lines.append("# Scientific AI Orchestrator - Batch Run Analysis")
+    lines.append("")
     
     # Overall statistics
-    print("## Overall Statistics")
-    print()
-    print(f"- **Total Questions**: {stats.get('total', 0)}")
-    print(f"- **Completed**: {stats.get('completed', 0)}")
-    print(f"- **Failed**: {stats.get('failed', 0)}")
-    print(f"- **Success Rate**: {stats.get('completed', 0) / max(stats.get('total', 1), 1) * 100:.1f}%")
-    print()
+    lines.append("## Overall Statistics")
+    lines.append("")
+    lines.append(f"- **Total Questions**: {stats.get('total', 0)}")
+    lines.append(f"- **Completed**: {stats.get('completed', 0)}")
+    lines.append(f"- **Failed**: {stats.get('failed', 0)}")
+    lines.append(f"- **Success Rate**: {stats.get('completed', 0) / max(stats.get('total', 1), 1) * 100:.1f}%")
+    lines.append("")
     
     # Critic results
-    print("## Critic Verification Results")
-    print()
-    print(f"- **Passed**: {stats.get('critic_passes', 0)}")
-    print(f"- **Failed**: {stats.get('critic_fails', 0)}")
+    lines.append("## Critic Verification Results")
+    lines.append("")
+    lines.append(f"- **Passed**: {stats.get('critic_passes', 0)}")
+    lines.append(f"- **Failed**: {stats.get('critic_fails', 0)}")
     if stats.get('critic_passes', 0) + stats.get('critic_fails', 0) > 0:
         critic_rate = stats.get('critic_passes', 0) / (stats.get('critic_passes', 0) + stats.get('critic_fails', 0)) * 100
-        print(f"- **Pass Rate**: {critic_rate:.1f}%")
-    print()
+        lines.append(f"- **Pass Rate**: {critic_rate:.1f}%")
+    lines.append("")
     
     # Question type distribution
     if stats.get('question_types'):
-        print("## Question Type Distribution")
-        print()
+        lines.append("## Question Type Distribution")
+        lines.append("")
         for q_type, count in stats['question_types'].items():
-            print(f"- **{q_type}**: {count}")
-        print()
+            lines.append(f"- **{q_type}**: {count}")
+        lines.append("")
     
     # Detailed results
-    print("## Detailed Results")
-    print()
-    print("| ID | Question | Status | Critic | Error |")
-    print("|----|----------|--------|--------|-------|")
+    lines.append("## Detailed Results")
+    lines.append("")
+    lines.append("| ID | Question | Status | Critic | Error |")
+    lines.append("|----|----------|--------|--------|-------|")
     
     for result in results:
         question_id = result.get('id', 'N/A')
@@ -134,26 +150,25 @@ def print_markdown_summary(results: List[Dict[str, Any]], stats: Dict[str, Any])
         error = result.get('error', '') or ''
         error_display = error[:30] + "..." if len(error) > 30 else error
         
-        print(f"| {question_id} | {question} | {status} | {critic_status} | {error_display} |")
+        lines.append(f"| {question_id} | {question} | {status} | {critic_status} | {error_display} |")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
 
 def main():
     """Main function to analyze batch run results."""
     print("Scientific AI Orchestrator - Results Analysis")
     print("=" * 50)
     
-    # Load results
-    results = load_results()
-    if not results:
+    # Analyze results (first streaming pass)
+    stats = analyze_results(iter_results())
+    if not stats:
         print("No results found. Please run the batch script first.")
         return
     
-    print(f"Loaded {len(results)} results")
-    
-    # Analyze results
-    stats = analyze_results(results)
+    print(f"Loaded {stats['total']} results")
     
-    # Print summary
-    print_markdown_summary(results, stats)
+    # Print summary (second pass for the detail table)
+    print_markdown_summary(iter_results(), stats)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -19,84 +19,107 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from utils.monitoring import PerformanceMonitor
 from utils.statistical_analysis import StatisticalAnalyzer
 
-def generate_performance_report(hours: int = 24, output_file: str = None) -> str:
-    """Generate a comprehensive performance report."""
-    monitor = PerformanceMonitor()
-    summary = monitor.get_performance_summary(hours)
-    
-    if "message" in summary:
-        return f"# Performance Report\n\n{summary['message']}"
-    
-    report = f"""
+# Static report sections; str.format fills them in on every call
+_HEADER_TEMPLATE = """
 # Scientific AI Orchestrator - Performance Report
 
-**Generated**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}  
+**Generated**: {generated}  
 **Time Period**: Last {hours} hours
 
 ## Executive Summary
 
-- **Total Pipelines**: {summary['total_pipelines']}
-- **Success Rate**: {summary['success_rate']:.1f}%
-- **Total Cost**: ${summary['total_cost']:.4f}
-- **Average Cost per Pipeline**: ${summary['average_cost_per_pipeline']:.4f}
-- **Total Duration**: {summary['total_duration']:.1f} seconds
-- **Average Duration per Pipeline**: {summary['average_duration_per_pipeline']:.1f} seconds
+- **Total Pipelines**: {total_pipelines}
+- **Success Rate**: {success_rate:.1f}%
+- **Total Cost**: ${total_cost:.4f}
+- **Average Cost per Pipeline**: ${average_cost_per_pipeline:.4f}
+- **Total Duration**: {total_duration:.1f} seconds
+- **Average Duration per Pipeline**: {average_duration_per_pipeline:.1f} seconds
 
 ## Agent Performance
 
 """
-    
-    for agent_name, stats in summary.get('agent_statistics', {}).items():
-        success_rate = (stats['successful_runs'] / stats['total_runs'] * 100) if stats['total_runs'] > 0 else 0
-        avg_duration = stats['total_duration'] / stats['total_runs'] if stats['total_runs'] > 0 else 0
-        avg_cost = stats['total_cost'] / stats['total_runs'] if stats['total_runs'] > 0 else 0
-        
-        report += f"""
-### {agent_name.title()}
-- **Total Runs**: {stats['total_runs']}
+
+_AGENT_TEMPLATE = """
+### {name}
+- **Total Runs**: {total_runs}
 - **Success Rate**: {success_rate:.1f}%
 - **Average Duration**: {avg_duration:.2f}s
 - **Average Cost**: ${avg_cost:.4f}
-- **Total Cost**: ${stats['total_cost']:.4f}
+- **Total Cost**: ${total_cost:.4f}
 
 """
-    
-    report += """
+
+_RECOMMENDATIONS_HEADER = """
 ## Recommendations
 
 """
+
+_HEALTH_HEADER = """
+## System Health
+
+"""
+
+
+def generate_performance_report(hours: int = 24, output_file: str = None) -> str:
+    """Generate a comprehensive performance report."""
+    monitor = PerformanceMonitor()
+    summary = monitor.get_performance_summary(hours)
+    
+    if "message" in summary:
+        return f"# Performance Report\n\n{summary['message']}"
+    
+    parts = [_HEADER_TEMPLATE.format(
+        generated=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        hours=hours,
+        total_pipelines=summary['total_pipelines'],
+        success_rate=summary['success_rate'],
+        total_cost=summary['total_cost'],
+        average_cost_per_pipeline=summary['average_cost_per_pipeline'],
+        total_duration=summary['total_duration'],
+        average_duration_per_pipeline=summary['average_duration_per_pipeline'],
+    )]
+    
+    for agent_name, stats in summary.get('agent_statistics', {}).items():
+        runs = stats['total_runs']
+        parts.append(_AGENT_TEMPLATE.format(
+            name=agent_name.title(),
+            total_runs=runs,
+            success_rate=(stats['successful_runs'] / runs * 100) if runs > 0 else 0,
+            avg_duration=stats['total_duration'] / runs if runs > 0 else 0,
+            avg_cost=stats['total_cost'] / runs if runs > 0 else 0,
+            total_cost=stats['total_cost'],
+        ))
+    
+    parts.append(_RECOMMENDATIONS_HEADER)
     
     if summary['success_rate'] < 90:
-        report += "- **Low Success Rate**: Consider reviewing error logs and improving error handling\n"
+        parts.append("- **Low Success Rate**: Consider reviewing error logs and improving error handling\n")
     
     if summary['average_cost_per_pipeline'] > 0.1:
-        report += "- **High Cost**: Consider using cheaper models for initial processing\n"
+        parts.append("- **High Cost**: Consider using cheaper models for initial processing\n")
     
     if summary['average_duration_per_pipeline'] > 60:
-        report += "- **Slow Performance**: Consider optimizing pipeline or using faster models\n"
+        parts.append("- **Slow Performance**: Consider optimizing pipeline or using faster models\n")
     
-    report += """
-## System Health
-
-"""
+    parts.append(_HEALTH_HEADER)
     
     if summary['success_rate'] >= 95:
-        report += "- ✅ **Excellent**: System performing well\n"
+        parts.append("- ✅ **Excellent**: System performing well\n")
     elif summary['success_rate'] >= 85:
-        report += "- ⚠️ **Good**: Minor issues detected\n"
+        parts.append("- ⚠️ **Good**: Minor issues detected\n")
     elif summary['success_rate'] >= 70:
-        report += "- ⚠️ **Fair**: Some issues need attention\n"
+        parts.append("- ⚠️ **Fair**: Some issues need attention\n")
     else:
-        report += "- ❌ **Poor**: Significant issues detected\n"
+        parts.append("- ❌ **Poor**: Significant issues detected\n")
     
     if summary['average_duration_per_pipeline'] < 30:
-        report += "- ✅ **Fast**: Response times are excellent\n"
+        parts.append("- ✅ **Fast**: Response times are excellent\n")
     elif summary['average_duration_per_pipeline'] < 60:
-        report += "- ⚠️ **Acceptable**: Response times are reasonable\n"
+        parts.append("- ⚠️ **Acceptable**: Response times are reasonable\n")
     else:
-        report += "- ❌ **Slow**: Response times need improvement\n"
+        parts.append("- ❌ **Slow**: Response times need improvement\n")
     
-    report = report.strip()
+    report = "".join(parts).strip()
     
     if output_file:
         with open(output_file, 'w') as f:
@@ -9,6 +9,15 @@ saving results to runs.json.
 Usage:
     python scripts/run_batch.py
 
+Questions are streamed from questions.json (with ijson, when installed)
+and run concurrently on a thread pool of BATCH_WORKERS threads
+(default 8); the pipeline is I/O-bound, so wall-clock time scales with the
+slowest questions rather than the sum of all of them.  arXiv / PubMed
+requests stay spaced out by the retriever's shared throttles.
+
+Set LYRA_USE_BATCH_API=1 to send all Lyra calls through the OpenAI Batch
+API (half price, results within 24 h) instead of one request per question.
+
 Input format (questions.json):
 [
     {
@@ -43,10 +52,12 @@ Output format (runs.json):
 import json
 import os
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 
 # Add the parent directory to the path so we can import our modules
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -57,6 +68,32 @@ from agents.lyra import Lyra
 from agents.critic import Critic
 from app.models import TaskResult
 
+# Import orjson at module level for test patching
+try:
+    import orjson
+except ImportError:
+    orjson = None  # For environments without orjson
+
+# Import ijson at module level for test patching
+try:
+    import ijson
+except ImportError:
+    ijson = None  # For environments without ijson (falls back to load_questions)
+
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", "8"))
+
+# One instance per agent, shared by every question and worker thread
+_agents: Dict[str, Any] = {}
+_agents_lock = threading.Lock()
+
+
+def get_agents() -> Dict[str, Any]:
+    """Build the agents on first use and return the shared instances."""
+    with _agents_lock:
+        if not _agents:
+            _agents.update(sophia=Sophia(), nova=Nova(), lyra=Lyra(), critic=Critic())
+    return _agents
+
 
 def load_questions(filepath: str = "questions.json") -> List[Dict[str, Any]]:
     """
@@ -74,15 +111,16 @@ def load_questions(filepath: str = "questions.json") -> List[Dict[str, Any]]:
         True
     """
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            questions = json.load(f)
+        if orjson is not None:
+            with open(filepath, 'rb') as f:
+                questions = orjson.loads(f.read())
+        else:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                questions = json.load(f)
         
         # Validate format
         for q in questions:
-            if not isinstance(q, dict):
-                raise ValueError("Each question must be a dictionary")
-            if "id" not in q or "question" not in q:
-                raise ValueError("Each question must have 'id' and 'question' fields")
+            _validate_question(q)
         
         return questions
     except FileNotFoundError:
@@ -93,6 +131,40 @@ def load_questions(filepath: str = "questions.json") -> List[Dict[str, Any]]:
         return []
 
 
+def iter_questions(filepath: str = "questions.json") -> Iterator[Dict[str, Any]]:
+    """
+    Yield questions one at a time, streamed from disk when ijson is installed.
+    
+    Each question is validated as it is parsed, so the pipeline can start on
+    the first questions while the rest of a large file is still being read.
+    
+    Args:
+        filepath: Path to questions.json file
+        
+    Yields:
+        Question dictionaries
+    """
+    if ijson is None:
+        yield from load_questions(filepath)
+        return
+    try:
+        with open(filepath, 'rb') as f:
+            for q in ijson.items(f, 'item'):
+                _validate_question(q)
+                yield q
+    except FileNotFoundError:
+        print(f"Error: {filepath} not found")
+    except ijson.JSONError as e:
+        print(f"Error: Invalid JSON in {filepath}: {e}")
+
+
+def _validate_question(q: Any) -> None:
+    if not isinstance(q, dict):
+        raise ValueError("Each question must be a dictionary")
+    if "id" not in q or "question" not in q:
+        raise ValueError("Each question must have 'id' and 'question' fields")
+
+
 def save_results(results: List[Dict[str, Any]], filepath: str = "runs.json"):
     """
     Save results to JSON file.
@@ -106,8 +178,15 @@ def save_results(results: List[Dict[str, Any]], filepath: str = "runs.json"):
         >>> save_results(results, "runs.json")
     """
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False, default=str)
+        if orjson is not None:
+            # UTF-8 output, same as ensure_ascii=False
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(
+                    results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str
+                ))
+        else:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2, ensure_ascii=False, default=str)
         print(f"Results saved to {filepath}")
     except Exception as e:
         print(f"Error saving results: {e}")
@@ -153,44 +232,45 @@ def run_single_question(question_data: Dict[str, Any]) -> Dict[str, Any]:
     
     try:
         # Step 1: Sophia
-        print("  Running Sophia...")
-        sophia = Sophia()
+        print(f"  [{question_id}] Running Sophia...")
+        agents = get_agents()
+        sophia = agents["sophia"]
         sophia_output = sophia.run(question_text)
         result["sophia_output"] = sophia_output.__dict__
-        print(f"  ✓ Sophia: {sophia_output.question_type} - {sophia_output.keywords}")
+        print(f"  [{question_id}] ✓ Sophia: {sophia_output.question_type} - {sophia_output.keywords}")
         
         # Step 2: Nova
-        print("  Running Nova...")
-        nova = Nova()
+        print(f"  [{question_id}] Running Nova...")
+        nova = agents["nova"]
         nova_output = nova.run(question_text, sophia_output)
         result["nova_output"] = nova_output.__dict__
-        print(f"  ✓ Nova: Found {len(nova_output.evidence)} evidence items")
+        print(f"  [{question_id}] ✓ Nova: Found {len(nova_output.evidence)} evidence items")
         
         # Step 3: Lyra
-        print("  Running Lyra...")
-        lyra = Lyra()
+        print(f"  [{question_id}] Running Lyra...")
+        lyra = agents["lyra"]
         lyra_output = lyra.run(question_text, nova_output)
         result["lyra_output"] = lyra_output.__dict__
-        print(f"  ✓ Lyra: Hypothesis probability {lyra_output.hypothesis_probability:.2f}")
+        print(f"  [{question_id}] ✓ Lyra: Hypothesis probability {lyra_output.hypothesis_probability:.2f}")
         
         # Step 4: Critic
-        print("  Running Critic...")
-        critic = Critic()
+        print(f"  [{question_id}] Running Critic...")
+        critic = agents["critic"]
         critic_output = critic.run(question_text, lyra_output)
         result["critic_output"] = critic_output.__dict__
-        print(f"  ✓ Critic: {'PASS' if critic_output.passes else 'FAIL'}")
+        print(f"  [{question_id}] ✓ Critic: {'PASS' if critic_output.passes else 'FAIL'}")
         
         # Step 5: Optional rerun if critic fails
         if not critic_output.passes:
-            print("  Critic failed, running Lyra rerun...")
+            print(f"  [{question_id}] Critic failed, running Lyra rerun...")
             lyra_output = lyra.run(question_text, nova_output, 
                                  critique={"missing_points": critic_output.missing_points})
             result["lyra_output"] = lyra_output.__dict__
             
-            print("  Running Critic again...")
+            print(f"  [{question_id}] Running Critic again...")
             critic_output = critic.run(question_text, lyra_output)
             result["critic_output"] = critic_output.__dict__
-            print(f"  ✓ Critic (rerun): {'PASS' if critic_output.passes else 'FAIL'}")
+            print(f"  [{question_id}] ✓ Critic (rerun): {'PASS' if critic_output.passes else 'FAIL'}")
         
         result["status"] = "completed"
         print(f"  ✓ Question {question_id} completed successfully")
@@ -203,33 +283,143 @@ def run_single_question(question_data: Dict[str, Any]) -> Dict[str, Any]:
     return result
 
 
+def run_with_batch_api(questions: List[Dict[str, Any]], poll_interval: float = 60.0) -> List[Dict[str, Any]]:
+    """
+    Run the pipeline with every Lyra call submitted as one OpenAI batch.
+
+    Sophia and Nova run per question as usual; the Lyra jobs are queued with
+    `Lyra.submit_batch`, polled until the batch completes, and each answer
+    is then checked by the Critic.
+    
+    Args:
+        questions: Question dictionaries with id and question
+        poll_interval: Seconds between batch status checks
+        
+    Returns:
+        Result dictionaries in the same format as run_single_question
+    """
+    agents = get_agents()
+    results = []
+    jobs = []
+    for question_data in questions:
+        question_text = question_data["question"]
+        result = {
+            "id": question_data["id"],
+            "question": question_text,
+            "topic_filter": question_data.get("topic_filter"),
+            "status": "running",
+            "sophia_output": None,
+            "nova_output": None,
+            "lyra_output": None,
+            "critic_output": None,
+            "error": None,
+            "timestamp": datetime.utcnow().isoformat() + "Z"
+        }
+        try:
+            sophia_output = agents["sophia"].run(question_text)
+            result["sophia_output"] = sophia_output.__dict__
+            nova_output = agents["nova"].run(question_text, sophia_output)
+            result["nova_output"] = nova_output.__dict__
+            jobs.append((result, question_text, nova_output))
+        except Exception as e:
+            result["status"] = "failed"
+            result["error"] = str(e)
+        results.append(result)
+
+    if not jobs:
+        return results
+
+    lyra = agents["lyra"]
+    lyra_jobs = [(question_text, nova_output) for _, question_text, nova_output in jobs]
+    batch_id = lyra.submit_batch(lyra_jobs)
+    print(f"Submitted Lyra batch {batch_id} ({len(lyra_jobs)} questions), polling every {poll_interval:.0f}s...")
+
+    lyra_outputs = lyra.poll_batch(batch_id, lyra_jobs)
+    while lyra_outputs is None:
+        time.sleep(poll_interval)
+        lyra_outputs = lyra.poll_batch(batch_id, lyra_jobs)
+
+    critic = agents["critic"]
+    for (result, question_text, _), lyra_output in zip(jobs, lyra_outputs):
+        if isinstance(lyra_output, Exception):
+            result["status"] = "failed"
+            result["error"] = str(lyra_output)
+            continue
+        result["lyra_output"] = lyra_output.__dict__
+        try:
+            critic_output = critic.run(question_text, lyra_output)
+            result["critic_output"] = critic_output.__dict__
+            result["status"] = "completed"
+        except Exception as e:
+            result["status"] = "failed"
+            result["error"] = str(e)
+    return results
+
+
+def _result_line(result: Dict[str, Any]) -> bytes:
+    """Encode one result as a JSON Lines record."""
+    if orjson is not None:
+        return orjson.dumps(result, option=orjson.OPT_NON_STR_KEYS, default=str) + b"\n"
+    return (json.dumps(result, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+
+
+def run_concurrently(questions: Iterable[Dict[str, Any]], checkpoint: str = "runs_intermediate.jsonl") -> List[Dict[str, Any]]:
+    """
+    Run questions through the pipeline on a pool of BATCH_WORKERS threads.
+    
+    Questions are submitted as `questions` yields them, so a streamed input
+    starts processing before it has been fully read.  Each result is
+    appended to `checkpoint` (JSON Lines, completion order) as soon as it
+    finishes, so an interrupted batch keeps everything done so far.
+    
+    Args:
+        questions: Question dictionaries (any iterable, consumed once)
+        checkpoint: Path of the JSON Lines checkpoint file
+        
+    Returns:
+        Result dictionaries in input order
+    """
+    # Slots keep runs.json in question order whatever order runs finish in
+    slots: List[Optional[Dict[str, Any]]] = []
+    with open(checkpoint, 'wb', buffering=64 * 1024) as out, \
+         ThreadPoolExecutor(max_workers=max(1, BATCH_WORKERS)) as pool:
+        futures = {}
+        for question in questions:
+            futures[pool.submit(run_single_question, question)] = len(slots)
+            slots.append(None)
+        
+        total = len(slots)
+        print(f"Checkpointing results to {checkpoint}")
+        for i, future in enumerate(as_completed(futures), 1):
+            idx = futures[future]
+            slots[idx] = future.result()
+            print(f"\n[{i}/{total}] Finished question {slots[idx]['id']}")
+            
+            # Checkpoint: append just this record instead of rewriting them all
+            out.write(_result_line(slots[idx]))
+            out.flush()
+    return slots
+
+
 def main():
     """Main function to run batch processing."""
     print("Scientific AI Orchestrator - Batch Processing")
     print("=" * 50)
     
-    # Load questions
-    questions = load_questions()
-    if not questions:
-        print("No questions found. Please create a questions.json file.")
-        return
-    
-    print(f"Loaded {len(questions)} questions")
-    
-    # Process each question
-    results = []
     start_time = time.time()
     
-    for i, question in enumerate(questions, 1):
-        print(f"\n[{i}/{len(questions)}] Processing question {question['id']}...")
-        
-        result = run_single_question(question)
-        results.append(result)
-        
-        # Save intermediate results
-        if i % 5 == 0 or i == len(questions):
-            save_results(results, "runs_intermediate.json")
-            print(f"  Intermediate results saved ({i}/{len(questions)} completed)")
+    if os.getenv("LYRA_USE_BATCH_API"):
+        # The batch API needs every question up front
+        questions = load_questions()
+        print(f"Loaded {len(questions)} questions")
+        results = run_with_batch_api(questions) if questions else []
+    else:
+        # Stream questions straight into the worker pool
+        results = run_concurrently(iter_questions())
+    
+    if not results:
+        print("No questions found. Please create a questions.json file.")
+        return
     
     # Save final results
     save_results(results, "runs.json")
@@ -241,11 +431,11 @@ def main():
     
     print(f"\n" + "=" * 50)
     print("BATCH PROCESSING COMPLETE")
-    print(f"Total questions: {len(questions)}")
+    print(f"Total questions: {len(results)}")
     print(f"Completed: {completed}")
     print(f"Failed: {failed}")
     print(f"Total time: {elapsed_time:.1f} seconds")
-    print(f"Average time per question: {elapsed_time/len(questions):.1f} seconds")
+    print(f"Average time per question: {elapsed_time/len(results):.1f} seconds")
     
     if failed > 0:
         print(f"\nFailed questions:")
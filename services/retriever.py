@@ -1,8 +1,16 @@
 ﻿import arxiv
-from typing import List, Optional
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import date, datetime, timezone
+from typing import List, Optional, Tuple, Union
 from app.models import EvidenceItem
+import hashlib
 import re
 import os
+import string
+import threading
+import time
 from openai import OpenAI
 
 # Import PubMed at module level for test patching
@@ -11,6 +19,72 @@ try:
 except ImportError:
     PubMed = None  # For environments without pymed
 
+# Import diskcache at module level for test patching
+try:
+    import diskcache
+except ImportError:
+    diskcache = None  # For environments without diskcache
+
+# Import numpy at module level for test patching
+try:
+    import numpy as np
+except ImportError:
+    np = None  # For environments without numpy (pure-Python scoring)
+
+
+# Reciprocal-rank-fusion constant: keeps the backend's ordering as a gentle tilt
+RRF_K = 60
+
+
+def rank_weight(rank: int) -> float:
+    """Relevance weight for a 1-based backend rank (1.0 for the top hit)."""
+    return (RRF_K + 1) / (RRF_K + rank)
+
+
+def publication_ts(value) -> Optional[float]:
+    """POSIX timestamp for a backend's publication date/datetime (UTC if naive)."""
+    if isinstance(value, datetime):
+        return (value if value.tzinfo else value.replace(tzinfo=timezone.utc)).timestamp()
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day, tzinfo=timezone.utc).timestamp()
+    return None
+
+
+class _MinInterval:
+    """Process-wide minimum spacing between requests to one API host.
+
+    Concurrent searches (the async fan-out runs them in worker threads)
+    share the spacing; it is a no-op under pytest.
+    """
+
+    def __init__(self, seconds: float) -> None:
+        self.seconds = seconds
+        self._lock = threading.Lock()
+        self._last = float("-inf")
+
+    def wait(self) -> None:
+        """Block until the next request is allowed."""
+        if os.getenv("PYTEST_CURRENT_TEST"):
+            return
+        with self._lock:
+            wait = self._last + self.seconds - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._last = time.monotonic()
+
+
+# arXiv asks API clients for at most one request every 3 s
+ARXIV_MIN_INTERVAL = float(os.getenv("ARXIV_MIN_INTERVAL", "3"))
+_arxiv_throttle = _MinInterval(ARXIV_MIN_INTERVAL).wait
+
+# NCBI E-utilities allow 3 requests/s without an API key; a pymed query is
+# an esearch plus an efetch, so queries are spaced two request slots apart
+PUBMED_MIN_INTERVAL = float(os.getenv("PUBMED_MIN_INTERVAL", "0.67"))
+_pubmed_throttle = _MinInterval(PUBMED_MIN_INTERVAL).wait
+
+# Longest a sync search waits on the PubMed fallback before going arXiv-only
+PUBMED_TIMEOUT = float(os.getenv("PUBMED_TIMEOUT", "10"))
+
 
 def search_arxiv(keywords: List[str], max_results: int = 5, subject_filters: Optional[List[str]] = None, negative_terms: Optional[List[str]] = None) -> List[EvidenceItem]:
     """Search arXiv for papers matching keywords, subject filters, and negative terms."""
@@ -32,7 +106,8 @@ def search_arxiv(keywords: List[str], max_results: int = 5, subject_filters: Opt
     )
 
     results = []
-    for result in search.results():
+    _arxiv_throttle()
+    for rank, result in enumerate(search.results(), 1):
         doi = result.entry_id.split('/')[-1]
         authors = [author.name for author in result.authors] if result.authors else []
         evidence_item = EvidenceItem(
@@ -41,7 +116,9 @@ def search_arxiv(keywords: List[str], max_results: int = 5, subject_filters: Opt
             summary=result.summary[:500],
             url=result.pdf_url,
             authors=authors,
-            source="arxiv"
+            source="arxiv",
+            retrieval_score=rank_weight(rank),
+            published_ts=publication_ts(getattr(result, 'published', None)),
         )
         results.append(evidence_item)
     return results
@@ -57,9 +134,10 @@ def search_pubmed(keywords: List[str], max_results: int = 5, email: str = None,
         return []
     pubmed = PubMed(tool="ScientificAIOrchestrator", email=email or "pytest@localhost")
     query = " AND ".join(keywords)
+    _pubmed_throttle()
     results = pubmed.query(query, max_results=max_results)
     evidence_items = []
-    for article in results:
+    for rank, article in enumerate(results, 1):
         doi = None
         if hasattr(article, 'doi') and article.doi:
             doi = article.doi
@@ -86,38 +164,191 @@ def search_pubmed(keywords: List[str], max_results: int = 5, email: str = None,
             summary=summary,
             url=url,
             authors=authors,
-            source="pubmed"
+            source="pubmed",
+            retrieval_score=rank_weight(rank),
+            published_ts=publication_ts(getattr(article, 'publication_date', None)),
         )
         evidence_items.append(evidence_item)
     return evidence_items
 
 
+_STRIP_PUNCTUATION = str.maketrans("", "", string.punctuation)
+
+
+def normalize_title(title: str) -> str:
+    """Lowercase `title`, drop punctuation and collapse whitespace."""
+    return " ".join(title.lower().translate(_STRIP_PUNCTUATION).split())
+
+
 def deduplicate_evidence(evidence_list: List[EvidenceItem]) -> List[EvidenceItem]:
-    """Remove duplicate evidence items based on (case-insensitive) title only."""
+    """Remove duplicate evidence items (same normalised title or same DOI).
+
+    Untitled items are dropped; the first occurrence of a paper is kept.
+    """
     seen_titles = set()
+    seen_dois = set()
     unique_items = []
     for item in evidence_list:
-        title = (item.title or '').strip().lower()
-        if title and title not in seen_titles:
-            seen_titles.add(title)
-            unique_items.append(item)
+        title = normalize_title(item.title or '')
+        doi = (item.doi or '').strip().lower()
+        if not title or title in seen_titles or (doi and doi in seen_dois):
+            continue
+        seen_titles.add(title)
+        if doi:
+            seen_dois.add(doi)
+        unique_items.append(item)
     return unique_items
 
 
+# Keyword-set search cache: Nova's adaptive reruns repeat overlapping queries.
+# An in-process LRU sits in front of a diskcache directory shared by all
+# worker processes (``NOVA_SEARCH_CACHE_DIR``, "" keeps it in-process only).
+SEARCH_CACHE_TTL = float(os.getenv("NOVA_SEARCH_CACHE_TTL", "3600"))
+SEARCH_CACHE_SIZE = 256
+_search_cache: "OrderedDict[tuple, Tuple[float, Tuple[EvidenceItem, ...]]]" = OrderedDict()
+_search_cache_lock = threading.Lock()  # threads-pool workers share the LRU
+_disk_cache = None
+
+
+def _get_disk_cache():
+    """Return the shared on-disk search cache, or None when disabled."""
+    global _disk_cache
+    cache_dir = os.getenv("NOVA_SEARCH_CACHE_DIR", ".search_cache")
+    if diskcache is None or not cache_dir:
+        return None
+    if _disk_cache is None:
+        _disk_cache = diskcache.Cache(cache_dir)
+    return _disk_cache
+
+
+def _disk_key(key: tuple) -> str:
+    # frozenset iteration order varies between processes (hash randomisation)
+    keywords, *rest = key
+    return repr((tuple(sorted(keywords)), *rest))
+
+
+def _search_key(keywords: List[str], max_results: int, subject_filters: Optional[List[str]], negative_terms: Optional[List[str]]) -> tuple:
+    # Keywords are AND-joined, so their order does not change the results
+    return (
+        frozenset(kw.strip().lower() for kw in keywords),
+        max_results,
+        tuple(subject_filters or ()),
+        tuple(negative_terms or ()),
+    )
+
+
+def _cached_search(key: tuple) -> Optional[List[EvidenceItem]]:
+    """Return a fresh cached result list, or None (also under pytest / TTL=0)."""
+    if SEARCH_CACHE_TTL <= 0 or os.getenv("PYTEST_CURRENT_TEST"):
+        return None
+    with _search_cache_lock:
+        entry = _search_cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] >= SEARCH_CACHE_TTL:
+            del _search_cache[key]
+            return None
+        if entry is not None:
+            _search_cache.move_to_end(key)
+            return list(entry[1])
+
+    disk = _get_disk_cache()
+    results = None if disk is None else disk.get(_disk_key(key))
+    if results is None:
+        return None
+    # Expiry is enforced by diskcache; restart the in-process TTL
+    _remember_in_process(key, results)
+    return list(results)
+
+
+def _remember_in_process(key: tuple, results: Tuple[EvidenceItem, ...]) -> None:
+    with _search_cache_lock:
+        _search_cache[key] = (time.monotonic(), results)
+        _search_cache.move_to_end(key)
+        while len(_search_cache) > SEARCH_CACHE_SIZE:
+            _search_cache.popitem(last=False)
+
+
+def _remember_search(key: tuple, results: List[EvidenceItem]) -> List[EvidenceItem]:
+    if SEARCH_CACHE_TTL > 0 and not os.getenv("PYTEST_CURRENT_TEST"):
+        _remember_in_process(key, tuple(results))
+        disk = _get_disk_cache()
+        if disk is not None:
+            disk.set(_disk_key(key), tuple(results), expire=SEARCH_CACHE_TTL)
+    return results
+
+
+# Runs the speculative PubMed half of sync searches off the caller's thread
+_pubmed_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="pubmed")
+
+
 def search_arxiv_and_pubmed(keywords: List[str], max_results: int = 8, subject_filters: Optional[List[str]] = None, negative_terms: Optional[List[str]] = None) -> List[EvidenceItem]:
-    """Search arXiv with filters, fallback to PubMed if <3 hits, dedupe and merge."""
+    """Search arXiv with filters, fallback to PubMed if <3 hits, dedupe and merge.
+
+    PubMed is queried speculatively on a worker thread while arXiv runs, so
+    the fallback costs max(arXiv, PubMed) instead of their sum; its hits (or
+    errors) are ignored when arXiv returns ≥3 items.  A PubMed query still
+    running after ``PUBMED_TIMEOUT`` seconds (default 10) is abandoned and
+    the arXiv hits are returned uncached.
+
+    Results are cached per keyword set for ``NOVA_SEARCH_CACHE_TTL`` seconds
+    (default 3600, 0 disables).
+    """
     # Handle empty keywords
     if not keywords or not any(kw.strip() for kw in keywords):
         return []
+    key = _search_key(keywords, max_results, subject_filters, negative_terms)
+    cached = _cached_search(key)
+    if cached is not None:
+        return cached
     
-    arxiv_results = search_arxiv(keywords, max_results=max_results, subject_filters=subject_filters, negative_terms=negative_terms)
+    pubmed_future = _pubmed_pool.submit(search_pubmed, keywords, max_results=max_results)
+    try:
+        arxiv_results = search_arxiv(keywords, max_results=max_results, subject_filters=subject_filters, negative_terms=negative_terms)
+    except BaseException:
+        pubmed_future.cancel()
+        raise
     if len(arxiv_results) >= 3:
+        pubmed_future.cancel()  # no-op once started; the result is dropped
+        return _remember_search(key, arxiv_results[:max_results])
+    # Fallback: merge the PubMed hits
+    try:
+        pubmed_results = pubmed_future.result(timeout=PUBMED_TIMEOUT)
+    except FutureTimeoutError:
+        print(f"[PubMed] No reply within {PUBMED_TIMEOUT:g}s; using arXiv results only.")
         return arxiv_results[:max_results]
-    # Fallback: search PubMed and merge
-    pubmed_results = search_pubmed(keywords, max_results=max_results)
     all_results = arxiv_results + pubmed_results
     deduped = deduplicate_evidence(all_results)
-    return deduped[:max_results]
+    return _remember_search(key, deduped[:max_results])
+
+
+async def async_search_arxiv_and_pubmed(keywords: List[str], max_results: int = 8, subject_filters: Optional[List[str]] = None, negative_terms: Optional[List[str]] = None) -> List[EvidenceItem]:
+    """Async `search_arxiv_and_pubmed` that queries arXiv and PubMed concurrently.
+
+    Both client libraries are blocking, so each search runs in a worker thread.
+    PubMed is queried speculatively alongside arXiv; its hits are only merged in
+    when arXiv returns <3 items, exactly as in the sync version.  Shares the
+    sync version's result cache.
+    """
+    if not keywords or not any(kw.strip() for kw in keywords):
+        return []
+    key = _search_key(keywords, max_results, subject_filters, negative_terms)
+    cached = _cached_search(key)
+    if cached is not None:
+        return cached
+
+    arxiv_results, pubmed_results = await asyncio.gather(
+        asyncio.to_thread(search_arxiv, keywords, max_results=max_results, subject_filters=subject_filters, negative_terms=negative_terms),
+        asyncio.to_thread(search_pubmed, keywords, max_results=max_results),
+        return_exceptions=True,
+    )
+    if isinstance(arxiv_results, BaseException):
+        raise arxiv_results
+    if len(arxiv_results) >= 3:
+        return _remember_search(key, arxiv_results[:max_results])
+    # Only a PubMed failure the sync version would also have hit is raised
+    if isinstance(pubmed_results, BaseException):
+        raise pubmed_results
+    deduped = deduplicate_evidence(arxiv_results + pubmed_results)
+    return _remember_search(key, deduped[:max_results])
 
 
 def cosine_similarity(a: List[float], b: List[float]) -> float:
@@ -135,14 +366,72 @@ def cosine_similarity(a: List[float], b: List[float]) -> float:
     return dot_product / (norm_a * norm_b)
 
 
-def get_embedding(text: str, client: OpenAI) -> List[float]:
-    """Get embedding for text using OpenAI API."""
+# Embeddings are deterministic per (model, text), so an in-process LRU keyed
+# on the text's SHA-1 lets repeated queries / evidence skip the API call.
+EMBEDDING_CACHE_SIZE = 2048
+_embedding_cache: "OrderedDict[Tuple[str, str], List[float]]" = OrderedDict()
+_embedding_cache_lock = threading.Lock()
+
+
+def get_embedding(
+    text: Union[str, List[str]], client: OpenAI
+) -> Union[List[float], List[List[float]]]:
+    """
+    Get embedding for text using OpenAI API.
+
+    A list of texts is embedded in one request and returns one vector per
+    text, in order; texts already in the LRU are left out of the request.
+    """
     model = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
-    response = client.embeddings.create(
-        model=model,
-        input=text
-    )
-    return response.data[0].embedding
+    texts = [text] if isinstance(text, str) else list(text)
+    keys = [(model, hashlib.sha1(t.encode("utf-8")).hexdigest()) for t in texts]
+    use_cache = not os.getenv("PYTEST_CURRENT_TEST")
+
+    vectors: List[Optional[List[float]]] = [None] * len(texts)
+    if use_cache:
+        with _embedding_cache_lock:
+            for i, key in enumerate(keys):
+                vectors[i] = _embedding_cache.get(key)
+                if vectors[i] is not None:
+                    _embedding_cache.move_to_end(key)
+
+    missing = [i for i, vector in enumerate(vectors) if vector is None]
+    if missing:
+        response = client.embeddings.create(
+            model=model,
+            input=text if isinstance(text, str) else [texts[i] for i in missing]
+        )
+        for i, item in zip(missing, response.data):
+            vectors[i] = item.embedding
+        if use_cache:
+            with _embedding_cache_lock:
+                for i in missing:
+                    _embedding_cache[keys[i]] = vectors[i]
+                    _embedding_cache.move_to_end(keys[i])
+                while len(_embedding_cache) > EMBEDDING_CACHE_SIZE:
+                    _embedding_cache.popitem(last=False)
+
+    return vectors[0] if isinstance(text, str) else vectors
+
+
+def similarity_scores(query: List[float], vectors: List[List[float]]) -> List[float]:
+    """
+    Cosine similarity of `query` against every vector in `vectors`.
+
+    With numpy this is one float32 matrix-vector product over the
+    row-normalised vectors; zero vectors score 0.0 as in `cosine_similarity`.
+    """
+    if np is None or not vectors:
+        return [cosine_similarity(query, vector) for vector in vectors]
+
+    matrix = np.asarray(vectors, dtype=np.float32)
+    q = np.asarray(query, dtype=np.float32)
+    if matrix.shape[1] != q.shape[0]:
+        raise ValueError("Vectors must have the same length")
+
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(q)
+    dots = matrix @ q
+    return np.divide(dots, norms, out=np.zeros_like(dots), where=norms != 0).tolist()
 
 
 def rerank_by_embedding(items: List[EvidenceItem], query: str, client: OpenAI) -> List[EvidenceItem]:
@@ -150,17 +439,13 @@ def rerank_by_embedding(items: List[EvidenceItem], query: str, client: OpenAI) -
     if not items:
         return items
     
-    # Get query embedding
-    query_embedding = get_embedding(query, client)
+    # Embed the query and every item (title + summary) in one request
+    query_embedding, *item_embeddings = get_embedding(
+        [query] + [f"{item.title} {item.summary}" for item in items], client
+    )
     
     # Calculate similarities
-    scored_items = []
-    for item in items:
-        # Use title + summary for embedding
-        item_text = f"{item.title} {item.summary}"
-        item_embedding = get_embedding(item_text, client)
-        similarity = cosine_similarity(query_embedding, item_embedding)
-        scored_items.append((item, similarity))
+    scored_items = list(zip(items, similarity_scores(query_embedding, item_embeddings)))
     
     # Sort by similarity (highest first), stable sort to preserve original order for ties
     scored_items = sorted(scored_items, key=lambda x: x[1], reverse=True)
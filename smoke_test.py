@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Local smoke test for the Scientific AI Orchestrator.
+
+Runs against a live API (``uvicorn app.main:app``) and Celery worker.  The
+independent endpoint checks are fired concurrently over one
+``httpx.AsyncClient``, and pipeline completion is pushed to us over the
+``/stream/{task_id}`` SSE channel instead of polling ``/result``.
+
+Usage:
+    python smoke_test.py
+
+Set SMOKE_BASE_URL to test another deployment (default http://localhost:8000).
+"""
+
+import asyncio
+import json
+import os
+import sys
+from typing import Any, Dict, Optional
+
+import httpx
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+BASE_URL = os.getenv("SMOKE_BASE_URL", "http://localhost:8000")
+PIPELINE_TIMEOUT = 300  # seconds to wait for the pipeline to finish
+
+
+async def check_health_endpoint(client: httpx.AsyncClient) -> bool:
+    """Test the health endpoint."""
+    try:
+        response = await client.get("/health")
+        if response.status_code == 200:
+            print("✓ Health endpoint working")
+            return True
+        print(f"✗ Health endpoint failed: {response.status_code}")
+        return False
+    except httpx.HTTPError as e:
+        print(f"✗ Health endpoint error: {e}")
+        return False
+
+
+async def check_openapi_docs(client: httpx.AsyncClient) -> bool:
+    """Test the OpenAPI docs endpoint."""
+    try:
+        response = await client.get("/docs")
+        if response.status_code == 200:
+            print("✓ OpenAPI docs working")
+            return True
+        print(f"✗ OpenAPI docs failed: {response.status_code}")
+        return False
+    except httpx.HTTPError as e:
+        print(f"✗ OpenAPI docs error: {e}")
+        return False
+
+
+async def check_ask_endpoint(client: httpx.AsyncClient) -> Optional[str]:
+    """Test the ask endpoint; returns the task_id on success."""
+    try:
+        response = await client.post("/ask", json={"question": "Why do stars explode?"})
+        if response.status_code == 200:
+            task_id = response.json()["task_id"]
+            print(f"✓ Ask endpoint working, got task_id: {task_id}")
+            return task_id
+        print(f"✗ Ask endpoint failed: {response.status_code}")
+        return None
+    except httpx.HTTPError as e:
+        print(f"✗ Ask endpoint error: {e}")
+        return None
+
+
+async def check_stream_endpoint(client: httpx.AsyncClient, task_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Test the SSE stream endpoint by following it until the task finishes.
+
+    Returns the final task result pushed by the server, or None.
+    """
+    try:
+        async with client.stream("GET", f"/stream/{task_id}", timeout=httpx.Timeout(10.0, read=None)) as response:
+            if response.status_code != 200:
+                print(f"✗ Stream endpoint failed: {response.status_code}")
+                return None
+            print("✓ Stream endpoint working")
+
+            event, data = None, []
+            async for line in response.aiter_lines():
+                if line.startswith("event:"):
+                    event = line[6:].strip()
+                elif line.startswith("data:"):
+                    data.append(line[5:].strip())
+                elif not line and data:
+                    # Blank line ends one event
+                    payload = "\n".join(data)
+                    if event == "progress":
+                        print(f"  … {payload}")
+                    elif event == "status":
+                        result = json.loads(payload)
+                        if result.get("status") != "processing":
+                            return result
+                    event, data = None, []
+        print("✗ Stream closed before the pipeline finished")
+        return None
+    except httpx.HTTPError as e:
+        print(f"✗ Stream endpoint error: {e}")
+        return None
+
+
+async def check_result_endpoint(client: httpx.AsyncClient, task_id: str, streamed: Dict[str, Any]) -> bool:
+    """Test the result endpoint against the result pushed over the stream."""
+    if streamed.get("status") == "failed":
+        print(f"✗ Pipeline failed: {streamed.get('error', 'Unknown error')}")
+        return False
+
+    answer = (streamed.get("lyra_output") or {}).get("answer")
+    if not answer:
+        print("✗ Pipeline completed but missing expected data")
+        return False
+    print("✓ Full pipeline completed successfully!")
+    print(f"  Answer: {answer[:100]}...")
+
+    try:
+        response = await client.get(f"/result/{task_id}")
+        if response.status_code != 200:
+            print(f"✗ Result endpoint failed: {response.status_code}")
+            return False
+        print(f"✓ Result endpoint working, status: {response.json()['status']}")
+        return True
+    except httpx.HTTPError as e:
+        print(f"✗ Result endpoint error: {e}")
+        return False
+
+
+async def run_smoke_test() -> bool:
+    """Run every check; returns True when all of them pass."""
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=10.0) as client:
+        print("1. Testing API endpoints...")
+        health_ok, docs_ok = await asyncio.gather(
+            check_health_endpoint(client), check_openapi_docs(client)
+        )
+        if not health_ok:
+            print("✗ API is not running. Start it with:")
+            print("    uvicorn app.main:app --reload")
+            return False
+        if not docs_ok:
+            print("✗ OpenAPI docs not accessible")
+            return False
+
+        print("\n2. Testing question submission...")
+        task_id = await check_ask_endpoint(client)
+        if not task_id:
+            print("✗ Could not submit question")
+            return False
+
+        print("\n3. Testing stream endpoint...")
+        try:
+            streamed = await asyncio.wait_for(check_stream_endpoint(client, task_id), PIPELINE_TIMEOUT)
+        except asyncio.TimeoutError:
+            print("✗ Pipeline timed out")
+            return False
+        if streamed is None:
+            print("✗ Stream endpoint not working")
+            return False
+
+        print("\n4. Testing pipeline execution...")
+        if not await check_result_endpoint(client, task_id, streamed):
+            print("✗ Pipeline execution failed")
+            return False
+
+    return True
+
+
+def main():
+    """Run the smoke test."""
+    print("🧪 Scientific AI Orchestrator Smoke Test")
+    print("=" * 50)
+
+    if not asyncio.run(run_smoke_test()):
+        sys.exit(1)
+
+    print("\n🎉 All smoke tests passed!")
+    print("\nNext steps:")
+    print("1. Deploy to production (Render/Railway)")
+    print("2. Connect frontend")
+    print("3. Invite beta users")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from agents.critic import Critic
+from app.models import LyraOutput, Citation, EvidenceItem
+
+
+def _response(content):
+    mock_response = Mock()
+    mock_response.choices = [Mock(message=Mock(content=content))]
+    return mock_response
+
+
+@pytest.fixture
+def lyra_output():
+    return LyraOutput(
+        answer="Water vapour was detected (doi:10.1234/k2).",
+        gaps=[],
+        roadmap=[],
+        citations=[Citation(doi="10.1234/k2", title="K2-18b", idx=1)],
+    )
+
+
+@pytest.mark.asyncio
+async def test_critic_arun_uses_async_client(lyra_output):
+    critic = Critic()
+    content = '{"passes": true, "missing_points": [], "support_level": "bogus"}'
+    with patch.object(critic.aclient.chat.completions, 'create',
+                      new=AsyncMock(return_value=_response(content))) as mock_create:
+        result = await critic.arun("Is there water on K2-18b?", lyra_output)
+    assert result.passes is True
+    assert result.support_level == "weak"
+    assert mock_create.await_args.kwargs["temperature"] == 0
+
+
+@pytest.mark.asyncio
+async def test_critic_arun_raw_returns_feedback():
+    critic = Critic()
+    evidence = [EvidenceItem(title="Paper", doi="10.1/x", summary="s", url="u", source="arxiv")]
+    content = '{"should_rerun": true, "rerun_reason": "too narrow", "quality_score": 0.4, "suggestions": []}'
+    with patch.object(critic.aclient.chat.completions, 'create',
+                      new=AsyncMock(return_value=_response(content))):
+        feedback = await critic.arun_raw("q", evidence, "Nova")
+    assert feedback.should_rerun is True
+    assert feedback.quality_score == 0.4
+
+
+def test_critic_sync_run_matches_async_prompt(lyra_output):
+    critic = Critic()
+    content = '{"passes": false, "missing_points": ["claim"], "support_level": "moderate"}'
+    with patch.object(critic.client.chat.completions, 'create',
+                      return_value=_response(content)) as mock_create:
+        result = critic.run("Is there water on K2-18b?", lyra_output)
+    assert result.missing_points == ["claim"]
+    assert mock_create.call_args.kwargs["messages"] == Critic._run_messages(
+        "Is there water on K2-18b?", lyra_output
+    )
+
+
+def test_critic_run_raw_messages_only_truncates_long_summaries():
+    evidence = [
+        EvidenceItem(title="Short", doi="10.1/a", summary="brief", url="u", source="arxiv"),
+        EvidenceItem(title="Long", doi="10.1/b", summary="x" * 250, url="u", source="arxiv"),
+    ]
+    prompt = Critic._run_raw_messages("q", evidence, "Nova")[1]["content"]
+    assert "Summary: brief\n" in prompt
+    assert "Summary: " + "x" * 200 + "...\n" in prompt
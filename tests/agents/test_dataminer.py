@@ -1,7 +1,7 @@
 import pytest
 from agents.dataminer import DataMiner
 from app.models import EvidenceItem
-from unittest.mock import patch, Mock
+from unittest.mock import AsyncMock, patch, Mock
 
 
 def test_dataminer_regex_extract_percentage():
@@ -35,4 +35,88 @@ def test_dataminer_openai_extract_percentage():
     mock_response.choices = [Mock(message=Mock(content='{"percentages": ["31 %"], "p_values": [], "confidence_intervals": [], "sample_sizes": []}'))]
     with patch.object(miner.client.chat.completions, 'create', return_value=mock_response):
         result = miner.run(evidence)
-    assert "31 %" in result.percentages 
\ No newline at end of file
+    assert "31 %" in result.percentages 
+
+@pytest.mark.asyncio
+async def test_dataminer_aextract_from_batch_preserves_order_and_isolates_failures():
+    items = [
+        EvidenceItem(title=f"Paper {i}", doi=f"10.1/{i}", summary=f"{i}0 % responded",
+                     url="https://example.com", source="arxiv")
+        for i in range(1, 4)
+    ]
+    miner = DataMiner()
+
+    async def fake_batch(texts):
+        if "20 %" in " ".join(texts):
+            raise RuntimeError("boom")
+        return [miner.regex_extract(t) for t in texts]
+
+    with patch.object(miner, '_allm_extract_batch', side_effect=fake_batch) as mock_batch:
+        results = await miner.aextract_from_batch(items, concurrency=2, batch_size=1)
+
+    assert mock_batch.call_count == 3
+    assert [r.percentages for r in results] == [["10 %"], ["20 %"], ["30 %"]]
+
+
+@pytest.mark.asyncio
+async def test_dataminer_aextract_from_batch_packs_items_into_one_call():
+    items = [
+        EvidenceItem(title=f"Paper {i}", doi=f"10.1/{i}", summary=f"{i}0 % responded",
+                     url="https://example.com", source="arxiv")
+        for i in range(1, 4)
+    ]
+    miner = DataMiner()
+    # Second item is empty in the LLM reply, so it must fall back to regex
+    content = ('{"items": [{"percentages": ["10%"]}, {}, {"percentages": ["30%"]}]}')
+    mock_response = Mock()
+    mock_response.choices = [Mock(message=Mock(content=content))]
+
+    with patch.object(miner.aclient.chat.completions, 'create',
+                      new=AsyncMock(return_value=mock_response)) as mock_create:
+        results = await miner.aextract_from_batch(items)
+
+    assert mock_create.await_count == 1
+    assert [r.percentages for r in results] == [["10%"], ["20 %"], ["30%"]]
+
+
+def test_dataminer_regex_extract_keeps_overlapping_matches():
+    abstract = "Among 40 subjects (n = 40), the effect was significant (p < 0.05); t(38) = 2.5."
+    result = DataMiner().regex_extract(abstract)
+    assert "n = 40" in result.sample_sizes
+    assert any(s.lower().startswith("subjects") for s in result.sample_sizes)
+    assert "p < 0.05" in result.p_values
+    assert "t(38) = 2.5" in result.statistical_tests
+
+
+def test_dataminer_regex_extract_does_not_invent_suffix_matches():
+    result = DataMiner().regex_extract("Efficacy was 95.5% (3.5 percent lower in controls).")
+    assert result.percentages == ["95.5%", "3.5 percent"]
+
+
+def test_dataminer_regex_extract_keeps_exponent_p_values():
+    result = DataMiner().regex_extract("The effect was robust, p < 0.001e-3.")
+    assert result.p_values == ["p < 0.001", "p < 0.001e-3"]
+
+
+def test_dataminer_statistical_summary_counts_significant_p_values():
+    from app.models import NumericalFinding
+    findings = [
+        NumericalFinding(p_values=["p<.05"], sample_sizes=["n = 40"]),
+        NumericalFinding(p_values=["P = 0.001"], sample_sizes=["sample size 60"]),
+        NumericalFinding(p_values=["p = 0.05", "p > 0.01"]),
+    ]
+    summary = DataMiner().get_statistical_summary(findings)
+    assert summary['papers_with_p_values'] == 3
+    assert summary['significant_findings'] == 2
+    assert summary['average_sample_size'] == 50
+
+
+def test_dataminer_run_skips_llm_when_regex_is_confident():
+    abstract = "Of 120 patients (n = 120), 45% improved (p < 0.01, 95% CI [1.2, 3.4])."
+    evidence = EvidenceItem(title="Rich", doi="10.1/rich", summary=abstract,
+                            url="https://example.com", source="arxiv")
+    miner = DataMiner()
+    with patch.object(miner.client.chat.completions, 'create') as mock_create:
+        result = miner.run(evidence)
+    mock_create.assert_not_called()
+    assert result.p_values and result.sample_sizes and result.percentages
@@ -0,0 +1,302 @@
+import json
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from agents.lyra import Lyra, SPECULATIVE_CRITIQUE, _JSON_SCHEMA
+from app.models import CriticOutput, EvidenceItem, LyraOutput, NovaOutput, NumericalFinding
+
+
+def _item():
+    return EvidenceItem(title="K2-18b", doi="10.1234/k2", summary="Water vapour detected.",
+                        url="https://example.com", source="arxiv")
+
+
+def test_lyra_format_item_without_findings():
+    assert Lyra._format_item(1, _item(), None) == "[1] K2-18b | doi:10.1234/k2 | Water vapour detected."
+
+
+def test_lyra_format_item_lists_only_present_numbers():
+    finding = NumericalFinding(percentages=["95%", "3 %"], sample_sizes=["n = 40"])
+    block = Lyra._format_item(2, _item(), finding)
+    assert block.endswith(" | Key Numbers: Percentages: 95%, 3 %; Sample Sizes: n = 40")
+    assert "P-values" not in block
+
+
+def _output(answer):
+    return LyraOutput(answer=answer, gaps=[], roadmap=[], citations=[])
+
+
+@pytest.mark.asyncio
+async def test_lyra_arun_redrafts_with_critique_on_fail(monkeypatch):
+    monkeypatch.delenv("LYRA_SPECULATIVE_RETRY", raising=False)
+    lyra = Lyra()
+    drafts = AsyncMock(side_effect=[_output("first"), _output("second")])
+    verdict = CriticOutput(passes=False, missing_points=["claim"], support_level="weak")
+
+    with patch.object(lyra, "arun_raw", drafts), \
+         patch.object(lyra.critic, "arun", AsyncMock(return_value=verdict)):
+        result = await lyra.arun("q", NovaOutput(evidence=[]))
+
+    assert result.answer == "second"
+    assert result.critic_feedback == verdict
+    assert drafts.await_args_list[1].args[3] == {"missing_points": ["claim"]}
+
+
+@pytest.mark.asyncio
+async def test_lyra_arun_discards_speculative_redraft_on_pass(monkeypatch):
+    monkeypatch.setenv("LYRA_SPECULATIVE_RETRY", "1")
+    lyra = Lyra()
+    drafts = AsyncMock(side_effect=[_output("first"), _output("speculative")])
+    verdict = CriticOutput(passes=True, missing_points=[], support_level="strong")
+
+    with patch.object(lyra, "arun_raw", drafts), \
+         patch.object(lyra.critic, "arun", AsyncMock(return_value=verdict)):
+        result = await lyra.arun("q", NovaOutput(evidence=[]))
+
+    assert result.answer == "first"
+    assert drafts.call_count == 2
+    assert drafts.call_args_list[1].args[3] == SPECULATIVE_CRITIQUE
+
+
+def test_lyra_estimate_cost_uses_price_table():
+    assert Lyra._estimate_cost(1_000, 1_000, "gpt-4o") == 0.0025 + 0.01
+    # Unknown models are billed at the mini tier
+    assert Lyra._estimate_cost(1_000, 0, "unknown") == Lyra._estimate_cost(1_000, 0, "gpt-4o-mini")
+
+
+def test_lyra_prompt_token_budget_matches_cost_threshold(monkeypatch):
+    # $0.05 minus $0.01 of output leaves $0.04 of gpt-4o input = 16k tokens
+    assert Lyra._prompt_token_budget(0.05, 1_000, "gpt-4o") == pytest.approx(16_000)
+
+    monkeypatch.setenv("OPENAI_MODEL", "gpt-4o")
+    lyra = Lyra()
+    lyra.cost_threshold = 0.05
+    system_tokens = Lyra._rough_tokens(lyra._request_for("x", 0)["messages"][0]["content"])
+    assert lyra._request_for("x", 15_000 - system_tokens)["model"] == "gpt-4o"
+    assert lyra._request_for("x", 17_000)["model"] == "gpt-4o-mini"
+
+
+def _dotless_item():
+    # Lyra splits sentences on ".", so keep the DOI dot-free for validation
+    return EvidenceItem(title="K2-18b", doi="k2-doi", summary="Water vapour detected.",
+                        url="https://example.com", source="arxiv")
+
+
+class _FakeStream:
+    def __init__(self, content, size=7):
+        self.pieces = [content[i:i + size] for i in range(0, len(content), size)]
+        self.closed = False
+
+    def __aiter__(self):
+        return self._gen()
+
+    async def _gen(self):
+        for piece in self.pieces:
+            yield Mock(choices=[Mock(delta=Mock(content=piece))])
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_lyra_arun_raw_streams_and_rejects_uncited_answer_early(monkeypatch):
+    monkeypatch.setenv("LYRA_STREAM", "1")
+    lyra = Lyra()
+    nova_output = NovaOutput(evidence=[_dotless_item()])
+    content = ('{"answer": "Water vapour was found", "gaps": [], '
+               '"roadmap": [], "citations": [{"doi": "k2-doi", "title": "t", "idx": 1}]}')
+    stream = _FakeStream(content)
+
+    with patch.object(lyra.aclient.chat.completions, "create", new=AsyncMock(return_value=stream)):
+        with pytest.raises(ValueError, match="must cite"):
+            await lyra.arun_raw("q", nova_output)
+
+    assert stream.closed
+
+
+@pytest.mark.asyncio
+async def test_lyra_arun_raw_streamed_reply_is_parsed(monkeypatch):
+    monkeypatch.setenv("LYRA_STREAM", "1")
+    lyra = Lyra()
+    nova_output = NovaOutput(evidence=[_dotless_item()])
+    content = ('{"answer": "Water vapour was found (doi:k2-doi)", "gaps": ["depth"], '
+               '"roadmap": [], "citations": [{"doi": "k2-doi", "title": "t", "idx": 1}]}')
+
+    with patch.object(lyra.aclient.chat.completions, "create",
+                      new=AsyncMock(return_value=_FakeStream(content))) as mock_create:
+        result = await lyra.arun_raw("q", nova_output)
+
+    assert mock_create.await_args.kwargs["stream"] is True
+    assert result.gaps == ["depth"]
+    assert result.citations[0].title == "K2-18b"
+
+
+class _FakeSyncStream(_FakeStream):
+    def __iter__(self):
+        for piece in self.pieces:
+            yield Mock(choices=[Mock(delta=Mock(content=piece))])
+
+    def close(self):
+        self.closed = True
+
+
+def test_lyra_run_raw_streams_and_rejects_uncited_answer_early(monkeypatch):
+    monkeypatch.setenv("LYRA_STREAM", "1")
+    lyra = Lyra()
+    nova_output = NovaOutput(evidence=[_dotless_item()])
+    content = ('{"answer": "Water vapour was found", "gaps": [], '
+               '"roadmap": [], "citations": [{"doi": "k2-doi", "title": "t", "idx": 1}]}')
+    stream = _FakeSyncStream(content)
+
+    with patch.object(lyra.client.chat.completions, "create", return_value=stream) as mock_create:
+        with pytest.raises(ValueError, match="must cite"):
+            lyra.run_raw("q", nova_output)
+
+    assert mock_create.call_args.kwargs["stream"] is True
+    assert stream.closed
+
+
+def test_lyra_run_raw_accepts_buffered_reply_when_streaming(monkeypatch):
+    monkeypatch.setenv("LYRA_STREAM", "1")
+    lyra = Lyra()
+    nova_output = NovaOutput(evidence=[_dotless_item()])
+    content = ('{"answer": "Water vapour was found (doi:k2-doi)", "gaps": ["depth"], '
+               '"roadmap": [], "citations": [{"doi": "k2-doi", "title": "t", "idx": 1}]}')
+    response = Mock(choices=[Mock(message=Mock(content=content))])
+
+    with patch.object(lyra.client.chat.completions, "create", return_value=response):
+        result = lyra.run_raw("q", nova_output)
+
+    assert result.gaps == ["depth"]
+
+
+def test_lyra_run_streaming_yields_answer_before_full_output():
+    lyra = Lyra()
+    nova_output = NovaOutput(evidence=[_dotless_item()])
+    content = ('{"answer": "Water vapour was found (doi:k2-doi)", "gaps": ["depth"], '
+               '"roadmap": [], "citations": [{"doi": "k2-doi", "title": "t", "idx": 1}]}')
+    stream = _FakeSyncStream(content)
+
+    with patch.object(lyra.client.chat.completions, "create", return_value=stream):
+        outputs = lyra.run_streaming("q", nova_output)
+        first = next(outputs)
+        assert first.answer == "Water vapour was found (doi:k2-doi)"
+        assert first.gaps == [] and first.citations == []
+        final = next(outputs)
+
+    assert final.gaps == ["depth"]
+    assert final.citations[0].title == "K2-18b"
+    assert list(outputs) == []
+
+
+@pytest.mark.asyncio
+async def test_lyra_run_many_keeps_order_and_isolates_failures():
+    lyra = Lyra()
+
+    async def fake_arun(question, nova_output):
+        if question == "bad":
+            raise ValueError("malformed")
+        return _output(question)
+
+    jobs = [(q, NovaOutput(evidence=[_item()])) for q in ("a", "bad", "c")]
+    with patch.object(lyra, "arun", side_effect=fake_arun):
+        results = await lyra.run_many(jobs)
+
+    assert results[0].answer == "a"
+    assert isinstance(results[1], ValueError)
+    assert results[2].answer == "c"
+
+
+def test_lyra_submit_batch_writes_one_jsonl_request_per_job():
+    lyra = Lyra()
+    jobs = [(q, NovaOutput(evidence=[_dotless_item()])) for q in ("a", "b")]
+    client = Mock()
+    client.files.create.return_value = Mock(id="file-1")
+    client.batches.create.return_value = Mock(id="batch-1")
+
+    with patch.object(lyra, "client", client):
+        assert lyra.submit_batch(jobs) == "batch-1"
+
+    _, payload = client.files.create.call_args.kwargs["file"]
+    records = [json.loads(line) for line in payload.decode("utf-8").split("\n")]
+    assert [r["custom_id"] for r in records] == ["lyra-0", "lyra-1"]
+    assert records[1]["body"] == lyra._build_request("b", jobs[1][1], None, None)[0]
+
+
+def test_lyra_poll_batch_maps_results_back_to_jobs():
+    lyra = Lyra()
+    jobs = [(q, NovaOutput(evidence=[_dotless_item()])) for q in ("a", "b")]
+    reply = ('{"answer": "Found (doi:k2-doi)", "gaps": [], "roadmap": [], '
+             '"citations": [{"doi": "k2-doi", "title": "t", "idx": 1}]}')
+    output_lines = "\n".join([
+        json.dumps({"custom_id": "lyra-1", "error": {"message": "boom"}}),
+        json.dumps({"custom_id": "lyra-0", "response": {"body": {
+            "choices": [{"message": {"content": reply}}]}}}),
+    ])
+    client = Mock()
+    client.batches.retrieve.return_value = Mock(status="completed", output_file_id="file-1")
+    client.files.content.return_value = Mock(text=output_lines)
+
+    with patch.object(lyra, "client", client):
+        results = lyra.poll_batch("batch-1", jobs)
+
+    assert results[0].citations[0].title == "K2-18b"
+    assert isinstance(results[1], RuntimeError)
+
+
+def test_lyra_poll_batch_returns_none_while_running():
+    lyra = Lyra()
+    client = Mock()
+    client.batches.retrieve.return_value = Mock(status="in_progress")
+    with patch.object(lyra, "client", client):
+        assert lyra.poll_batch("batch-1", []) is None
+
+
+def test_lyra_run_packed_sends_one_request_per_group():
+    lyra = Lyra()
+    items = [(q, NovaOutput(evidence=[_dotless_item()])) for q in ("a", "b", "c")]
+    answer = {"answer": "Found (doi:k2-doi)", "gaps": [], "roadmap": [],
+              "citations": [{"doi": "k2-doi", "title": "t", "idx": 1}]}
+    first = Mock(choices=[Mock(message=Mock(content=json.dumps({"results": [answer, answer]})))])
+    # The second group's reply is missing its only answer
+    second = Mock(choices=[Mock(message=Mock(content='{"results": []}'))])
+    client = Mock()
+    client.chat.completions.create.side_effect = [first, second]
+
+    with patch.object(lyra, "client", client):
+        results = lyra.run_packed(items, k=2)
+
+    assert client.chat.completions.create.call_count == 2
+    prompt = client.chat.completions.create.call_args_list[0].kwargs["messages"][1]["content"]
+    assert "=== ITEM 2 ===" in prompt and prompt.count(_JSON_SCHEMA) == 1
+    assert [type(r) for r in results] == [LyraOutput, LyraOutput, IndexError]
+
+
+def test_lyra_run_packed_keeps_gpt4o_for_small_questions(monkeypatch):
+    monkeypatch.setenv("OPENAI_MODEL", "gpt-4o")
+    lyra = Lyra()
+    lyra.cost_threshold = 0.05
+    items = [(q, NovaOutput(evidence=[_dotless_item()])) for q in "abcde"]
+    reply = Mock(choices=[Mock(message=Mock(content='{"results": []}'))])
+    client = Mock()
+    client.chat.completions.create.return_value = reply
+
+    with patch.object(lyra, "client", client):
+        lyra.run_packed(items, k=5)
+
+    # 5k output tokens alone cost $0.05; the guard must stay per question
+    assert client.chat.completions.create.call_args.kwargs["model"] == "gpt-4o"
+
+
+def test_lyra_output_from_payload_validates_roadmap_list():
+    nova_output = NovaOutput(evidence=[_dotless_item()])
+    step = {"priority": 1, "research_area": "spectra", "next_milestone": "JWST",
+            "timeline": "1y", "success_probability": 0.5}
+    payload = {"answer": "Found (doi:k2-doi)", "gaps": [], "roadmap": [step],
+               "citations": [{"doi": "k2-doi", "title": "t", "idx": 1}]}
+
+    result = Lyra._output_from_payload(payload, nova_output, ["k2-doi"])
+    assert result.roadmap[0].next_milestone == "JWST"
+
+    payload["roadmap"] = [dict(step, priority="high")]
+    with pytest.raises(ValueError):
+        Lyra._output_from_payload(payload, nova_output, ["k2-doi"])
@@ -0,0 +1,38 @@
+from agents.lyra_cache import SemanticCache
+
+
+def _request(question, evidence="1. Paper\n   DOI: 10.1/x"):
+    return {
+        "model": "gpt-4o",
+        "messages": [
+            {"role": "system", "content": "You are Lyra"},
+            {"role": "user", "content": f"QUESTION:\n{question}\n\nEVIDENCE:\n{evidence}"},
+        ],
+        "temperature": 0,
+    }
+
+
+def test_scope_key_ignores_question_but_not_evidence():
+    a = SemanticCache.scope_key(_request("Is there water?"), "Is there water?")
+    b = SemanticCache.scope_key(_request("Was water found?"), "Was water found?")
+    c = SemanticCache.scope_key(_request("Is there water?", "other"), "Is there water?")
+    assert a == b
+    assert a != c
+
+
+def test_semantic_cache_hits_only_above_threshold():
+    cache = SemanticCache(threshold=0.9)
+    cache.put("scope", [1.0, 0.0], "cached reply")
+    assert cache.get("scope", [0.99, 0.05]) == "cached reply"
+    assert cache.get("scope", [0.0, 1.0]) is None
+    assert cache.get("other-scope", [1.0, 0.0]) is None
+
+
+def test_semantic_cache_evicts_least_recent_scope():
+    cache = SemanticCache(max_scopes=2)
+    cache.put("a", [1.0], "A")
+    cache.put("b", [1.0], "B")
+    cache.get("a", [1.0])
+    cache.put("c", [1.0], "C")
+    assert cache.get("b", [1.0]) is None
+    assert cache.get("a", [1.0]) == "A"
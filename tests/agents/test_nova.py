@@ -1,7 +1,8 @@
+import math
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from agents.nova import Nova
-from app.models import SophiaOutput, EvidenceItem, QuestionType
+from app.models import SophiaOutput, EvidenceItem, QuestionType, CriticFeedback
 from utils.exceptions import InsufficientEvidenceError
 
 
@@ -121,4 +122,96 @@ class TestNovaDeduplication:
         result = nova.run(question, sophia_output)
         
         # Should only return max_results items (but Nova requires at least 3)
-        assert len(result.evidence) == 5 
\ No newline at end of file
+        assert len(result.evidence) == 5     
+    def test_expand_keywords_matches_whole_words(self):
+        """Expansion triggers on whole question words, not substrings."""
+        nova = Nova()
+        expanded = nova._expand_keywords(["exoplanet"], "How do transit surveys compare?")
+        assert "methodology" in expanded
+        assert "comparison" in expanded
+        # "shown" must not trigger the 'how' group, nor "knew" the 'new' group
+        assert nova._expand_keywords(["exoplanet"], "Was water shown, knew?") == ["exoplanet"]
+    
+    def test_focus_on_suggestions_drops_stopwords_and_punctuation(self):
+        """Suggestion terms are 4+ character words with punctuation stripped."""
+        nova = Nova()
+        focused = nova._focus_on_suggestions(["k2-18b"], ["Include data from JWST, with spectra."])
+        assert focused == ["k2-18b", "include", "data", "jwst", "spectra"]
+    
+    def test_rank_by_score_uses_retrieval_score_and_limit(self):
+        """Backend relevance breaks otherwise equal heuristics; limit keeps the top items."""
+        nova = Nova()
+        items = [
+            EvidenceItem(title=f"Paper {i}", doi=f"10.1/{i}", summary="s", url="u",
+                         source="arxiv", retrieval_score=score)
+            for i, score in enumerate([0.8, 1.0, 0.9])
+        ]
+        ranked = nova._rank_by_score(items, limit=2)
+        assert [item.title for item in ranked] == ["Paper 1", "Paper 2"]
+    
+    def test_calculate_score_decays_exponentially_with_age(self):
+        """A paper one recency time-constant old scores 1/e of a brand-new one."""
+        from agents.nova import RECENCY_TAU_SECONDS
+        nova = Nova()
+        now = 2_000_000_000.0
+        fresh = EvidenceItem(title="New", summary="s", url="u", source="arxiv", published_ts=now)
+        old = fresh.copy(update={"published_ts": now - RECENCY_TAU_SECONDS})
+        ratio = nova._calculate_score(old, now) / nova._calculate_score(fresh, now)
+        assert ratio == pytest.approx(math.exp(-1))
+
+
+def _papers(prefix, n):
+    return [
+        EvidenceItem(title=f"{prefix} {i}", doi=f"10.1/{prefix}{i}", summary="s", url="u", source="arxiv")
+        for i in range(n)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_nova_run_async_uses_speculative_widened_search():
+    """A low quality score switches to the widened search started up front."""
+    async def search(keywords, max_results, **kwargs):
+        return _papers("wide" if max_results > 10 else "narrow", 3)
+
+    nova = Nova(max_results=5)
+    feedback = CriticFeedback(should_rerun=True, rerun_reason="weak", quality_score=0.4)
+    sophia_output = SophiaOutput(question_type=QuestionType.FACTUAL, keywords=["quantum"])
+    with patch('agents.nova.async_search_arxiv_and_pubmed', side_effect=search) as mock_search, \
+         patch.object(nova.critic, 'arun_raw', AsyncMock(return_value=feedback)):
+        result = await nova.run_async("What is quantum computing?", sophia_output)
+
+    assert mock_search.call_count == 2
+    assert result.evidence[0].title.startswith("wide")
+    assert result.critic_feedback is feedback
+
+
+@pytest.mark.asyncio
+async def test_nova_run_async_keeps_initial_evidence_when_critic_passes():
+    nova = Nova(max_results=5)
+    feedback = CriticFeedback(should_rerun=False)
+    sophia_output = SophiaOutput(question_type=QuestionType.FACTUAL, keywords=["quantum"])
+    with patch('agents.nova.async_search_arxiv_and_pubmed',
+               AsyncMock(return_value=_papers("narrow", 3))), \
+         patch.object(nova.critic, 'arun_raw', AsyncMock(return_value=feedback)):
+        result = await nova.run_async("What is quantum computing?", sophia_output)
+
+    assert [item.title for item in result.evidence] == ["narrow 0", "narrow 1", "narrow 2"]
+
+
+@pytest.mark.asyncio
+async def test_nova_run_async_falls_back_to_next_adaptive_strategy():
+    """If the preferred (expanded-keyword) rerun fails, the widened one is used."""
+    async def search(keywords, max_results, **kwargs):
+        if "methodology" in keywords:
+            raise InsufficientEvidenceError("expanded search found nothing")
+        return _papers("wide" if max_results > 10 else "narrow", 3)
+
+    nova = Nova(max_results=5)
+    feedback = CriticFeedback(should_rerun=True, rerun_reason="too narrow", quality_score=0.4)
+    sophia_output = SophiaOutput(question_type=QuestionType.FACTUAL, keywords=["quantum"])
+    with patch('agents.nova.async_search_arxiv_and_pubmed', side_effect=search) as mock_search, \
+         patch.object(nova.critic, 'arun_raw', AsyncMock(return_value=feedback)):
+        result = await nova.run_async("How is quantum error correction done?", sophia_output)
+
+    assert mock_search.call_count == 3
+    assert result.evidence[0].title.startswith("wide")
@@ -0,0 +1,54 @@
+"""
+Tests for the LLM response cache.
+"""
+
+from unittest.mock import Mock, patch
+
+from utils import llm_cache
+from utils.llm_cache import cached_chat, cache_key
+
+
+class FakeCache(dict):
+    def set(self, key, value, expire=None):
+        self[key] = value
+        self.expire = expire
+
+
+def _client(content):
+    client = Mock()
+    client.chat.completions.create.return_value.choices = [Mock(message=Mock(content=content))]
+    return client
+
+
+def test_cache_key_is_order_independent():
+    a = cache_key(model="m", temperature=0, messages=[{"role": "user", "content": "x"}])
+    b = cache_key(messages=[{"role": "user", "content": "x"}], temperature=0, model="m")
+    assert a == b
+    assert a != cache_key(model="m", temperature=0, messages=[{"role": "user", "content": "y"}])
+
+
+def test_cached_chat_hits_cache_on_repeat():
+    client = _client('{"passes": true}')
+    with patch.object(llm_cache, '_get_cache', return_value=FakeCache()):
+        first = cached_chat(client, model="m", messages=[], temperature=0)
+        second = cached_chat(client, model="m", messages=[], temperature=0)
+    assert first == second == '{"passes": true}'
+    assert client.chat.completions.create.call_count == 1
+
+
+def test_cached_chat_skips_non_deterministic_requests():
+    client = _client("{}")
+    cache = FakeCache()
+    with patch.object(llm_cache, '_get_cache', return_value=cache):
+        cached_chat(client, model="m", messages=[], temperature=0.7)
+        cached_chat(client, model="m", messages=[], temperature=0.7)
+    assert client.chat.completions.create.call_count == 2
+    assert not cache
+
+
+def test_cached_chat_entries_expire_after_ttl():
+    cache = FakeCache()
+    with patch.object(llm_cache, '_get_cache', return_value=cache), \
+            patch.object(llm_cache, 'LLM_CACHE_TTL', 60.0):
+        cached_chat(_client("{}"), model="m", messages=[], temperature=0)
+    assert cache.expire == 60.0
@@ -0,0 +1,67 @@
+import asyncio
+from unittest.mock import Mock, patch
+
+from utils import openai_client
+from utils.openai_client import bounded_chat, get_client, get_async_client
+
+
+def test_get_client_is_shared():
+    assert get_client() is get_client()
+
+
+def test_sophia_uses_the_shared_client():
+    from agents.sophia import Sophia
+
+    assert Sophia().client is Sophia().client is get_client()
+
+
+def test_get_async_client_is_shared_within_a_loop_only():
+    async def two_lookups():
+        return get_async_client(), get_async_client()
+
+    first_a, first_b = asyncio.run(two_lookups())
+    second_a, _ = asyncio.run(two_lookups())
+    assert first_a is first_b
+    assert first_a is not second_a
+
+
+def test_aclose_async_client_drops_the_loop_client():
+    async def open_then_close():
+        client = get_async_client()
+        await openai_client.aclose_async_client()
+        return client, get_async_client()
+
+    closed, fresh = asyncio.run(open_then_close())
+    assert closed.is_closed()
+    assert fresh is not closed
+
+
+def test_bounded_chat_caps_in_flight_requests():
+    in_flight = peak = 0
+
+    async def create(**kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return kwargs["n"]
+
+    aclient = Mock()
+    aclient.chat.completions.create = create
+
+    async def fan_out():
+        return await asyncio.gather(*(bounded_chat(aclient, n=i) for i in range(25)))
+
+    with patch.object(openai_client, "MAX_CONCURRENCY", 4):
+        results = asyncio.run(fan_out())
+
+    assert results == list(range(25))
+    assert peak == 4
+
+
+def test_clients_use_http2_only_when_h2_is_available():
+    with patch.object(openai_client, "h2", None):
+        transport = openai_client._new_async_client()._client._transport
+    assert transport._pool._http2 is False
+    assert transport._pool._retries == openai_client._TRANSPORT_RETRIES
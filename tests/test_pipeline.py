@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from app.models import SophiaOutput, NovaOutput, LyraOutput, CriticOutput, QuestionType, EvidenceItem, RoadmapItem, Citation
 from agents.sophia import Sophia
 from agents.nova import Nova
@@ -22,11 +22,11 @@ def mock_arxiv():
         yield search
 
 class TestSophia:
-    @patch('agents.sophia.OpenAI')
-    def test_sophia_classification(self, mock_openai_class):
+    @patch('agents.sophia.get_client')
+    def test_sophia_classification(self, mock_get_client):
         # Mock OpenAI client
         mock_client = Mock()
-        mock_openai_class.return_value = mock_client
+        mock_get_client.return_value = mock_client
         
         # Mock OpenAI response
         mock_response = Mock()
@@ -42,6 +42,23 @@ class TestSophia:
         assert result.question_type == QuestionType.FACTUAL
         assert result.keywords == ["quantum", "computing"]
 
+    @pytest.mark.asyncio
+    @patch('agents.sophia.get_async_client')
+    @patch('agents.sophia.bounded_chat')
+    @patch('agents.sophia.get_client')
+    async def test_sophia_run_async(self, mock_get_client, mock_chat, mock_get_async_client):
+        mock_response = Mock()
+        mock_response.choices = [Mock(message=Mock(content='{"question_type": "comparative", "keywords": ["perovskite"]}'))]
+        mock_chat.return_value = mock_response
+
+        sophia = Sophia()
+        with patch.object(sophia.critic, 'arun_raw_messages', new=AsyncMock(return_value={})):
+            result = await sophia.run_async("Which perovskite is most efficient?")
+
+        assert result.question_type == QuestionType.COMPARATIVE
+        assert result.keywords == ["perovskite"]
+        assert mock_chat.await_args.kwargs["temperature"] == 0
+
 class TestNova:
     @patch('agents.nova.search_arxiv_and_pubmed')
     @patch('agents.nova.Critic')
@@ -0,0 +1,45 @@
+"""
+Tests for the RPM/TPM rate limiter.
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, Mock
+
+from utils.openai_client import bounded_chat
+from utils.rate_limit import RateLimiter, rate_limited
+
+
+def test_rate_limiter_waits_for_token_refill():
+    async def scenario():
+        limiter = RateLimiter(max_requests_per_minute=6000, max_tokens_per_minute=6000)
+        await limiter.acquire(6000)  # drains the token bucket (100 tokens / s refill)
+        start = time.monotonic()
+        await limiter.acquire(10)
+        return time.monotonic() - start
+
+    assert asyncio.run(scenario()) >= 0.09
+
+
+def test_rate_limiter_caps_oversized_requests_at_bucket_size():
+    async def scenario():
+        limiter = RateLimiter(max_requests_per_minute=60, max_tokens_per_minute=100)
+        await asyncio.wait_for(limiter.acquire(10_000), timeout=1)
+
+    asyncio.run(scenario())
+
+
+def test_bounded_chat_charges_the_active_limiter_per_completion():
+    async def scenario():
+        limiter = RateLimiter(max_requests_per_minute=60, max_tokens_per_minute=100_000)
+        aclient = Mock()
+        aclient.chat.completions.create = AsyncMock(return_value="ok")
+        messages = [{"role": "system", "content": "x" * 4_000}, {"role": "user", "content": "hi"}]
+        with rate_limited(limiter):
+            await asyncio.gather(*(bounded_chat(aclient, model="m", messages=messages) for _ in range(3)))
+        await bounded_chat(aclient, model="m", messages=messages)  # no active limiter
+        return limiter
+
+    limiter = asyncio.run(scenario())
+    assert limiter._requests < 58  # three requests taken out of 60
+    assert limiter._tokens < 100_000 - 3 * 1_500  # system prompt charged on every call
@@ -0,0 +1,35 @@
+"""
+Tests for the task-result encoding.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.models import EvidenceItem, NovaOutput, TaskResult, TaskStatus
+from utils import result_codec
+from utils.result_codec import decode_result, encode_result, result_json
+
+RESULT = TaskResult(
+    task_id="t1",
+    status=TaskStatus.COMPLETED,
+    question="Is there water on K2-18b?",
+    nova_output=NovaOutput(evidence=[
+        EvidenceItem(title="K2-18b", doi="10.1/k2", summary="s", url="u", source="arxiv"),
+    ]),
+)
+
+
+def test_json_results_round_trip_and_pass_through():
+    blob = encode_result(RESULT)
+    assert TaskResult(**decode_result(blob)) == RESULT
+    assert result_json(blob) == blob.decode()
+
+
+def test_msgpack_results_are_readable_as_json():
+    pytest.importorskip("msgpack")
+    with patch.object(result_codec, "MSGPACK_RESULTS", True):
+        blob = encode_result(RESULT)
+    assert not blob.startswith(b"{")
+    assert decode_result(blob) == RESULT.model_dump(mode="json")
+    assert result_codec.loads(result_json(blob)) == RESULT.model_dump(mode="json")
@@ -8,10 +8,12 @@ from services.retriever import (
     search_arxiv, 
     search_pubmed, 
     search_arxiv_and_pubmed,
+    async_search_arxiv_and_pubmed,
     deduplicate_evidence,
     rerank_by_embedding,
     get_embedding,
-    cosine_similarity
+    cosine_similarity,
+    similarity_scores
 )
 from app.models import EvidenceItem
 
@@ -147,6 +149,19 @@ class TestDeduplication:
         assert any(item.title == "Same Title" for item in deduplicated)
         assert any(item.title == "Different Title" for item in deduplicated)
 
+    def test_deduplicate_evidence_matches_normalised_titles_and_dois(self):
+        """Titles differing only in case/punctuation, or sharing a DOI, are duplicates."""
+        items = [
+            EvidenceItem(title="Water on K2-18b", doi="10.1/A", summary="s", url="u", source="arxiv"),
+            EvidenceItem(title="water on  K218b.", doi="10.1/b", summary="s", url="u", source="pubmed"),
+            EvidenceItem(title="A renamed preprint", doi="10.1/a ", summary="s", url="u", source="pubmed"),
+            EvidenceItem(title="Untitled DOI", doi=None, summary="s", url="u", source="pubmed"),
+        ]
+
+        deduplicated = deduplicate_evidence(items)
+
+        assert [item.title for item in deduplicated] == ["Water on K2-18b", "Untitled DOI"]
+
 
 class TestEmbeddingFunctions:
     """Test embedding-related functions."""
@@ -163,6 +178,18 @@ class TestEmbeddingFunctions:
         # Same vectors should have similarity 1
         assert cosine_similarity(a, c) == 1.0
     
+    @pytest.mark.parametrize("use_numpy", [True, False])
+    def test_similarity_scores_match_cosine_similarity(self, use_numpy):
+        """Batched scores agree with the pairwise function, numpy or not."""
+        query = [1.0, 2.0, 3.0]
+        vectors = [[1.0, 2.0, 3.0], [0.0, 0.0, 0.0], [-3.0, 0.5, 1.0]]
+        np_module = pytest.importorskip("numpy") if use_numpy else None
+        
+        with patch('services.retriever.np', np_module):
+            scores = similarity_scores(query, vectors)
+        
+        assert scores == pytest.approx([cosine_similarity(query, v) for v in vectors], abs=1e-6)
+    
     @patch('services.retriever.OpenAI')
     def test_get_embedding_returns_vector(self, mock_openai_class):
         """Test that get_embedding returns a vector."""
@@ -185,7 +212,7 @@ class TestEmbeddingFunctions:
         # Query: [1, 0, 0]
         # Item2: [0.1, 0.9, 0] - low similarity to query
         # Item1: [0.9, 0.1, 0] - high similarity to query
-        mock_get_embedding.side_effect = [
+        mock_get_embedding.return_value = [
             [1, 0, 0],  # Query embedding
             [0.1, 0.9, 0],  # Item2 embedding (low similarity to query)
             [0.9, 0.1, 0],  # Item1 embedding (high similarity to query)
@@ -215,6 +242,23 @@ class TestEmbeddingFunctions:
         # Should be sorted by similarity (item1 should come first due to higher similarity)
         assert reranked[0].title == "Item1"
         assert reranked[1].title == "Item2"
+        # Query and items are embedded in a single request
+        mock_get_embedding.assert_called_once_with(
+            ["test query", "Item2 summary2", "Item1 summary1"], mock_client
+        )
+    
+    def test_get_embedding_batches_a_list_of_texts(self):
+        """A list of texts costs one API call and returns vectors in order."""
+        mock_client = Mock()
+        mock_client.embeddings.create.return_value.data = [
+            Mock(embedding=[1.0, 0.0]), Mock(embedding=[0.0, 1.0])
+        ]
+        
+        embeddings = get_embedding(["first", "second"], mock_client)
+        
+        assert embeddings == [[1.0, 0.0], [0.0, 1.0]]
+        mock_client.embeddings.create.assert_called_once()
+        assert mock_client.embeddings.create.call_args.kwargs["input"] == ["first", "second"]
 
 
 class TestIntegration:
@@ -358,4 +402,136 @@ def test_search_arxiv_and_pubmed_combined():
     
     assert len(results) == 2
     assert results[0].title == "arXiv Paper"
-    assert results[1].title == "PubMed Paper" 
\ No newline at end of file
+    assert results[1].title == "PubMed Paper" 
+
+
+def _items(source, n):
+    return [
+        EvidenceItem(title=f"{source} {i}", doi=f"10.1/{source}{i}", summary="s", url="u", source=source)
+        for i in range(n)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_async_search_merges_pubmed_when_arxiv_is_thin():
+    """The async search merges PubMed hits exactly like the sync fallback."""
+    with patch('services.retriever.search_arxiv', return_value=_items("arxiv", 1)), \
+         patch('services.retriever.search_pubmed', return_value=_items("pubmed", 2)) as mock_pubmed:
+        results = await async_search_arxiv_and_pubmed(["test"], max_results=4)
+
+    mock_pubmed.assert_called_once()
+    assert [item.title for item in results] == ["arxiv 0", "pubmed 0", "pubmed 1"]
+
+
+def test_sync_search_queries_pubmed_alongside_arxiv():
+    """PubMed runs concurrently with arXiv, so the fallback costs max(), not sum()."""
+    import time
+
+    def slow(results):
+        def search(*args, **kwargs):
+            time.sleep(0.2)
+            return results
+        return search
+
+    with patch('services.retriever.search_arxiv', side_effect=slow(_items("arxiv", 1))), \
+         patch('services.retriever.search_pubmed', side_effect=slow(_items("pubmed", 2))):
+        start = time.perf_counter()
+        results = search_arxiv_and_pubmed(["test"], max_results=4)
+        elapsed = time.perf_counter() - start
+
+    assert [item.title for item in results] == ["arxiv 0", "pubmed 0", "pubmed 1"]
+    assert elapsed < 0.35
+
+
+def test_sync_search_falls_back_to_arxiv_when_pubmed_times_out(monkeypatch):
+    import time
+    import services.retriever as retriever
+
+    def hang(*args, **kwargs):
+        time.sleep(0.5)
+        return _items("pubmed", 2)
+
+    monkeypatch.setattr(retriever, "PUBMED_TIMEOUT", 0.05)
+    with patch('services.retriever.search_arxiv', return_value=_items("arxiv", 1)), \
+         patch('services.retriever.search_pubmed', side_effect=hang):
+        start = time.perf_counter()
+        results = search_arxiv_and_pubmed(["test"], max_results=4)
+        elapsed = time.perf_counter() - start
+
+    assert [item.title for item in results] == ["arxiv 0"]
+    assert elapsed < 0.4
+
+
+def test_sync_search_ignores_pubmed_failure_when_arxiv_suffices():
+    with patch('services.retriever.search_arxiv', return_value=_items("arxiv", 3)), \
+         patch('services.retriever.search_pubmed', side_effect=RuntimeError("down")):
+        results = search_arxiv_and_pubmed(["test"], max_results=4)
+
+    assert [item.source for item in results] == ["arxiv"] * 3
+
+
+@pytest.mark.asyncio
+async def test_async_search_ignores_pubmed_failure_when_arxiv_suffices():
+    """A failed speculative PubMed query does not matter once arXiv has ≥3 hits."""
+    with patch('services.retriever.search_arxiv', return_value=_items("arxiv", 3)), \
+         patch('services.retriever.search_pubmed', side_effect=RuntimeError("down")):
+        results = await async_search_arxiv_and_pubmed(["test"], max_results=4)
+
+    assert [item.source for item in results] == ["arxiv"] * 3
+
+
+def test_search_cache_reuses_results_for_same_keyword_set(monkeypatch):
+    """A repeated query (keyword order/case aside) is served from the cache."""
+    import services.retriever as retriever
+
+    monkeypatch.delenv("PYTEST_CURRENT_TEST", raising=False)
+    monkeypatch.setenv("NOVA_SEARCH_CACHE_DIR", "")
+    monkeypatch.setattr(retriever, "_search_cache", retriever.OrderedDict())
+    with patch('services.retriever.search_arxiv', return_value=_items("arxiv", 3)) as mock_arxiv, \
+         patch('services.retriever.search_pubmed', return_value=[]):
+        first = search_arxiv_and_pubmed(["water", "K2-18b"], max_results=4)
+        second = search_arxiv_and_pubmed(["k2-18b", "Water"], max_results=4)
+        search_arxiv_and_pubmed(["water"], max_results=4)
+
+    assert first == second
+    assert mock_arxiv.call_count == 2
+
+
+def test_search_cache_is_shared_through_disk(monkeypatch, tmp_path):
+    pytest.importorskip("diskcache")
+    import services.retriever as retriever
+
+    monkeypatch.delenv("PYTEST_CURRENT_TEST", raising=False)
+    monkeypatch.setenv("NOVA_SEARCH_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(retriever, "_disk_cache", None)
+    monkeypatch.setattr(retriever, "_search_cache", retriever.OrderedDict())
+    with patch('services.retriever.search_arxiv', return_value=_items("arxiv", 3)) as mock_arxiv, \
+         patch('services.retriever.search_pubmed', return_value=[]):
+        first = search_arxiv_and_pubmed(["water", "K2-18b"], max_results=4)
+        # Another worker process starts with an empty in-process cache
+        retriever._search_cache.clear()
+        second = search_arxiv_and_pubmed(["k2-18b", "water"], max_results=4)
+
+    assert first == second
+    assert mock_arxiv.call_count == 1
+
+
+def test_publication_ts_handles_dates_datetimes_and_unknowns():
+    from datetime import date, datetime, timezone
+    from services.retriever import publication_ts
+
+    assert publication_ts(date(2024, 1, 2)) == datetime(2024, 1, 2, tzinfo=timezone.utc).timestamp()
+    assert publication_ts(datetime(2024, 1, 2)) == publication_ts(date(2024, 1, 2))
+    assert publication_ts(Mock()) is None
+
+
+def test_min_interval_spaces_requests(monkeypatch):
+    import time
+    from services.retriever import _MinInterval
+
+    monkeypatch.delenv("PYTEST_CURRENT_TEST", raising=False)
+    throttle = _MinInterval(0.05)
+    start = time.monotonic()
+    throttle.wait()
+    throttle.wait()
+    assert time.monotonic() - start >= 0.05
@@ -0,0 +1,86 @@
+"""
+LLM response cache
+------------------
+
+Content-addressed cache for deterministic (``temperature=0``) chat
+completions.  The key is the SHA-256 of the full request kwargs (model,
+messages, response_format, ...), the value is the assistant message
+content, so repeated questions, replays and the Lyra → Critic loop skip
+the OpenAI round-trip entirely.
+
+The cache lives in a ``diskcache`` directory (``LLM_CACHE_DIR``, default
+``.llm_cache``).  Set ``LLM_CACHE_DIR=""`` to disable it; it is also
+bypassed under pytest so mocked responses never leak between tests.
+Entries expire after ``LLM_CACHE_TTL`` seconds (default one day) so prompt
+or model-side changes are eventually picked up.
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Optional
+
+from utils.openai_client import bounded_chat
+
+# Import diskcache at module level for test patching
+try:
+    import diskcache
+except ImportError:
+    diskcache = None  # For environments without diskcache
+
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "86400"))
+
+_cache = None
+
+
+def _get_cache() -> Optional[Any]:
+    """Return the process-wide cache, or None when caching is disabled."""
+    global _cache
+    cache_dir = os.getenv("LLM_CACHE_DIR", ".llm_cache")
+    if diskcache is None or not cache_dir or os.getenv("PYTEST_CURRENT_TEST"):
+        return None
+    if _cache is None:
+        _cache = diskcache.Cache(cache_dir)
+    return _cache
+
+
+def cache_key(**kwargs) -> str:
+    """SHA-256 over the canonical JSON encoding of the request kwargs."""
+    return hashlib.sha256(json.dumps(kwargs, sort_keys=True).encode()).hexdigest()
+
+
+def lookup(**kwargs) -> Optional[str]:
+    """Return the cached content for a request, or None on miss / when disabled."""
+    cache = _get_cache() if kwargs.get("temperature") == 0 else None
+    return None if cache is None else cache.get(cache_key(**kwargs))
+
+
+def store(content: str, **kwargs) -> None:
+    """Cache `content` as the reply to a request (no-op when caching is off)."""
+    cache = _get_cache() if kwargs.get("temperature") == 0 else None
+    if cache is not None:
+        cache.set(cache_key(**kwargs), content, expire=LLM_CACHE_TTL)
+
+
+def cached_chat(client, **kwargs) -> str:
+    """
+    Call ``client.chat.completions.create(**kwargs)`` through the cache.
+
+    Returns the assistant message content.  Only ``temperature=0``
+    requests are cached since anything else is not reproducible.
+    """
+    content = lookup(**kwargs)
+    if content is None:
+        content = client.chat.completions.create(**kwargs).choices[0].message.content
+        store(content, **kwargs)
+    return content
+
+
+async def acached_chat(aclient, **kwargs) -> str:
+    """Async counterpart of `cached_chat` for ``AsyncOpenAI`` clients."""
+    content = lookup(**kwargs)
+    if content is None:
+        response = await bounded_chat(aclient, **kwargs)
+        content = response.choices[0].message.content
+        store(content, **kwargs)
+    return content
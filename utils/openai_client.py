@@ -0,0 +1,141 @@
+"""
+Shared OpenAI clients
+---------------------
+
+Every agent used to build its own ``OpenAI`` / ``AsyncOpenAI`` client, i.e.
+its own httpx connection pool, so calls from Critic, Lyra and DataMiner
+never reused each other's keep-alive sockets or TLS sessions.  These
+helpers hand out one pooled client per process instead.
+
+httpx async pools are bound to the event loop that opened them, and the
+pipeline starts short-lived loops (``asyncio.run``) from sync code, so the
+async client is shared per running loop rather than per process.
+
+Connections speak HTTP/2 when ``h2`` is installed (``httpx[http2]``), so
+concurrent requests multiplex over a few sockets to api.openai.com, and
+the transports retry failed connection attempts twice.  Failed API calls
+(429s, 5xx, timeouts) are retried by the SDK itself, three times with
+exponential backoff that honours ``Retry-After``.
+
+`bounded_chat` additionally caps in-flight async completions across all
+agents at ``OPENAI_MAX_CONCURRENCY`` (default 10) so concurrent fan-outs
+do not trip OpenAI rate limits and set off retry storms, and charges the
+`utils.rate_limit.rate_limited` limiter, when one is active, per request.
+"""
+
+import asyncio
+import os
+import weakref
+
+import httpx
+from openai import OpenAI, AsyncOpenAI
+
+from utils.rate_limit import acquire_for
+
+# Import h2 at module level for test patching
+try:
+    import h2
+except ImportError:
+    h2 = None  # For environments without h2 (HTTP/1.1 only)
+
+_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+# Transport retries cover connect errors; the SDK retries 408/409/429/5xx
+# responses and timeouts with backoff (honouring Retry-After)
+_TRANSPORT_RETRIES = 2
+_SDK_RETRIES = 3
+MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "10"))
+
+_http_client = None
+_client = None
+_async_client = None
+_loop_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = (
+    weakref.WeakKeyDictionary()
+)
+_loop_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_http_client() -> httpx.Client:
+    """Return the process-wide sync connection pool behind every sync client."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.Client(
+            transport=httpx.HTTPTransport(
+                http2=h2 is not None, limits=_LIMITS, retries=_TRANSPORT_RETRIES
+            ),
+        )
+    return _http_client
+
+
+def get_client() -> OpenAI:
+    """Return the process-wide sync client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = OpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            http_client=get_http_client(),
+            max_retries=_SDK_RETRIES,
+        )
+    return _client
+
+
+def _new_async_client() -> AsyncOpenAI:
+    return AsyncOpenAI(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        max_retries=_SDK_RETRIES,
+        http_client=httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(
+                http2=h2 is not None, limits=_LIMITS, retries=_TRANSPORT_RETRIES
+            ),
+        ),
+    )
+
+
+def get_async_client() -> AsyncOpenAI:
+    """Return the async client for the running event loop (one per loop)."""
+    global _async_client
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # Outside a loop: hand out a process-wide client
+        if _async_client is None:
+            _async_client = _new_async_client()
+        return _async_client
+
+    client = _loop_clients.get(loop)
+    if client is None:
+        client = _loop_clients[loop] = _new_async_client()
+    return client
+
+
+async def aclose_async_client() -> None:
+    """Close the running loop's async client and its connection pool."""
+    client = _loop_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
+
+
+def close_clients() -> None:
+    """Close the process-wide sync pool (call on process shutdown)."""
+    global _http_client, _client
+    if _http_client is not None:
+        _http_client.close()
+    _http_client = _client = None
+
+
+def get_semaphore() -> asyncio.Semaphore:
+    """Return the completion-concurrency semaphore for the running event loop."""
+    loop = asyncio.get_running_loop()
+    sem = _loop_semaphores.get(loop)
+    if sem is None:
+        sem = _loop_semaphores[loop] = asyncio.Semaphore(MAX_CONCURRENCY)
+    return sem
+
+
+async def bounded_chat(aclient: AsyncOpenAI = None, **kwargs):
+    """``chat.completions.create`` gated by the active rate limiter and the concurrency semaphore."""
+    # Wait on the limiter before taking a slot so throttled calls don't hold one
+    await acquire_for(kwargs)
+    async with get_semaphore():
+        return await (aclient or get_async_client()).chat.completions.create(**kwargs)
@@ -0,0 +1,88 @@
+"""
+Request/token rate limiting
+---------------------------
+
+Async token-bucket throttle for OpenAI calls, after the OpenAI cookbook's
+``api_request_parallel_processor``: one bucket for requests per minute and
+one for tokens per minute, both refilled continuously.  A caller awaits
+`acquire` with its estimated token cost before sending a request, so a
+large fan-out runs at the account's limits instead of bouncing off 429s.
+
+Callers that fan out through several layers of agent code enter
+`rate_limited(limiter)` once; every completion sent under it (``bounded_chat``
+and Lyra's streaming path call `acquire_for`) then charges the limiter for
+its own prompt, so multi-call jobs are throttled per request, not per job.
+"""
+
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+# Completions are sent without max_tokens; charge this much expected output
+_OUTPUT_TOKENS = 1_000
+
+
+class RateLimiter:
+    """Continuous-refill RPM + TPM buckets shared by the tasks of one event loop."""
+
+    def __init__(self, max_requests_per_minute: float, max_tokens_per_minute: float) -> None:
+        self.max_rpm = max_requests_per_minute
+        self.max_tpm = max_tokens_per_minute
+        self._requests = max_requests_per_minute
+        self._tokens = max_tokens_per_minute
+        self._last = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._last
+        self._last = now
+        self._requests = min(self.max_rpm, self._requests + elapsed * self.max_rpm / 60)
+        self._tokens = min(self.max_tpm, self._tokens + elapsed * self.max_tpm / 60)
+
+    async def acquire(self, tokens: int) -> None:
+        """Wait until one request and `tokens` tokens are available, then take them."""
+        # A single request larger than the bucket would otherwise wait forever
+        tokens = min(tokens, self.max_tpm)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._requests >= 1 and self._tokens >= tokens:
+                    self._requests -= 1
+                    self._tokens -= tokens
+                    return
+                wait = max(
+                    (1 - self._requests) * 60 / self.max_rpm,
+                    (tokens - self._tokens) * 60 / self.max_tpm,
+                )
+                await asyncio.sleep(max(wait, 0.01))
+
+
+# Context-local so concurrent batches (and the tasks they spawn) each charge
+# their own limiter
+_active: ContextVar[Optional[RateLimiter]] = ContextVar("active_rate_limiter", default=None)
+
+
+@contextmanager
+def rate_limited(limiter: RateLimiter):
+    """Charge every completion sent in this context, including spawned tasks, to `limiter`."""
+    token = _active.set(limiter)
+    try:
+        yield limiter
+    finally:
+        _active.reset(token)
+
+
+def request_tokens(request: dict) -> int:
+    """Estimated tokens for one chat request: ≈4 chars / token over the messages plus output."""
+    chars = sum(len(message.get("content") or "") for message in request.get("messages", ()))
+    return chars // 4 + _OUTPUT_TOKENS
+
+
+async def acquire_for(request: dict) -> None:
+    """Wait for the active limiter (if any) to admit one completion of `request`."""
+    limiter = _active.get()
+    if limiter is not None:
+        await limiter.acquire(request_tokens(request))
@@ -0,0 +1,60 @@
+"""
+Task-result encoding
+--------------------
+
+The worker stores each finished `TaskResult` in Redis and publishes it to
+`/stream` subscribers as JSON or, with ``MSGPACK_RESULTS=1``, as msgpack
+(smaller and faster to encode for evidence-heavy results).
+
+Readers accept both, so the flag can be flipped while results written
+under the other setting are still live: a stored result is always a map,
+which starts with ``{`` in JSON and with 0x80–0x8f / 0xde / 0xdf in
+msgpack.
+"""
+
+import json
+import os
+
+from pydantic import BaseModel
+
+# Import msgpack at module level for test patching
+try:
+    import msgpack
+except ImportError:
+    msgpack = None  # For environments without msgpack
+
+# Import orjson at module level for test patching
+try:
+    import orjson
+except ImportError:
+    orjson = None  # For environments without orjson
+
+loads = orjson.loads if orjson is not None else json.loads
+
+MSGPACK_RESULTS = os.getenv("MSGPACK_RESULTS", "0") == "1"
+
+
+def encode_result(result: BaseModel) -> bytes:
+    """Serialise a result model for Redis (msgpack when enabled and installed)."""
+    if MSGPACK_RESULTS and msgpack is not None:
+        return msgpack.packb(result.model_dump(mode="json"), use_bin_type=True)
+    # Pydantic's Rust encoder, without building an intermediate dict
+    return result.model_dump_json().encode()
+
+
+def _is_json(blob: bytes) -> bool:
+    return blob[:1] == b"{"
+
+
+def decode_result(blob: bytes) -> dict:
+    """Parse a stored result in either encoding."""
+    if _is_json(blob):
+        return loads(blob)
+    return msgpack.unpackb(blob, raw=False)
+
+
+def result_json(blob: bytes) -> str:
+    """A stored result as JSON text; JSON blobs are passed through as-is."""
+    if _is_json(blob):
+        return blob.decode()
+    return json.dumps(decode_result(blob))